@@ -0,0 +1,149 @@
+"""
+The async driver against the in-process stub hub: checks that AsyncPage components read what the DOM holds,
+nested components included, then times one scenario on many sessions run one after another by the blocking
+driver and at once on a single event loop.
+
+    python benchmarks/bench_async.py [--sessions 10] [--latency 20] [--repeat 5]
+
+--latency adds milliseconds to every command, the gap between the two grows with it.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, List
+
+from bench_framework import ITEMS, LOGIN, SUBMIT, build_dom
+from selenium import webdriver
+
+from coms.qa.core.aio_http import AsyncHttpClient
+from coms.qa.fixtures.async_application import AsyncApplication
+from coms.qa.fixtures.async_driver import AsyncWebDriver
+from coms.qa.fixtures.stub_hub import StubHub
+from coms.qa.frontend.pages.async_page import AsyncPage
+from coms.qa.frontend.pages.component.async_component import (
+    TEXTS_SCRIPT,
+    AsyncComponent,
+    AsyncComponents,
+    AsyncComponentWrapper,
+)
+
+CAPABILITIES = {'browserName': 'chrome'}
+
+
+class AsyncFormWrapper(AsyncComponentWrapper):
+    submit = AsyncComponent(dat='submit')
+    login = AsyncComponent(dat='login')
+
+
+class AsyncForm(AsyncComponent):
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return AsyncFormWrapper(instance.app, lambda: self.find(instance), self._locator)
+
+
+class AsyncBenchPage(AsyncPage):
+    title = AsyncComponent(dat='title')
+    items = AsyncComponents(dat='item')
+    third_item = AsyncComponent(dat='item', tag='li', index=2)
+    form = AsyncForm(dat='form')
+
+
+async def start_app(client: AsyncHttpClient) -> AsyncApplication:
+    app = AsyncApplication('chrome', 'desktop')
+    app.driver = await AsyncWebDriver.start(client, CAPABILITIES)
+    await app.set_implicitly_wait(0)
+
+    return app
+
+
+async def check(client: AsyncHttpClient) -> None:
+    app = await start_app(client)
+    page = AsyncBenchPage(app)
+
+    try:
+        assert await page.title.text() == 'Benchmark'
+        assert await page.third_item.text() == 'Item 2'
+        assert await page.items.count() == ITEMS
+        assert await page.items.texts() == [f'Item {i}' for i in range(ITEMS)]
+        assert await (await page.items.nth(3)).text() == 'Item 3'
+        # components of a wrapper are found inside the wrapper's element
+        assert await page.form.submit.text() == 'Submit'
+        assert await page.form.login.value() == 'user'
+        assert await app.elements_exist([SUBMIT, LOGIN]) == {SUBMIT: True, LOGIN: True}
+    finally:
+        await app.destroy()
+
+
+async def async_scenario(client: AsyncHttpClient) -> None:
+    app = await start_app(client)
+    page = AsyncBenchPage(app)
+
+    try:
+        await page.title.text()
+        await page.items.texts()
+        await page.form.submit.enabled()
+    finally:
+        await app.destroy()
+
+
+def sync_scenario(hub: StubHub) -> None:
+    driver = webdriver.Remote(command_executor=hub.url, desired_capabilities=CAPABILITIES)
+
+    try:
+        driver.find_element('css selector', '[data-autotest=title]').text
+        driver.execute_script(TEXTS_SCRIPT, driver.find_elements('css selector', '[data-autotest=item]'))
+        driver.find_element('css selector', '[data-autotest=form]').find_element(*SUBMIT).is_enabled()
+    finally:
+        driver.quit()
+
+
+def timeit(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+def run(coroutines: Callable[[AsyncHttpClient], List[Awaitable[None]]], url: str, size: int) -> None:
+    async def main() -> None:
+        client = AsyncHttpClient(url, size)
+
+        try:
+            await asyncio.gather(*coroutines(client))
+        finally:
+            await client.close()
+
+    asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=20, help='milliseconds added to every command')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with StubHub(build_dom(), latency=args.latency / 1000) as hub:
+        run(lambda client: [check(client)], hub.url, 1)
+        print('async components read the stub DOM correctly')
+
+        sync_ms = timeit(lambda: [sync_scenario(hub) for _ in range(args.sessions)], args.repeat)
+        async_ms = timeit(
+            lambda: run(lambda client: [async_scenario(client) for _ in range(args.sessions)], hub.url, args.sessions),
+            args.repeat,
+        )
+
+    print(f'{"case":<48} {"ms":>10}')
+    print(f'{f"{args.sessions} sessions, blocking driver in turn":<48} {sync_ms:>10.1f}')
+    print(f'{f"{args.sessions} sessions, async driver at once":<48} {async_ms:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
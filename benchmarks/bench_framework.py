@@ -0,0 +1,257 @@
+"""
+Overhead of the framework hot paths against the in-process stub hub, no browser or network needed.
+Reports the median wall time and WebDriver round trips of one call of every case.
+
+    python benchmarks/bench_framework.py [--repeat 50] [--latency 0] [--json results.json]
+
+--latency adds milliseconds to every command, to see how round trips turn into wall time on a real grid.
+With lxml and cssselect installed it also checks that Page.snapshot() reads what the live elements report.
+"""
+import argparse
+import importlib.util
+import itertools
+import json
+import statistics
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from selenium.webdriver.support.wait import WebDriverWait
+
+from coms.qa.core.helpers import wait_for
+from coms.qa.core.polling import ConstantBackoff
+from coms.qa.fixtures.application import make_app
+from coms.qa.fixtures.artifacts import ArtifactPipeline
+from coms.qa.fixtures.driver import make_driver
+from coms.qa.fixtures.session_pool import SessionPool
+from coms.qa.fixtures.stub_hub import StubElement, StubHub
+from coms.qa.frontend.helpers import custom_wait_conditions as conditions
+from coms.qa.frontend.pages import Page
+from coms.qa.frontend.pages.component import Component, Components, ComponentWrapper
+from coms.qa.frontend.pages.component.button import Button
+from coms.qa.frontend.pages.component.text import Text
+from coms.qa.frontend.pages.component.text_field import TextField
+
+ITEMS = 20
+SUBMIT = ('css selector', '[data-autotest=submit]')
+LOGIN = ('css selector', '[data-autotest=login]')
+
+
+class FormWrapper(ComponentWrapper):
+    submit = Button(dat='submit')
+
+
+class Form(Component):
+    def __get__(self, instance, owner) -> FormWrapper:
+        return FormWrapper(instance.app, None, self._locator, self.deferred(instance))
+
+
+class BenchPage(Page):
+    title = Text(dat='title')
+    submit = Button(dat='submit')
+    login = TextField(dat='login')
+    item = Component(dat='item')
+    items = Components(dat='item')
+    third_item = Text(dat='item', tag='li', index=2)
+    form = Form(dat='form')
+
+
+def build_dom() -> StubElement:
+    html = StubElement('html')
+    body = html.append(StubElement('body'))
+    body.append(StubElement('h1', text='Benchmark', attributes={'data-autotest': 'title'}))
+    form = body.append(StubElement('form', attributes={'data-autotest': 'form'}))
+    form.append(StubElement('input', attributes={'data-autotest': 'login', 'class': 'field'}, value='user'))
+    form.append(StubElement('button', text='Submit', attributes={'data-autotest': 'submit', 'class': 'btn'}))
+    listing = body.append(StubElement('ul'))
+
+    for i in range(ITEMS):
+        listing.append(StubElement('li', text=f'Item {i}', attributes={'data-autotest': 'item'}))
+
+    return html
+
+
+class BenchRequest:
+    """
+    The part of FixtureRequest make_driver and make_app use.
+    """
+
+    def __init__(self, hub: StubHub) -> None:
+        options = {
+            'remote_ip': hub.host,
+            'remote_port': str(hub.port),
+            'remote_ui': hub.host,
+            'ui_url': 'stub.local',
+            'wait': 0,
+            'enable_video': False,
+        }
+        self.config = types.SimpleNamespace(
+            option=types.SimpleNamespace(**options),
+            getoption=lambda name, default=None: options.get(name, default),
+        )
+        self.node = types.SimpleNamespace(name='bench', stash=pytest.Stash(), get_closest_marker=lambda name: None)
+        self.session = types.SimpleNamespace(testsfailed=0)
+        self._finalizers: List[Callable[[], None]] = []
+
+    def addfinalizer(self, finalizer: Callable[[], None]) -> None:
+        self._finalizers.append(finalizer)
+
+    def finish(self) -> None:
+        while self._finalizers:
+            self._finalizers.pop()()
+
+
+def unwrap(fixture: Any) -> Callable[..., Any]:
+    return fixture._get_wrapped_function() if hasattr(fixture, '_get_wrapped_function') else fixture.__wrapped__
+
+
+class Runner:
+    def __init__(self, hub: StubHub, repeat: int) -> None:
+        self.hub = hub
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+
+    def bench(self, name: str, func: Callable[[], Any], repeat: Optional[int] = None) -> None:
+        repeat = repeat or self.repeat
+        func()
+        self.hub.reset_stats()
+        timings = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+        result = {
+            'name': name,
+            'ms': statistics.median(timings) * 1000,
+            'round_trips': self.hub.round_trips / repeat,
+        }
+        self.results.append(result)
+        print(f'{name:<48} {result["ms"]:>10.3f} {result["round_trips"]:>12.1f}')
+
+
+def open_app(hub: StubHub, pool: SessionPool, pipeline: ArtifactPipeline) -> Any:
+    request = BenchRequest(hub)
+    make = unwrap(make_app)(request, unwrap(make_driver)(request, pool, None), pool, pipeline, None)
+
+    return request, make('chrome', 'desktop')
+
+
+def page_reads(page: BenchPage) -> Dict[str, Any]:
+    return {
+        'text': page.title,
+        'text with index': page.third_item,
+        'texts': page.items.texts(),
+        'attributes': page.items.attributes('data-autotest'),
+        'value': page.login.value,
+        'attribute': page.submit.webelement.get_attribute('class'),
+        'nested enabled': page.form.submit.enabled,
+    }
+
+
+def check_snapshot(page: BenchPage) -> None:
+    live = page_reads(page)
+
+    with page.snapshot():
+        copied = page_reads(page)
+
+    mismatches = {name: (live[name], copied[name]) for name in live if live[name] != copied[name]}
+
+    if mismatches:
+        raise AssertionError(f'Page.snapshot() reads differ from the live ones, (live, snapshot): {mismatches}')
+
+
+def read_snapshot(page: BenchPage) -> Dict[str, Any]:
+    with page.snapshot():
+        return page_reads(page)
+
+
+def wait_conditions() -> Dict[str, Callable[[], Any]]:
+    return {
+        'ElementExist': lambda: conditions.ElementExist(locator=SUBMIT),
+        'ClassNameExist': lambda: conditions.ClassNameExist(locator=SUBMIT, css_class='btn'),
+        'InnerTextInElement': lambda: conditions.InnerTextInElement(locator=SUBMIT, text='Sub'),
+        'ExactTextInElement': lambda: conditions.ExactTextInElement(locator=SUBMIT, text='Submit'),
+        'AttributeExist': lambda: conditions.AttributeExist(locator=SUBMIT, attribute='data-autotest'),
+        'ElementValueIs': lambda: conditions.ElementValueIs(locator=LOGIN, expected_value='user'),
+        'AnimationComplete': lambda: conditions.AnimationComplete(locator=SUBMIT),
+        'VisibilityOfAnyElements': lambda: conditions.VisibilityOfAnyElements(locators=[LOGIN, SUBMIT]),
+        'ElementToBeClickable': lambda: conditions.ElementToBeClickable(locator=SUBMIT),
+        'ElementEnabled': lambda: conditions.ElementEnabled(locator=SUBMIT),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds added to every command')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    pool = SessionPool()
+    pipeline = ArtifactPipeline()
+
+    with StubHub(build_dom(), latency=args.latency / 1000) as hub:
+        runner = Runner(hub, args.repeat)
+        print(f'{"case":<48} {"ms":>10} {"round trips":>12}')
+
+        def setup_teardown() -> None:
+            request, _ = open_app(hub, pool, pipeline)
+            request.finish()
+
+        runner.bench('make_app setup and teardown', setup_teardown, repeat=max(1, args.repeat // 5))
+
+        request, app = open_app(hub, pool, pipeline)
+        page = BenchPage(app)
+        submit = page.submit
+        login = page.login
+
+        runner.bench('Component access', lambda: page.item)
+        runner.bench('Component access and read', lambda: page.item.visible)
+        runner.bench('Compound locator with index', lambda: page.third_item)
+        runner.bench('Nested component read', lambda: page.form.submit.enabled)
+        runner.bench('Text access', lambda: page.title)
+        runner.bench('Components len', lambda: len(page.items))
+        runner.bench('Components iterate', lambda: [item.webelement for item in page.items])
+        runner.bench('Components texts', lambda: page.items.texts())
+        runner.bench('ComponentWrapper.enabled', lambda: submit.enabled)
+        runner.bench('ComponentWrapper.visible', lambda: submit.visible)
+        runner.bench('ComponentWrapper.value', lambda: login.value)
+        runner.bench(
+            'ComponentWrapper freeze and read all', lambda: submit.freeze() and (submit.enabled, submit.visible)
+        )
+        submit.unfreeze()
+
+        if importlib.util.find_spec('lxml') and importlib.util.find_spec('cssselect'):
+            check_snapshot(page)
+            runner.bench('Live reads', lambda: page_reads(page))
+            runner.bench('Page.snapshot() reads', lambda: read_snapshot(page))
+
+        wait = WebDriverWait(app.driver, 1)
+
+        for name, condition in wait_conditions().items():
+            runner.bench(f'wait condition {name}', lambda condition=condition: wait.until(condition()))
+
+        runner.bench('wait_for, met at once', lambda: wait_for(lambda: True))
+
+        def met_on_third() -> Any:
+            counter = itertools.count()
+
+            return wait_for(lambda: next(counter) >= 2, backoff=ConstantBackoff(0))
+
+        runner.bench('wait_for, met on the third poll', met_on_third)
+
+        request.finish()
+
+    pool.close()
+    pipeline.close()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(runner.results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
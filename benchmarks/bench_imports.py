@@ -0,0 +1,81 @@
+"""
+Cold import time and number of newly imported modules for the public modules page objects depend on,
+each measured in a fresh interpreter. Exits with 1 when a module goes over its budget.
+
+    python benchmarks/bench_imports.py [--repeat 5]
+
+The coms namespace package is imported first and not counted, pytest fixture modules are plugins
+and are expected to import pytest, selenium and allure.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# module: (milliseconds, modules)
+BUDGETS: Dict[str, Tuple[float, int]] = {
+    'coms.qa.core.helpers': (15, 10),
+    'coms.qa.core.polling': (10, 5),
+    'coms.qa.core.stats': (10, 5),
+    'coms.qa.frontend.constants': (5, 5),
+    'coms.qa.frontend.helpers.js_locators': (10, 5),
+    'coms.qa.frontend.helpers.custom_wait_conditions': (20, 15),
+    'coms.qa.frontend.pages': (30, 25),
+    'coms.qa.frontend.pages.component': (30, 25),
+    'coms.qa.frontend.pages.component.button': (30, 25),
+    'coms.qa.frontend.pages.component.text': (30, 25),
+    'coms.qa.frontend.pages.component.text_field': (30, 25),
+}
+
+MEASURE = '''
+import json, sys, time
+import coms.qa
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+print(json.dumps([(time.perf_counter() - start) * 1000, sorted(set(sys.modules) - before)]))
+'''
+
+
+def measure(module: str, repeat: int) -> Tuple[float, list]:
+    best = None
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', MEASURE.format(module=module)], check=True, capture_output=True, text=True
+        ).stdout
+        elapsed, modules = json.loads(output)
+
+        if best is None or elapsed < best[0]:
+            best = (elapsed, modules)
+
+    assert best is not None
+
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-v', '--verbose', action='store_true', help='list the imported modules')
+    args = parser.parse_args()
+    failed = 0
+
+    print(f'{"module":<50} {"ms":>8} {"budget":>8} {"modules":>8} {"budget":>8}')
+
+    for module, (ms_budget, count_budget) in BUDGETS.items():
+        elapsed, modules = measure(module, args.repeat)
+        over = elapsed > ms_budget or len(modules) > count_budget
+        failed += over
+        mark = '  OVER BUDGET' if over else ''
+        print(f'{module:<50} {elapsed:>8.1f} {ms_budget:>8} {len(modules):>8} {count_budget:>8}{mark}')
+
+        if args.verbose or over:
+            print('    ' + ', '.join(modules))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
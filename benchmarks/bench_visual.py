@@ -0,0 +1,64 @@
+"""
+Timing of the visual comparison engine on full HD frames.
+
+    python benchmarks/bench_visual.py [--repeat 20]
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from coms.qa.frontend.helpers.visual import compare, decode, dhash, diff_image, encode
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def frames() -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(0)
+    expected = rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    actual = expected.copy()
+    actual[400:480, 600:900] = 255
+    # antialiasing noise below the tolerance
+    actual[::7, ::5] = np.clip(actual[::7, ::5].astype(np.int16) + 8, 0, 255).astype(np.uint8)
+
+    return {'expected': expected, 'actual': actual}
+
+
+def timeit(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    repeat = parser.parse_args().repeat
+
+    images = frames()
+    actual, expected = images['actual'], images['expected']
+    body = encode(actual)
+    diff = compare(actual, expected)
+    print(f'{WIDTH}x{HEIGHT}: {diff}')
+
+    cases = {
+        'dhash': lambda: dhash(actual),
+        'compare': lambda: compare(actual, expected),
+        'compare with ignored region': lambda: compare(actual, expected, ignore=[(600, 400, 300, 80)]),
+        'decode png': lambda: decode(body),
+        'diff image': lambda: diff_image(actual, diff),
+    }
+
+    for name, func in cases.items():
+        print(f'{name:<32} {timeit(func, repeat):>8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
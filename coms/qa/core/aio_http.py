@@ -0,0 +1,155 @@
+import asyncio
+import json
+import ssl
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+__all__ = ['AsyncHttpClient']
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+DEFAULT_TIMEOUT = 120
+NO_BODY_STATUSES = (204, 304)
+
+
+class AsyncHttpClient:
+    """
+    Minimal non-blocking HTTP/1.1 JSON client with keep-alive connection pooling,
+    enough to talk W3C WebDriver to a hub without blocking the event loop.
+    """
+
+    def __init__(self, base_url: str, size: int = 10, timeout: float = DEFAULT_TIMEOUT) -> None:
+        parts = urlsplit(base_url)
+        self.host: str = parts.hostname or 'localhost'
+        self.ssl: bool = parts.scheme == 'https'
+        self.port: int = parts.port or (443 if self.ssl else 80)
+        self.prefix: str = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.connections: int = 0
+        self.requests: int = 0
+        self._idle: List[Connection] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(self, method: str, path: str, body: Optional[Any] = None) -> Tuple[int, Any]:
+        payload = b'' if body is None else json.dumps(body).encode()
+
+        async with self._slots:
+            reused = bool(self._idle)
+            conn = self._idle.pop() if reused else await self._connect()
+
+            while True:
+                try:
+                    status, keep_alive, data = await asyncio.wait_for(
+                        self._send(conn, method, self.prefix + path, payload), self.timeout
+                    )
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn[1].close()
+
+                    if not reused:
+                        raise
+
+                    # the server dropped an idle keep-alive connection, retry once on a fresh one
+                    reused = False
+                    conn = await self._connect()
+                except BaseException:
+                    conn[1].close()
+                    raise
+
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+
+        self.requests += 1
+
+        return status, _decode(data)
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {'connections': self.connections, 'requests': self.requests, 'reused': self.requests - self.connections}
+
+    async def _connect(self) -> Connection:
+        context = ssl.create_default_context() if self.ssl else None
+        conn = await asyncio.open_connection(self.host, self.port, ssl=context)
+        self.connections += 1
+
+        return conn
+
+    async def _send(self, conn: Connection, method: str, path: str, payload: bytes) -> Tuple[int, bool, bytes]:
+        reader, writer = conn
+        head = (
+            f'{method} {path} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            'Accept: application/json\r\n'
+            'Content-Type: application/json;charset=UTF-8\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            'Connection: keep-alive\r\n\r\n'
+        )
+        writer.write(head.encode() + payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server')
+
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+
+        while True:
+            line = await reader.readline()
+
+            if line in (b'\r\n', b'\n', b''):
+                break
+
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+
+        if method == 'HEAD' or status in NO_BODY_STATUSES:
+            return status, keep_alive, b''
+
+        if 'content-length' in headers:
+            return status, keep_alive, await reader.readexactly(int(headers['content-length']))
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            return status, keep_alive, await self._read_chunked(reader)
+
+        return status, False, await reader.read()
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+
+            if size == 0:
+                break
+
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+
+        return b''.join(chunks)
+
+
+def _decode(data: bytes) -> Any:
+    """
+    JSON body, or the text of one that is not, e.g. the error page of a proxy in front of the hub.
+    """
+    if not data:
+        return None
+
+    try:
+        return json.loads(data)
+    except ValueError:
+        return data.decode('utf-8', 'replace')
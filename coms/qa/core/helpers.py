@@ -1,38 +1,128 @@
-import asyncio
 import logging
 import time
-from typing import Any, Callable
+import warnings
+from typing import Any, Callable, Optional
+
+from coms.qa.core.lazy import lazy_import
+from coms.qa.core.polling import (
+    Backoff,
+    ConstantBackoff,
+    Deadline,
+    ExponentialBackoff,
+    MetricsHook,
+    poll_delays,
+    report,
+)
+
+# only await_for needs it and the caller already runs an event loop by then
+asyncio = lazy_import('asyncio')
 
 __all__ = ['wait_for', 'await_for']
 
 logger = logging.getLogger(__name__)
 
 
-def wait_for(condition: Callable[[], Any], timeout: float = 30, poll_timeout: float = 1, msg: str = '') -> Any:
-    start = time.time()
-    while time.time() - start <= timeout:
+def _backoff(poll_timeout: Optional[float], max_interval: float, backoff: Optional[Backoff]) -> Backoff:
+    if backoff is not None:
+        return backoff
+
+    if poll_timeout is not None:
+        warnings.warn(
+            'poll_timeout is deprecated, pass max_interval or backoff=ConstantBackoff(poll_timeout)',
+            DeprecationWarning,
+            stacklevel=3,
+        )
+
+        return ConstantBackoff(poll_timeout)
+
+    return ExponentialBackoff(cap=max_interval)
+
+
+def wait_for(
+    condition: Callable[[], Any],
+    timeout: float = 30,
+    poll_timeout: Optional[float] = None,
+    msg: str = '',
+    backoff: Optional[Backoff] = None,
+    metrics: Optional[MetricsHook] = None,
+    max_interval: float = 1,
+) -> Any:
+    """
+    Polls fast at first and backs off up to max_interval seconds between attempts.
+    @poll_timeout - deprecated, polls at this fixed interval as it used to
+    """
+    deadline = Deadline(timeout)
+    delays = poll_delays(deadline, _backoff(poll_timeout, max_interval, backoff))
+    attempts = 0
+    error: Optional[Exception] = None
+
+    while True:
+        attempts += 1
+
         try:
             ret = condition()
             if ret:
+                report(metrics, msg, attempts, deadline, True)
                 return ret
         except Exception as e:
-            logger.warning('wait_for exception: %s', e)
+            logger.debug('wait_for exception: %s', e)
+            error = e
+
+        delay = next(delays, None)
 
-        time.sleep(poll_timeout)
+        if delay is None:
+            break
+
+        time.sleep(delay)
+
+    report(metrics, msg, attempts, deadline, False)
+
+    if error is not None:
+        logger.warning('wait_for timed out after %s attempts, last exception: %s', attempts, error)
 
     raise TimeoutError(msg)
 
 
-async def await_for(condition: Callable[[], Any], timeout: float = 30, poll_timeout: float = 1, msg: str = '') -> Any:
-    start = time.time()
-    while time.time() - start <= timeout:
+async def await_for(
+    condition: Callable[[], Any],
+    timeout: float = 30,
+    poll_timeout: Optional[float] = None,
+    msg: str = '',
+    backoff: Optional[Backoff] = None,
+    metrics: Optional[MetricsHook] = None,
+    max_interval: float = 1,
+) -> Any:
+    """
+    Polls fast at first and backs off up to max_interval seconds between attempts.
+    @poll_timeout - deprecated, polls at this fixed interval as it used to
+    """
+    deadline = Deadline(timeout)
+    delays = poll_delays(deadline, _backoff(poll_timeout, max_interval, backoff))
+    attempts = 0
+    error: Optional[Exception] = None
+
+    while True:
+        attempts += 1
+
         try:
             ret = await condition()
             if ret:
+                report(metrics, msg, attempts, deadline, True)
                 return ret
         except Exception as e:
-            logger.warning('await_for exception: %s', e)
+            logger.debug('await_for exception: %s', e)
+            error = e
+
+        delay = next(delays, None)
+
+        if delay is None:
+            break
+
+        await asyncio.sleep(delay)
+
+    report(metrics, msg, attempts, deadline, False)
 
-        await asyncio.sleep(poll_timeout)
+    if error is not None:
+        logger.warning('await_for timed out after %s attempts, last exception: %s', attempts, error)
 
     raise TimeoutError(msg)
@@ -0,0 +1,38 @@
+import importlib
+import types
+from typing import Any, Optional
+
+__all__ = ['lazy_import']
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module until the first attribute access imports it.
+    The module namespace is copied over, later lookups do not go through __getattr__.
+    """
+
+    def __init__(self, name: str, hint: Optional[str] = None) -> None:
+        super().__init__(name)
+        self.__dict__['_lazy_hint'] = hint
+
+    def __getattr__(self, attr: str) -> Any:
+        try:
+            module = importlib.import_module(self.__name__)
+        except ImportError as e:
+            hint = self.__dict__.get('_lazy_hint')
+
+            if hint is None:
+                raise
+
+            raise ImportError(hint) from e
+
+        self.__dict__.update(module.__dict__)
+
+        return getattr(module, attr)
+
+
+def lazy_import(name: str, hint: Optional[str] = None) -> Any:
+    """
+    @hint - message of the ImportError raised when an optional dependency is missing
+    """
+    return LazyModule(name, hint)
@@ -0,0 +1,109 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator, Optional
+
+__all__ = [
+    'Backoff',
+    'ConstantBackoff',
+    'ExponentialBackoff',
+    'WaitMetrics',
+    'MetricsHook',
+    'Deadline',
+    'poll_delays',
+    'report',
+]
+
+
+class Backoff(ABC):
+    @abstractmethod
+    def delays(self) -> Iterator[float]:
+        pass
+
+
+class ConstantBackoff(Backoff):
+    def __init__(self, interval: float = 1) -> None:
+        self.interval = interval
+
+    def delays(self) -> Iterator[float]:
+        while True:
+            yield self.interval
+
+
+class ExponentialBackoff(Backoff):
+    """
+    Fast first poll, then exponential growth up to cap.
+    @initial - first delay in seconds
+    @factor - growth factor between consecutive delays
+    @cap - upper bound of a single delay
+    @jitter - relative random spread applied to every delay
+    """
+
+    def __init__(self, initial: float = 0.05, factor: float = 2, cap: float = 1, jitter: float = 0.1) -> None:
+        self.initial = initial
+        self.factor = factor
+        self.cap = cap
+        self.jitter = jitter
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial
+
+        while True:
+            spread = delay * self.jitter
+            yield max(0.0, min(self.cap, delay + random.uniform(-spread, spread)))
+            delay = min(self.cap, delay * self.factor)
+
+
+class WaitMetrics:
+    __slots__ = ('msg', 'attempts', 'elapsed', 'succeeded')
+
+    def __init__(self, msg: str, attempts: int, elapsed: float, succeeded: bool) -> None:
+        self.msg = msg
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.succeeded = succeeded
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}(msg={self.msg!r}, attempts={self.attempts}, '
+            f'elapsed={self.elapsed:.3f}, succeeded={self.succeeded})'
+        )
+
+
+MetricsHook = Callable[[WaitMetrics], None]
+
+
+class Deadline:
+    def __init__(self, timeout: float) -> None:
+        self.start = time.monotonic()
+        self.end = self.start + timeout
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    @property
+    def remaining(self) -> float:
+        return self.end - time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() > self.end
+
+
+def poll_delays(deadline: Deadline, backoff: Backoff) -> Iterator[float]:
+    """
+    Yields sleep durations until the deadline, the last one is clipped so that
+    the final attempt happens right at the deadline.
+    """
+    for delay in backoff.delays():
+        remaining = deadline.remaining
+
+        if remaining <= 0:
+            return
+
+        yield min(delay, remaining)
+
+
+def report(hook: Optional[MetricsHook], msg: str, attempts: int, deadline: Deadline, succeeded: bool) -> None:
+    if hook is not None:
+        hook(WaitMetrics(msg, attempts, deadline.elapsed, succeeded))
@@ -0,0 +1,23 @@
+import math
+from typing import Dict, Iterable, Optional, Sequence
+
+__all__ = ['percentile', 'percentiles']
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """
+    Linear interpolation between closest ranks, values must be sorted.
+    """
+    if not values:
+        return None
+
+    rank = (len(values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def percentiles(values: Iterable[float], qs: Iterable[float] = (50, 90, 95, 99)) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+
+    return {f'p{q:g}': percentile(ordered, q) for q in qs}
@@ -0,0 +1,172 @@
+import json
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import allure
+import pytest
+from _pytest.fixtures import FixtureRequest
+
+from coms.qa.fixtures.application import Application, failure_artifacts
+from coms.qa.fixtures.artifacts import ArtifactPipeline
+from coms.qa.frontend.constants import CLIENT_BROWSERS, CLIENT_DEVICE_TYPE
+
+__all__ = ['AppMatrix', 'MatrixResult', 'make_app_matrix']
+
+logger = logging.getLogger(__name__)
+
+MatrixKey = Tuple[str, str]
+
+
+class MatrixResult:
+    __slots__ = ('browser', 'device_type', 'value', 'error', 'duration')
+
+    def __init__(self, browser: str, device_type: str) -> None:
+        self.browser = browser
+        self.device_type = device_type
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.duration: float = 0
+
+    @property
+    def name(self) -> str:
+        return f'{self.browser}/{self.device_type}'
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'browser': self.browser,
+            'device_type': self.device_type,
+            'ok': self.ok,
+            'duration': round(self.duration, 3),
+            'value': repr(self.value) if self.value is not None else None,
+            'error': self.error,
+        }
+
+
+class AppMatrix:
+    """
+    Opens an application for every browser x device combination at once and runs the same
+    scenario against all of them in parallel, so the run takes as long as the slowest combination.
+    Every combination gets its own allure step, failure artifacts and a line in one matrix report.
+    """
+
+    def __init__(
+        self,
+        make_app: Callable[..., Application],
+        browsers: Iterable[str],
+        device_types: Iterable[str],
+        artifact_pipeline: Optional[ArtifactPipeline] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.combinations: List[MatrixKey] = [(b, d) for b in browsers for d in device_types]
+        self.apps: Dict[MatrixKey, Application] = {}
+        self.errors: Dict[MatrixKey, MatrixResult] = {}
+        self._make_app = make_app
+        self._artifact_pipeline = artifact_pipeline
+        self._workers = workers or len(self.combinations)
+
+    def open(self) -> 'AppMatrix':
+        def make(key: MatrixKey) -> None:
+            result = MatrixResult(*key)
+            start = time.perf_counter()
+
+            try:
+                self.apps[key] = self._make_app(*key)
+            except Exception:  # pylint: disable=broad-except
+                result.error = traceback.format_exc()
+                result.duration = time.perf_counter() - start
+                self.errors[key] = result
+                logger.warning('Failed to open %s: %s', result.name, result.error)
+
+        self._map(make, self.combinations)
+
+        return self
+
+    def run(
+        self, scenario: Callable[[Application], Any], raise_on_failure: bool = True
+    ) -> Dict[MatrixKey, MatrixResult]:
+        """
+        Runs scenario(app) for every opened application, combinations that failed to open are reported as failed.
+        """
+
+        def execute(key: MatrixKey) -> MatrixResult:
+            result = MatrixResult(*key)
+            start = time.perf_counter()
+
+            with allure.step(result.name):
+                try:
+                    result.value = scenario(self.apps[key])
+                except Exception:  # pylint: disable=broad-except
+                    result.error = traceback.format_exc()
+                    self._collect_artifacts(result, self.apps[key])
+
+            result.duration = time.perf_counter() - start
+
+            return result
+
+        opened = [key for key in self.combinations if key in self.apps]
+        results = dict(self.errors)
+        results.update(zip(opened, self._map(execute, opened)))
+        results = {key: results[key] for key in self.combinations}
+        self.report(results)
+
+        failed = [result for result in results.values() if not result.ok]
+
+        if raise_on_failure and failed:
+            raise AssertionError(
+                f'{len(failed)} of {len(results)} combinations failed:\n'
+                + '\n'.join(f'{result.name}:\n{result.error}' for result in failed)
+            )
+
+        return results
+
+    @staticmethod
+    def report(results: Dict[MatrixKey, MatrixResult]) -> None:
+        allure.attach(
+            json.dumps([result.as_dict() for result in results.values()], indent=2),
+            name='Browser matrix',
+            attachment_type=allure.attachment_type.JSON,
+        )
+
+    def _collect_artifacts(self, result: MatrixResult, app: Application) -> None:
+        if self._artifact_pipeline is None:
+            return
+
+        jobs = failure_artifacts(app)
+
+        for job in jobs:
+            job.name = f'{result.name} {job.name}'
+
+        self._artifact_pipeline.collect(jobs)
+
+    def _map(self, func: Callable[[MatrixKey], Any], keys: List[MatrixKey]) -> List[Any]:
+        # a fresh pool every time: allure binds a thread to the test that was running when it started
+        workers = max(1, min(self._workers, len(keys)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='matrix') as pool:
+            return list(pool.map(func, keys))
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def make_app_matrix(
+    request: FixtureRequest, make_app: Callable[..., Application], artifact_pipeline: ArtifactPipeline
+) -> Callable[..., AppMatrix]:
+    def make(
+        browsers: Iterable[str] = tuple(CLIENT_BROWSERS), device_types: Iterable[str] = tuple(CLIENT_DEVICE_TYPE)
+    ) -> AppMatrix:
+        return AppMatrix(
+            make_app,
+            browsers,
+            device_types,
+            artifact_pipeline,
+            request.config.getoption(name='matrix_workers', default=None),
+        ).open()
+
+    return make
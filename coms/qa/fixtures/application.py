@@ -1,22 +1,90 @@
-import http
 import json
-import time
-from typing import Callable, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import allure
 import pytest
-import requests
+from _pytest.config import Config
 from _pytest.fixtures import FixtureRequest
-from selenium.common.exceptions import InvalidSessionIdException, NoSuchElementException
+from _pytest.main import Session
+from _pytest.nodes import Item
+from _pytest.terminal import TerminalReporter
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
-from coms.qa.core.helpers import wait_for
+from coms.qa.fixtures.artifacts import (  # noqa: F401 pylint: disable=unused-import
+    ArtifactJob,
+    ArtifactPipeline,
+    artifact_pipeline,
+)
+from coms.qa.fixtures.driver import reset_driver
+from coms.qa.fixtures.replay import RECORDING_KEY
+from coms.qa.fixtures.session_pool import SessionPool
+from coms.qa.fixtures.tracing import TRACER_KEY, export_histograms, merge_histograms, tracing_summary
+from coms.qa.fixtures.transport import pool_size
+from coms.qa.frontend.constants import SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, SETTLE_TIMEOUT, WEB_DRIVER_WAIT
+from coms.qa.frontend.helpers.js_locators import LOCATE_JS, js_locator
+from coms.qa.frontend.helpers.network import NetworkCollector
+from coms.qa.frontend.helpers.network_profile import (
+    NetworkProfile,
+    export_totals,
+    merge_totals,
+    network_profile_summary,
+)
+from coms.qa.frontend.helpers.page_timing import export_timings, merge_timings, timing_summary, validate_budget
+from coms.qa.frontend.helpers.screenshots import ScreenshotOptions, ScreenshotRecorder
+from coms.qa.frontend.helpers.video import delete_video, fetch_video
 
 __all__ = ['Application']
 
+ELEMENTS_EXIST_SCRIPT = (
+    LOCATE_JS
+    + '''
+var root = arguments[0], locators = arguments[1];
+return locators.map(function (locator) {
+    if (locator === null) { return null; }
+    try { return locateAll(root, locator[0], locator[1]).length > 0; } catch (e) { return null; }
+});
+'''
+)
+
+SETTLE_SCRIPT = '''
+var elements = arguments[0], scroll = arguments[1], cap = arguments[2] * 1000;
+var done = arguments[arguments.length - 1];
+function position(el) {
+    var r = el.getBoundingClientRect();
+    return [r.x, r.y, r.width, r.height].join(',');
+}
+function settle(el, next) {
+    var last = null, stable = 0, finished = false;
+    var timer = setTimeout(finish, cap);
+    function finish() {
+        if (finished) { return; }
+        finished = true;
+        clearTimeout(timer);
+        window.removeEventListener('scrollend', finish, true);
+        next();
+    }
+    function tick() {
+        if (finished) { return; }
+        var current = position(el);
+        stable = current === last ? stable + 1 : 0;
+        last = current;
+        if (stable >= 2) { finish(); } else { window.requestAnimationFrame(tick); }
+    }
+    window.addEventListener('scrollend', finish, true);
+    if (scroll) { el.scrollIntoView({block: 'center'}); }
+    window.requestAnimationFrame(tick);
+}
+(function run(i) {
+    if (i >= elements.length) { done(true); return; }
+    settle(elements[i], function () { run(i + 1); });
+})(0);
+'''
+
 
 class Application:
     def __init__(self, browser: str, device_type: str) -> None:
@@ -24,6 +92,14 @@ class Application:
         self.device_type: str = device_type
         self._driver: Optional[WebDriver] = None
         self._ui: str = ''
+        self.push_waits: bool = False
+        self._implicit_wait: Optional[float] = None
+        self.network: Optional[NetworkCollector] = None
+        self.network_profile: Optional[NetworkProfile] = None
+        self.measure_timing: bool = False
+        self.performance_budget: Dict[str, float] = {}
+        self.performance_budget_strict: bool = False
+        self.screenshots: ScreenshotRecorder = ScreenshotRecorder(self)
 
     @property
     def driver(self) -> WebDriver:
@@ -35,6 +111,7 @@ class Application:
     @driver.setter
     def driver(self, value: WebDriver) -> None:
         self._driver = value
+        self._implicit_wait = None
 
     @property
     def ui(self) -> str:
@@ -44,12 +121,36 @@ class Application:
     def ui(self, value: str) -> None:
         self._ui = value
 
-    def set_implicitly_wait(self, wait: int = 30) -> None:
+    @property
+    def implicit_wait(self) -> Optional[float]:
+        return self._implicit_wait
+
+    def sync_implicitly_wait(self, wait: Optional[float]) -> None:
+        """
+        Records the implicit wait the session already has, e.g. set by make_driver.
+        """
+        self._implicit_wait = wait
+
+    def set_implicitly_wait(self, wait: float = WEB_DRIVER_WAIT) -> None:
+        if self._implicit_wait == wait:
+            return
+
         self.driver.implicitly_wait(wait)
+        self._implicit_wait = wait
 
     def restore_implicitly_wait(self) -> None:
         self.set_implicitly_wait()
 
+    @contextmanager
+    def implicitly_waiting(self, wait: float) -> Iterator[None]:
+        previous = self._implicit_wait
+        self.set_implicitly_wait(wait)
+
+        try:
+            yield
+        finally:
+            self.set_implicitly_wait(WEB_DRIVER_WAIT if previous is None else previous)
+
     def destroy(self) -> None:
         self.driver.quit()
 
@@ -57,56 +158,127 @@ class Application:
         return self.device_type == 'mobile'
 
     def move_to_element(
-        self, element: Optional[WebElement] = None, locator: Optional[Tuple[By, str]] = None
+        self,
+        element: Optional[WebElement] = None,
+        locator: Optional[Tuple[By, str]] = None,
+        settle_timeout: float = SETTLE_TIMEOUT,
     ) -> WebElement:
         if element is None:
             assert locator is not None, 'Both parameters are None(element, locator), incorrect call'
 
             element = self.driver.find_element(*locator)
 
+        return self.move_to_elements([element], settle_timeout=settle_timeout)[0]
+
+    def move_to_elements(
+        self,
+        elements: Optional[List[WebElement]] = None,
+        locators: Optional[List[Tuple[By, str]]] = None,
+        settle_timeout: float = SETTLE_TIMEOUT,
+    ) -> List[WebElement]:
+        """
+        Hovers the elements in order with a single actions call and waits until the last one settles.
+        """
+        elements = self._resolve_elements(elements, locators)
         actions = ActionChains(self.driver)  # type: ignore[no-untyped-call]
-        actions.move_to_element(element).perform()  # type: ignore[no-untyped-call]
-        time.sleep(1)
 
-        return element
+        for element in elements:
+            actions.move_to_element(element)  # type: ignore[no-untyped-call]
+
+        actions.perform()  # type: ignore[no-untyped-call]
+        self.wait_for_settle(elements[-1:], settle_timeout=settle_timeout)
+
+        return elements
 
     def scroll_to_element(
-        self, element: Optional[WebElement] = None, locator: Optional[Tuple[By, str]] = None
+        self,
+        element: Optional[WebElement] = None,
+        locator: Optional[Tuple[By, str]] = None,
+        settle_timeout: float = SETTLE_TIMEOUT,
     ) -> WebElement:
         if element is None:
             assert locator is not None, 'Both parameters are None(element, locator), incorrect call'
 
             element = self.driver.find_element(*locator)
 
-        self.driver.execute_script(  # type: ignore[no-untyped-call]
-            'arguments[0].scrollIntoView({block: "center"})', element
+        return self.scroll_to_elements([element], settle_timeout=settle_timeout)[0]
+
+    def scroll_to_elements(
+        self,
+        elements: Optional[List[WebElement]] = None,
+        locators: Optional[List[Tuple[By, str]]] = None,
+        settle_timeout: float = SETTLE_TIMEOUT,
+    ) -> List[WebElement]:
+        """
+        Scrolls to every element in order in one script call, each scroll waits until the page settles.
+        """
+        elements = self._resolve_elements(elements, locators)
+        self.wait_for_settle(elements, scroll=True, settle_timeout=settle_timeout)
+
+        return elements
+
+    def wait_for_settle(
+        self, elements: List[WebElement], scroll: bool = False, settle_timeout: float = SETTLE_TIMEOUT
+    ) -> None:
+        """
+        Returns once scrollend fired or the element rect stayed the same for two animation frames,
+        settle_timeout caps the wait for every element.
+        """
+        if not elements:
+            return
+
+        self.driver.execute_async_script(  # type: ignore[no-untyped-call]
+            SETTLE_SCRIPT, elements, scroll, settle_timeout
         )
-        time.sleep(1)
 
-        return element
+    def _resolve_elements(
+        self, elements: Optional[List[WebElement]], locators: Optional[List[Tuple[By, str]]]
+    ) -> List[WebElement]:
+        if elements is None:
+            assert locators is not None, 'Both parameters are None(elements, locators), incorrect call'
+
+            elements = [self.driver.find_element(*locator) for locator in locators]
+
+        return elements
 
     def is_element_exists(
         self,
         locator: Tuple[By, str],
         element: Optional[WebElement] = None,
+        timeout: float = 1,
     ) -> bool:
-        self.set_implicitly_wait(1)
-        is_exists = False
+        if not timeout:
+            return self.elements_exist([locator], element)[locator]
 
-        try:
-            if element:
-                element.find_element(*locator)
-            else:
-                self.driver.find_element(*locator)
+        parent: Union[WebElement, WebDriver] = element if element is not None else self.driver
 
-            is_exists = True
+        with self.implicitly_waiting(timeout):
+            return bool(parent.find_elements(*locator))
 
-        except NoSuchElementException:
-            pass
+    def elements_exist(
+        self,
+        locators: Iterable[Tuple[By, str]],
+        element: Optional[WebElement] = None,
+    ) -> Dict[Tuple[By, str], bool]:
+        """
+        Zero-wait existence check of many locators in a single script call.
+        Locators the browser can not resolve are checked with find_elements without implicit wait.
+        """
+        locators = list(locators)
+        found = self.driver.execute_script(  # type: ignore[no-untyped-call]
+            ELEMENTS_EXIST_SCRIPT, element, [js_locator(locator) for locator in locators]
+        )
+        ret = {}
+        parent: Union[WebElement, WebDriver] = element if element is not None else self.driver
 
-        self.restore_implicitly_wait()
+        for locator, exists in zip(locators, found):
+            if exists is None:
+                with self.implicitly_waiting(0):
+                    exists = bool(parent.find_elements(*locator))
 
-        return is_exists
+            ret[locator] = exists
+
+        return ret
 
     def get_network_messages(self) -> List[Dict]:
         return self.driver.execute_script(  # type: ignore[no-untyped-call]
@@ -129,58 +301,202 @@ class Application:
         return response.get('value')
 
 
-# pylint: disable=unused-argument
+def pytest_configure(config: Config) -> None:
+    config.addinivalue_line('markers', 'network_metrics: collect per-request network metrics and attach them to allure')
+    config.addinivalue_line(
+        'markers',
+        'performance_budget(strict=False, **limits): page load budget in ms for dns, ttfb, dom_content_loaded, '
+        'load, fcp and lcp, strict fails the test instead of warning',
+    )
+    config.addinivalue_line(
+        'markers', 'max_round_trips(limit): trace WebDriver commands and fail when the test body sends more than limit'
+    )
+    config.addinivalue_line(
+        'markers',
+        'network_profile(*presets, **overrides): block urls and throttle the chrome network through CDP, '
+        'presets: no_third_party, fast_3g, slow_3g, offline, no_cache',
+    )
+
+
+# what the summaries below are made of, sent from xdist workers to the controller that prints them
+WORKER_STATS: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {
+    'coms_page_timing': (export_timings, merge_timings),
+    'coms_tracing': (export_histograms, merge_histograms),
+    'coms_network_profile': (export_totals, merge_totals),
+}
+
+
+def pytest_sessionfinish(session: Session) -> None:
+    workeroutput = getattr(session.config, 'workeroutput', None)
+
+    if workeroutput is not None:
+        for key, (export, _) in WORKER_STATS.items():
+            workeroutput[key] = export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    workeroutput = getattr(node, 'workeroutput', {})
+
+    for key, (_, merge) in WORKER_STATS.items():
+        if key in workeroutput:
+            merge(workeroutput[key])
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: Item) -> Iterator[None]:
+    """
+    Counts the commands of the test body alone and checks max_round_trips and strict replays as part of the test.
+    """
+    tracer = item.stash.get(TRACER_KEY, None)
+    recording = item.stash.get(RECORDING_KEY, None)
+
+    if tracer is None and recording is None:
+        return (yield)
+
+    limit = round_trips_limit(item) if tracer is not None else None
+
+    if tracer is not None:
+        tracer.phase = 'call'
+
+    try:
+        result = yield
+    finally:
+        if tracer is not None:
+            tracer.phase = 'teardown'
+
+    if tracer is not None and limit is not None and tracer.round_trips('call') > limit:
+        pytest.fail(f'{tracer.round_trips("call")} WebDriver round trips, limit is {limit}', pytrace=False)
+
+    if recording is not None and item.config.getoption(name='replay_strict', default=False):
+        mismatch = recording.mismatch(settled=True)
+
+        if mismatch is not None:
+            pytest.fail(mismatch, pytrace=False)
+
+    return result
+
+
+def round_trips_limit(item: Item) -> Optional[int]:
+    marker = item.get_closest_marker('max_round_trips')
+
+    if marker is None:
+        return None
+
+    limit = marker.kwargs.get('limit', marker.args[0] if marker.args else None)
+
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        pytest.fail(
+            f'max_round_trips needs a non-negative int limit: @pytest.mark.max_round_trips(n) '
+            f'or @pytest.mark.max_round_trips(limit=n), got {marker.args!r} {marker.kwargs!r}',
+            pytrace=False,
+        )
+
+    return limit
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    for title, lines in (
+        ('page load timing, ms', timing_summary()),
+        ('webdriver commands', tracing_summary()),
+        ('network profile', network_profile_summary()),
+    ):
+        if not lines:
+            continue
+
+        terminalreporter.write_sep('=', title)
+
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
+# pylint: disable=unused-argument,redefined-outer-name
 @pytest.fixture
-def make_app(request: FixtureRequest, make_driver: Callable[..., WebDriver]) -> Callable[..., Application]:
+def make_app(
+    request: FixtureRequest,
+    make_driver: Callable[..., WebDriver],
+    session_pool: SessionPool,
+    artifact_pipeline: ArtifactPipeline,
+    network_profile: Optional[NetworkProfile],
+) -> Callable[..., Application]:
     def make(browser: str, device_type: str) -> Application:
         fixture = Application(browser, device_type)
         fixture.ui = request.config.option.ui_url
+        fixture.push_waits = request.config.getoption(name='push_waits', default=False)
         fixture.driver = make_driver(browser, device_type)
+        fixture.sync_implicitly_wait(request.config.option.wait)
+
+        if network_profile is not None and network_profile.apply(fixture):
+            fixture.network_profile = network_profile
+
+        fixture.screenshots.options = ScreenshotOptions(
+            request.config.getoption(name='screenshot_format', default=SCREENSHOT_FORMAT),
+            request.config.getoption(name='screenshot_quality', default=SCREENSHOT_QUALITY),
+        )
+
+        budget_marker = request.node.get_closest_marker('performance_budget')
+        fixture.measure_timing = request.config.getoption(name='measure_page_timing', default=False)
+
+        if budget_marker is not None:
+            fixture.performance_budget = {k: v for k, v in budget_marker.kwargs.items() if k != 'strict'}
+            validate_budget(fixture.performance_budget)
+            fixture.performance_budget_strict = budget_marker.kwargs.get('strict', False)
+
+        if request.node.get_closest_marker('network_metrics') is not None or fixture.network_profile is not None:
+            fixture.network = NetworkCollector(fixture)
+            fixture.network.reset()
+
         failed_before = request.session.testsfailed
         session_id = fixture.driver.session_id
         remote_ip = request.config.option.remote_ip
         remote_port = request.config.option.remote_port
+        # a replayed session never reached the hub, there is no video
+        enable_video = request.config.option.enable_video and not request.config.getoption(
+            name='replay_commands', default=None
+        )
+        hub_pool_size = pool_size(request.config)
 
         def fin() -> None:
-            if is_driver_alive(fixture):
-                if failed_before != request.session.testsfailed:
-                    try:
-                        allure.attach(
-                            name='Screenshot',
-                            body=fixture.driver.get_screenshot_as_png(),
-                            attachment_type=allure.attachment_type.PNG,
-                        )
-                    except TypeError:
-                        pass
+            tracer = request.node.stash.get(TRACER_KEY, None)
 
-                fixture.destroy()
+            if tracer is not None:
+                tracer.phase = 'teardown'
 
-                if request.config.option.enable_video and failed_before != request.session.testsfailed:
+            failed = failed_before != request.session.testsfailed
+            alive = is_driver_alive(fixture)
+            fixture.screenshots.flush()
 
-                    def condition() -> bytes:
-                        path = f'http://{remote_ip}:{remote_port}/video/{session_id}.mp4'
-                        r = requests.get(path)
+            if alive and fixture.network is not None:
+                fixture.network.drain()
 
-                        assert r.status_code == http.HTTPStatus.OK
+                if fixture.network_profile is not None:
+                    fixture.network_profile.attach(fixture.network.records)
 
-                        return r.content
+                if request.node.get_closest_marker('network_metrics') is not None:
+                    fixture.network.attach()
 
-                    response = wait_for(condition, msg='Wait for video file')
-                    allure.attach(
-                        name=f'{session_id}.mp4',
-                        body=response,
-                        attachment_type=allure.attachment_type.MP4,
-                    )
+            if alive and failed:
+                artifact_pipeline.collect(failure_artifacts(fixture))
+
+            if session_pool.owns(fixture.driver):
 
-                if request.config.option.enable_video:
+                def reset(wd: WebDriver) -> None:
+                    if fixture.network_profile is not None:
+                        fixture.network_profile.reset(fixture)
 
-                    def condition_delete() -> bool:
-                        path = f'http://{remote_ip}:{remote_port}/video/{session_id}.mp4'
-                        response = requests.delete(path)
+                    reset_driver(wd, device_type, request.config.option.wait)
 
-                        return response.status_code == http.HTTPStatus.OK
+                session_pool.release(fixture.driver, failed, reset)
 
-                    wait_for(condition_delete, msg='Wait for delete video file')
+                return
+
+            if alive:
+                fixture.destroy()
+
+                if enable_video and session_id is not None:
+                    artifact_pipeline.defer(
+                        request.node, video_artifact(remote_ip, remote_port, session_id, failed, hub_pool_size)
+                    )
 
         request.addfinalizer(fin)
 
@@ -189,9 +505,43 @@ def make_app(request: FixtureRequest, make_driver: Callable[..., WebDriver]) ->
     return make
 
 
+def video_artifact(remote_ip: str, remote_port: str, session_id: str, failed: bool, size: int) -> ArtifactJob:
+    """
+    Fetches the video of a failed test and deletes it from the hub in any case.
+    """
+
+    def video() -> Optional[str]:
+        path: Optional[str] = None
+
+        if failed:
+            path = fetch_video(remote_ip, remote_port, session_id, pool_size=size)
+
+        delete_video(remote_ip, remote_port, session_id, pool_size=size)
+
+        return path
+
+    return ArtifactJob(f'{session_id}.mp4', video, allure.attachment_type.MP4, is_file=True)
+
+
+def failure_artifacts(app: Application) -> List[ArtifactJob]:
+    def browser_logs() -> Optional[bytes]:
+        try:
+            logs = app.driver.get_log('browser')
+        except WebDriverException:
+            return None
+
+        return '\n'.join(f"{entry['level']} {entry['message']}" for entry in logs).encode() or None
+
+    return [
+        app.screenshots.job('Screenshot'),
+        ArtifactJob('Page source', lambda: app.driver.page_source.encode(), allure.attachment_type.HTML),
+        ArtifactJob('Browser logs', browser_logs, allure.attachment_type.TEXT),
+    ]
+
+
 def is_driver_alive(app: Application) -> bool:
     try:
-        assert app.driver.get_screenshot_as_png()
+        assert app.driver.current_window_handle
 
         return True
     except InvalidSessionIdException:
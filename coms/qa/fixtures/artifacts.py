@@ -0,0 +1,226 @@
+import glob
+import json
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import allure
+import pytest
+from _pytest.config import Config
+from _pytest.fixtures import FixtureRequest
+from _pytest.nodes import Node
+from allure_commons.model2 import Attachment
+from allure_commons.types import AttachmentType
+
+__all__ = ['ArtifactJob', 'ArtifactPipeline', 'artifact_pipeline']
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactJob:
+    """
+    Unit of work of the artifact pipeline.
+    @name - attachment name
+    @collect - returns the attachment body, a path to it when is_file is set, or None to attach nothing
+    @attachment_type - allure attachment type
+    @is_file - collect returns a path, the file is moved into the report
+    @retries - extra attempts after a failure
+    """
+
+    __slots__ = ('name', 'collect', 'attachment_type', 'is_file', 'retries')
+
+    def __init__(
+        self,
+        name: str,
+        collect: Callable[[], Optional[object]],
+        attachment_type: Union[AttachmentType, str, None] = None,
+        is_file: bool = False,
+        retries: int = 1,
+    ) -> None:
+        self.name = name
+        self.collect = collect
+        self.attachment_type = attachment_type
+        self.is_file = is_file
+        self.retries = retries
+
+    def run(self) -> Optional[object]:
+        for attempt in range(self.retries + 1):
+            try:
+                return self.collect()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning('Artifact %s attempt %s failed: %s', self.name, attempt + 1, e)
+
+        return None
+
+
+class ArtifactPipeline:
+    """
+    Per-worker executor for test artifacts.
+    collect() gathers artifacts that need a live session concurrently and attaches them right away,
+    defer() runs jobs in the background after the session is released: the workers write the attachments
+    into the allure results dir as they finish and close() adds them to the test results at the end of the run.
+    """
+
+    def __init__(self, workers: int = 4, results_dir: Optional[str] = None) -> None:
+        self.results_dir = results_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='artifacts')
+        self._deferred: List[Tuple[Optional[str], Future]] = []
+        self._lock = threading.Lock()
+
+    def collect(self, jobs: List[ArtifactJob]) -> None:
+        futures = [self._executor.submit(job.run) for job in jobs]
+
+        for job, future in zip(jobs, futures):
+            body = future.result()
+
+            if body is None:
+                continue
+
+            if job.is_file:
+                attach_file(job, str(body))
+            else:
+                allure.attach(body, name=job.name, attachment_type=job.attachment_type)
+
+    def defer(self, node: Node, job: ArtifactJob) -> Future:
+        """
+        Runs the job in the background and attaches its output to the allure result of the node's test.
+        """
+        result_uuid = current_result_uuid(node.config) if self.results_dir is not None else None
+        future = self._executor.submit(self._run_deferred, job, result_uuid is not None)
+
+        with self._lock:
+            self._deferred.append((result_uuid, future))
+
+        return future
+
+    def close(self) -> None:
+        """
+        Waits for the background jobs and adds their attachments to the result files of the tests.
+        The last test of the session is reported after the session fixtures are torn down,
+        so the fixture calls this at the end of the run.
+        """
+        with self._lock:
+            deferred, self._deferred = self._deferred, []
+
+        wait([future for _, future in deferred])
+        self._executor.shutdown(wait=True)
+
+        attachments: Dict[str, List[Attachment]] = {}
+
+        for result_uuid, future in deferred:
+            attachment = future.result()
+
+            if result_uuid is not None and attachment is not None:
+                attachments.setdefault(result_uuid, []).append(attachment)
+
+        if attachments:
+            self._patch_results(attachments)
+
+    def _run_deferred(self, job: ArtifactJob, attach: bool) -> Optional[Attachment]:
+        body = job.run()
+
+        if body is None:
+            return None
+
+        try:
+            if attach:
+                return self._write_attachment(job, body)
+        except OSError as e:
+            logger.warning('Artifact %s is not attached: %s', job.name, e)
+        finally:
+            if job.is_file and os.path.exists(str(body)):
+                os.remove(str(body))
+
+        return None
+
+    def _patch_results(self, attachments: Dict[str, List[Attachment]]) -> None:
+        for path in glob.glob(os.path.join(str(self.results_dir), '*-result.json')):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            added = attachments.pop(result.get('uuid'), None)
+
+            if added is None:
+                continue
+
+            result.setdefault('attachments', []).extend(
+                {'name': item.name, 'source': item.source, 'type': item.type} for item in added
+            )
+
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+
+            os.replace(f'{path}.tmp', path)
+
+            if not attachments:
+                return
+
+        for added in attachments.values():
+            for item in added:
+                os.remove(os.path.join(str(self.results_dir), item.source))
+
+        logger.warning('No allure result for %s deferred artifacts, dropped them', sum(map(len, attachments.values())))
+
+    def _write_attachment(self, job: ArtifactJob, body: object) -> Attachment:
+        mime, extension = attachment_mime(job.attachment_type)
+        source = f'{uuid.uuid4()}-attachment.{extension}'
+        target = os.path.join(str(self.results_dir), source)
+
+        if job.is_file:
+            shutil.move(str(body), target)
+        else:
+            with open(target, 'wb') as f:
+                f.write(body if isinstance(body, bytes) else str(body).encode())
+
+        return Attachment(name=job.name, source=source, type=mime)
+
+
+def current_result_uuid(config: Config) -> Optional[str]:
+    """
+    Uuid of the allure result of the test that is running, None when allure does not report.
+    """
+    listener = config.pluginmanager.getplugin('allure_listener')
+    result = listener.allure_logger.get_test(None) if listener is not None else None
+
+    return result.uuid if result is not None else None
+
+
+def attachment_mime(attachment_type: Union[AttachmentType, str, None]) -> Tuple[str, str]:
+    """
+    Mime type and extension of an allure attachment type, which may also be a plain mime string.
+    """
+    if isinstance(attachment_type, AttachmentType):
+        return attachment_type.mime_type, attachment_type.extension
+
+    if attachment_type:
+        return attachment_type, (mimetypes.guess_extension(attachment_type) or '.bin').lstrip('.')
+
+    return 'application/octet-stream', 'bin'
+
+
+def attach_file(job: ArtifactJob, path: str) -> None:
+    try:
+        allure.attach.file(path, name=job.name, attachment_type=job.attachment_type)
+    finally:
+        os.remove(path)
+
+
+@pytest.fixture(scope='session')
+def artifact_pipeline(request: FixtureRequest) -> ArtifactPipeline:
+    pipeline = ArtifactPipeline(
+        workers=request.config.getoption(name='artifact_workers', default=4),
+        results_dir=request.config.getoption(name='allure_report_dir', default=None),
+    )
+
+    # the result of the last test is written after the session fixtures are torn down
+    request.config.add_cleanup(pipeline.close)
+
+    return pipeline
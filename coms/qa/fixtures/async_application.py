@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import allure
+import pytest
+from _pytest.fixtures import FixtureRequest
+from selenium.webdriver.common.by import By
+
+from coms.qa.core.aio_http import AsyncHttpClient
+from coms.qa.fixtures.application import ELEMENTS_EXIST_SCRIPT, video_artifact
+from coms.qa.fixtures.artifacts import ArtifactPipeline
+from coms.qa.fixtures.async_driver import AsyncWebDriver, AsyncWebElement
+from coms.qa.fixtures.driver import desired_capabilities, screen_resolution
+from coms.qa.fixtures.transport import pool_size
+from coms.qa.frontend.constants import WEB_DRIVER_WAIT
+from coms.qa.frontend.helpers.js_locators import js_locator
+
+try:
+    import pytest_asyncio  # type: ignore[import-not-found]
+except ImportError:  # the plugin still loads, make_async_app reports what is missing
+    pytest_asyncio = None
+
+__all__ = ['AsyncApplication']
+
+# one in-flight request per concurrent session, the hub is the limit rather than threads
+ASYNC_POOL_SIZE = 32
+
+
+class AsyncApplication:
+    def __init__(self, browser: str, device_type: str) -> None:
+        self.browser: str = browser
+        self.device_type: str = device_type
+        self._driver: Optional[AsyncWebDriver] = None
+        self._ui: str = ''
+        self._implicit_wait: Optional[float] = None
+
+    @property
+    def driver(self) -> AsyncWebDriver:
+        if self._driver is None:
+            raise RuntimeError('Driver not initialized')
+
+        return self._driver
+
+    @driver.setter
+    def driver(self, value: AsyncWebDriver) -> None:
+        self._driver = value
+        self._implicit_wait = None
+
+    @property
+    def ui(self) -> str:
+        return self._ui
+
+    @ui.setter
+    def ui(self, value: str) -> None:
+        self._ui = value
+
+    @property
+    def implicit_wait(self) -> Optional[float]:
+        return self._implicit_wait
+
+    def sync_implicitly_wait(self, wait: Optional[float]) -> None:
+        self._implicit_wait = wait
+
+    async def set_implicitly_wait(self, wait: float = WEB_DRIVER_WAIT) -> None:
+        if self._implicit_wait == wait:
+            return
+
+        await self.driver.implicitly_wait(wait)
+        self._implicit_wait = wait
+
+    async def restore_implicitly_wait(self) -> None:
+        await self.set_implicitly_wait()
+
+    async def destroy(self) -> None:
+        await self.driver.quit()
+
+    def is_mobile(self) -> bool:
+        return self.device_type == 'mobile'
+
+    async def is_element_exists(
+        self, locator: Tuple[By, str], element: Optional[AsyncWebElement] = None, timeout: float = 1
+    ) -> bool:
+        if not timeout:
+            return (await self.elements_exist([locator], element))[locator]
+
+        return await self._exists_waiting(locator, element, timeout)
+
+    async def elements_exist(
+        self, locators: Iterable[Tuple[By, str]], element: Optional[AsyncWebElement] = None
+    ) -> Dict[Tuple[By, str], bool]:
+        locators = list(locators)
+        found = await self.driver.execute_script(
+            ELEMENTS_EXIST_SCRIPT, element, [js_locator(locator) for locator in locators]
+        )
+        ret = {}
+
+        for locator, exists in zip(locators, found):
+            ret[locator] = await self._exists_waiting(locator, element, 0) if exists is None else exists
+
+        return ret
+
+    async def _exists_waiting(self, locator: Tuple[By, str], element: Optional[AsyncWebElement], wait: float) -> bool:
+        parent = element if element is not None else self.driver
+        previous = self._implicit_wait
+        await self.set_implicitly_wait(wait)
+
+        try:
+            return bool(await parent.find_elements(*locator))
+        finally:
+            await self.set_implicitly_wait(WEB_DRIVER_WAIT if previous is None else previous)
+
+
+def async_fixture(func: Callable[..., Any]) -> Any:
+    if pytest_asyncio is not None:
+        return pytest_asyncio.fixture(func)
+
+    @pytest.fixture(name=func.__name__)
+    def unavailable() -> None:
+        raise ImportError(f'{func.__name__} needs pytest-asyncio: pip install pytest-asyncio')
+
+    return unavailable
+
+
+async def attach_failure_artifacts(app: AsyncApplication) -> None:
+    """
+    The artifacts make_app collects for a failed test, read from the session concurrently.
+    """
+
+    async def page_source() -> bytes:
+        return (await app.driver.page_source()).encode()
+
+    async def browser_logs() -> Optional[bytes]:
+        logs = await app.driver.execute('POST', '/se/log', {'type': 'browser'})
+
+        return '\n'.join(f"{entry['level']} {entry['message']}" for entry in logs).encode() or None
+
+    jobs = (
+        ('Screenshot', app.driver.get_screenshot_as_png(), allure.attachment_type.PNG),
+        ('Page source', page_source(), allure.attachment_type.HTML),
+        ('Browser logs', browser_logs(), allure.attachment_type.TEXT),
+    )
+    bodies = await asyncio.gather(*(job for _, job, _ in jobs), return_exceptions=True)
+
+    for (name, _, attachment_type), body in zip(jobs, bodies):
+        if isinstance(body, Exception):
+            logging.warning('Failed to collect %s of session %s: %s', name, app.driver.session_id, body)
+        elif body:
+            allure.attach(body, name=name, attachment_type=attachment_type)
+
+
+# pylint: disable=redefined-outer-name
+@async_fixture
+async def make_async_app(
+    request: FixtureRequest, artifact_pipeline: ArtifactPipeline
+) -> AsyncIterator[Callable[..., Awaitable[AsyncApplication]]]:
+    """
+    Async counterpart of make_app: every application made by the test shares one non-blocking
+    connection pool to the hub, so a single event loop can drive many sessions at once.
+    Failed tests get the same screenshot, page source, browser logs and video.
+    """
+    remote_ip: str = request.config.option.remote_ip
+    remote_port: str = request.config.option.remote_port
+    remote_protocol: str = request.config.getoption(name='remote_protocol', default='http')
+    size: int = request.config.getoption(name='async_pool_size', default=ASYNC_POOL_SIZE)
+    client = AsyncHttpClient(f'{remote_protocol}://{remote_ip}:{remote_port}/wd/hub', size)
+    apps: List[AsyncApplication] = []
+    failed_before = request.session.testsfailed
+
+    async def make(browser: str, device_type: str) -> AsyncApplication:
+        allure.dynamic.label('browser', browser)
+        allure.dynamic.label('device_type', device_type)
+        wait: int = request.config.option.wait
+        capabilities = desired_capabilities(
+            browser,
+            request.config.option.enable_video,
+            request.node.name,
+            request.config.getoption(name='ignore_certificate', default=False),
+        )
+
+        fixture = AsyncApplication(browser, device_type)
+        fixture.ui = request.config.option.ui_url
+        fixture.driver = await AsyncWebDriver.start(client, capabilities)
+        apps.append(fixture)
+
+        await fixture.driver.set_window_size(*screen_resolution(device_type))
+        await fixture.set_implicitly_wait(wait)
+        logging.info('Remote session id: %s', fixture.driver.session_id)
+
+        return fixture
+
+    yield make
+
+    failed = failed_before != request.session.testsfailed
+
+    if failed:
+        await asyncio.gather(*(attach_failure_artifacts(app) for app in apps))
+
+    for app, result in zip(apps, await asyncio.gather(*(app.destroy() for app in apps), return_exceptions=True)):
+        if isinstance(result, Exception):
+            logging.warning('Failed to quit session %s: %s', app.driver.session_id, result)
+        elif request.config.option.enable_video:
+            artifact_pipeline.defer(
+                request.node,
+                video_artifact(remote_ip, remote_port, app.driver.session_id, failed, pool_size(request.config)),
+            )
+
+    await client.close()
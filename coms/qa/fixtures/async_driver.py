@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from coms.qa.core.aio_http import AsyncHttpClient
+
+__all__ = ['AsyncWebDriver', 'AsyncWebElement', 'ELEMENT_KEY']
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+_error_handler = ErrorHandler()
+
+
+def w3c_locator(by: Union[By, str], value: str) -> Dict[str, Any]:
+    """
+    W3C only knows css, xpath and link text strategies, the rest are rewritten the same way selenium does it.
+    """
+    if by == By.ID:
+        return {'using': By.CSS_SELECTOR, 'value': f'[id="{value}"]'}
+
+    if by == By.NAME:
+        return {'using': By.CSS_SELECTOR, 'value': f'[name="{value}"]'}
+
+    if by == By.CLASS_NAME:
+        return {'using': By.CSS_SELECTOR, 'value': f'.{value}'}
+
+    if by == By.TAG_NAME:
+        return {'using': By.CSS_SELECTOR, 'value': value}
+
+    return {'using': by, 'value': value}
+
+
+class AsyncWebElement:
+    def __init__(self, driver: AsyncWebDriver, element_id: str) -> None:
+        self.driver = driver
+        self.id = element_id
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.id})'
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    async def _execute(self, method: str, command: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.driver.execute(method, f'/element/{self.id}{command}', body)
+
+    async def find_element(self, by: Union[By, str], value: str) -> AsyncWebElement:
+        return await self._execute('POST', '/element', w3c_locator(by, value))
+
+    async def find_elements(self, by: Union[By, str], value: str) -> List[AsyncWebElement]:
+        return await self._execute('POST', '/elements', w3c_locator(by, value))
+
+    async def click(self) -> None:
+        await self._execute('POST', '/click', {})
+
+    async def clear(self) -> None:
+        await self._execute('POST', '/clear', {})
+
+    async def send_keys(self, text: str) -> None:
+        await self._execute('POST', '/value', {'text': text})
+
+    async def text(self) -> str:
+        return await self._execute('GET', '/text')
+
+    async def tag_name(self) -> str:
+        return await self._execute('GET', '/name')
+
+    async def get_property(self, name: str) -> Any:
+        return await self._execute('GET', f'/property/{name}')
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return await self._execute('GET', f'/attribute/{name}')
+
+    async def value_of_css_property(self, name: str) -> str:
+        return await self._execute('GET', f'/css/{name}')
+
+    async def is_displayed(self) -> bool:
+        return await self._execute('GET', '/displayed')
+
+    async def is_enabled(self) -> bool:
+        return await self._execute('GET', '/enabled')
+
+    async def is_selected(self) -> bool:
+        return await self._execute('GET', '/selected')
+
+    async def screenshot(self) -> bytes:
+        return base64.b64decode(await self._execute('GET', '/screenshot'))
+
+
+class AsyncWebDriver:
+    """
+    W3C WebDriver session driven over a non-blocking HTTP client, one event loop can run many of them at once.
+    """
+
+    def __init__(self, client: AsyncHttpClient, session_id: str, capabilities: Dict[str, Any]) -> None:
+        self.client = client
+        self.session_id = session_id
+        self.capabilities = capabilities
+
+    @classmethod
+    async def start(cls, client: AsyncHttpClient, capabilities: Dict[str, Any]) -> AsyncWebDriver:
+        value = await cls._request(client, 'POST', '/session', {'capabilities': {'alwaysMatch': capabilities}})
+
+        return cls(client, value['sessionId'], value.get('capabilities', {}))
+
+    @staticmethod
+    async def _request(client: AsyncHttpClient, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        status, response = await client.request(method, path, body)
+
+        if status >= 400:
+            if not isinstance(response, dict):
+                message = f'HTTP {status} {response or ""}'.rstrip()
+                response = {'value': {'error': 'unknown error', 'message': message}}
+
+            # the same exception types the blocking driver raises, so callers handle both alike
+            _error_handler.check_response({'status': status, 'value': json.dumps(response)})
+
+        return response.get('value') if isinstance(response, dict) else response
+
+    async def execute(self, method: str, command: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        value = await self._request(self.client, method, f'/session/{self.session_id}{command}', body)
+
+        return self._unwrap(value)
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+
+        return value
+
+    def _unwrap(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+
+            return {key: self._unwrap(item) for key, item in value.items()}
+
+        return value
+
+    async def quit(self) -> None:
+        await self._request(self.client, 'DELETE', f'/session/{self.session_id}')
+
+    async def get(self, url: str) -> None:
+        await self.execute('POST', '/url', {'url': url})
+
+    async def current_url(self) -> str:
+        return await self.execute('GET', '/url')
+
+    async def title(self) -> str:
+        return await self.execute('GET', '/title')
+
+    async def page_source(self) -> str:
+        return await self.execute('GET', '/source')
+
+    async def refresh(self) -> None:
+        await self.execute('POST', '/refresh', {})
+
+    async def find_element(self, by: Union[By, str], value: str) -> AsyncWebElement:
+        return await self.execute('POST', '/element', w3c_locator(by, value))
+
+    async def find_elements(self, by: Union[By, str], value: str) -> List[AsyncWebElement]:
+        return await self.execute('POST', '/elements', w3c_locator(by, value))
+
+    async def execute_script(self, script: str, *args: Any) -> Any:
+        return await self.execute('POST', '/execute/sync', {'script': script, 'args': self._wrap(list(args))})
+
+    async def execute_async_script(self, script: str, *args: Any) -> Any:
+        return await self.execute('POST', '/execute/async', {'script': script, 'args': self._wrap(list(args))})
+
+    async def implicitly_wait(self, seconds: float) -> None:
+        await self.execute('POST', '/timeouts', {'implicit': int(seconds * 1000)})
+
+    async def set_script_timeout(self, seconds: float) -> None:
+        await self.execute('POST', '/timeouts', {'script': int(seconds * 1000)})
+
+    async def set_window_size(self, width: int, height: int) -> None:
+        await self.execute('POST', '/window/rect', {'width': width, 'height': height})
+
+    async def delete_all_cookies(self) -> None:
+        await self.execute('DELETE', '/cookie')
+
+    async def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(await self.execute('GET', '/screenshot'))
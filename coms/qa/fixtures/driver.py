@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 import allure
 import pytest
@@ -8,6 +8,11 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from coms.qa.fixtures.network_profile import network_profile  # noqa: F401 pylint: disable=unused-import
+from coms.qa.fixtures.replay import RECORDING_KEY, CommandRecorder, Recording, recording_path
+from coms.qa.fixtures.session_pool import SessionPool, session_pool  # noqa: F401 pylint: disable=unused-import
+from coms.qa.fixtures.tracing import TRACER_KEY, CommandTracer
+from coms.qa.fixtures.transport import HubTransport, pool_size
 from coms.qa.frontend.constants import (
     DRIVER_HEIGHT,
     DRIVER_RPS,
@@ -16,6 +21,7 @@ from coms.qa.frontend.constants import (
     MOBILE_DRIVER_WIDTH,
     VIDEO_FRAME_RATE,
 )
+from coms.qa.frontend.helpers.network_profile import NetworkProfile
 
 
 def screen_resolution(device_type: str) -> tuple[int, int]:
@@ -25,7 +31,9 @@ def screen_resolution(device_type: str) -> tuple[int, int]:
     return DRIVER_WIDTH, DRIVER_HEIGHT
 
 
-def desired_capabilities(browser: str, enable_video: bool, test_name: str, ignore_certificate: bool) -> dict[str, Any]:
+def desired_capabilities(
+    browser: str, enable_video: bool, test_name: str, ignore_certificate: bool, performance_log: bool = False
+) -> dict[str, Any]:
     capabilities = {
         'browserName': browser,
         'bstack:options': {
@@ -33,9 +41,11 @@ def desired_capabilities(browser: str, enable_video: bool, test_name: str, ignor
             'videoFrameRate': VIDEO_FRAME_RATE,
         },
         'selenoid:options': {'enableVideo': enable_video, 'name': f'coms/{test_name}'},
-        'goog:loggingPrefs': {"performance": "ALL"},
     }
 
+    if performance_log:
+        capabilities['goog:loggingPrefs'] = {"performance": "ALL"}
+
     if browser == 'chrome':
         chrome_options = Options()
         chrome_options.add_experimental_option(
@@ -52,8 +62,47 @@ def desired_capabilities(browser: str, enable_video: bool, test_name: str, ignor
     return capabilities
 
 
+def reset_driver(wd: WebDriver, device_type: str, wait: int) -> None:
+    wd.set_window_size(*screen_resolution(device_type))
+    wd.implicitly_wait(wait)
+
+
+# pylint: disable=redefined-outer-name
 @pytest.fixture
-def make_driver(request: FixtureRequest) -> Callable[..., WebDriver]:
+def make_driver(
+    request: FixtureRequest, session_pool: SessionPool, network_profile: Optional[NetworkProfile]
+) -> Callable[..., WebDriver]:
+    round_trips_marker = request.node.get_closest_marker('max_round_trips')
+    tracer: Optional[CommandTracer] = None
+
+    if request.config.getoption(name='trace_commands', default=False) or round_trips_marker is not None:
+        tracer = CommandTracer()
+        request.node.stash[TRACER_KEY] = tracer
+
+        def finish() -> None:
+            tracer.detach()
+            tracer.report(request.config.getoption(name='trace_dir', default=None), request.node.name)
+
+        request.addfinalizer(finish)
+
+    record_dir: Optional[str] = request.config.getoption(name='record_commands', default=None)
+    replay_dir: Optional[str] = request.config.getoption(name='replay_commands', default=None)
+    recorder: Optional[CommandRecorder] = None
+    recording: Optional[Recording] = None
+
+    if replay_dir:
+        recording = Recording.load(recording_path(replay_dir, request.node.name))
+        request.node.stash[RECORDING_KEY] = recording
+        request.addfinalizer(recording.report)
+    elif record_dir:
+        recorder = CommandRecorder()
+
+        def finish_recording() -> None:
+            recorder.detach()
+            recorder.save(recording_path(record_dir, request.node.name), request.node.name)
+
+        request.addfinalizer(finish_recording)
+
     def make(browser: str, device_type: str) -> WebDriver:
         allure.dynamic.label('browser', browser)
         allure.dynamic.label('device_type', device_type)
@@ -65,16 +114,45 @@ def make_driver(request: FixtureRequest) -> Callable[..., WebDriver]:
         wait: int = request.config.option.wait
         enable_video: bool = request.config.option.enable_video
         ignore_certificate: bool = request.config.getoption(name='ignore_certificate', default=False)
+        use_pool: bool = (
+            request.config.getoption(name='session_pool', default=False)
+            and not enable_video
+            and not (record_dir or replay_dir)
+        )
+        # blocked requests are only reported from the performance log
+        performance_log = request.node.get_closest_marker('network_metrics') is not None or network_profile is not None
         test_name = request.node.name
 
-        capabilities = desired_capabilities(browser, enable_video, test_name, ignore_certificate)
+        capabilities = desired_capabilities(browser, enable_video, test_name, ignore_certificate, performance_log)
 
         command_executor = f'{remote_protocol}://{remote_ip}:{remote_port}/wd/hub'
-        wd = webdriver.Remote(command_executor=command_executor, desired_capabilities=capabilities)
+        transport = HubTransport.for_hub(command_executor, pool_size(request.config))
+
+        def create() -> WebDriver:
+            if recording is not None:
+                executor: Any = recording.connect(browser, device_type)
+            else:
+                executor = transport.command_executor(command_executor, capabilities)
+
+            if recorder is not None:
+                executor = recorder.attach(executor, browser, device_type)
+
+            wd = webdriver.Remote(command_executor=executor, desired_capabilities=capabilities)
+            reset_driver(wd, device_type, wait)
+
+            return wd
+
+        if use_pool:
+            key = SessionPool.make_key(browser, device_type, capabilities)
+            wd = session_pool.acquire(key, create)
+        else:
+            wd = create()
+
+        if tracer is not None:
+            tracer.attach(wd)
+
         session_url = f'{remote_protocol}://{remote_ui}:{remote_ui_port}/#/sessions/{wd.session_id}'
         logging.info('Remote session id: %s', session_url)
-        wd.set_window_size(*screen_resolution(device_type))
-        wd.implicitly_wait(wait)
 
         return wd
 
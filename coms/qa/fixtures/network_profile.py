@@ -0,0 +1,27 @@
+from typing import Optional
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+
+from coms.qa.frontend.helpers.network_profile import NetworkProfile
+
+__all__ = ['network_profile']
+
+
+@pytest.fixture
+def network_profile(request: FixtureRequest) -> Optional[NetworkProfile]:
+    """
+    The profile make_app applies right after the session starts: the network_profile marker,
+    else the comma separated presets of the network_profile option. Override the fixture for a custom profile.
+    """
+    marker = request.node.get_closest_marker('network_profile')
+
+    if marker is not None:
+        return NetworkProfile.preset(*marker.args, **marker.kwargs)
+
+    presets: Optional[str] = request.config.getoption(name='network_profile', default=None)
+
+    if presets:
+        return NetworkProfile.preset(*(name.strip() for name in presets.split(',') if name.strip()))
+
+    return None
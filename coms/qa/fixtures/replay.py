@@ -0,0 +1,371 @@
+import copy
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import allure
+import pytest
+
+from coms.qa.fixtures.tracing import page_object_caller
+from coms.qa.fixtures.transport import ConnectionWrapper
+
+__all__ = [
+    'RECORDING_SUFFIX',
+    'RECORDING_KEY',
+    'CommandRecorder',
+    'Divergence',
+    'Recording',
+    'RecordingConnection',
+    'ReplayConnection',
+    'ReplayMismatch',
+    'recording_path',
+]
+
+logger = logging.getLogger(__name__)
+
+RECORDING_SUFFIX = '.wdrec.gz'
+RECORDING_VERSION = 1
+REPLAY_URL = 'http://replay.invalid/wd/hub'
+MAX_LOCATOR_REPR = 60
+
+# (command, params, response); commands sent past the executor, e.g. CDP, are named '<METHOD> <path>'
+Entry = Tuple[str, Dict[str, Any], Any]
+
+RECORDING_KEY = pytest.StashKey['Recording']()
+
+
+def recording_path(directory: str, name: str) -> str:
+    return os.path.join(directory, re.sub(r'[^\w.-]+', '_', name) + RECORDING_SUFFIX)
+
+
+def _params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: v for k, v in (params or {}).items() if k != 'sessionId'}
+
+
+def _locator(params: Dict[str, Any]) -> Optional[str]:
+    if 'using' in params:
+        return f"{params['using']}={params['value']}"
+
+    if 'script' in params:
+        return params['script']
+
+    if 'cmd' in params:
+        return params['cmd']
+
+    return params.get('id')
+
+
+class RecordingConnection(ConnectionWrapper):
+    """
+    Command executor that records what it sends and gets while the recorder is attached.
+    Calls the connection makes itself stay inside it, so commands sent past the executor, e.g. CDP, are not
+    recorded twice.
+    """
+
+    def __init__(self, connection: Any, recorder: 'CommandRecorder', commands: List[Entry]) -> None:
+        super().__init__(connection)
+        self.recorder = recorder
+        self.commands = commands
+        self.recording = True
+
+    def execute(self, command: str, params: Dict[str, Any]) -> Any:
+        response = self.connection.execute(command, params)
+
+        if self.recording:
+            # WebDriver.execute unwraps elements in place, nested dicts included, keep the wire form
+            self.recorder.record(self.commands, (command, _params(params), copy.deepcopy(response)))
+
+        return response
+
+    def _request(self, method: str, url: str, body: Optional[str] = None) -> Any:
+        response = super()._request(method, url, body)
+
+        if self.recording:
+            command = f'{method} {url[len(self.connection._url):]}'  # pylint: disable=protected-access
+            self.recorder.record(self.commands, (command, json.loads(body) if body else {}, copy.deepcopy(response)))
+
+        return response
+
+
+class CommandRecorder:
+    """
+    Records every command the attached drivers send and the response they get, one stream per driver.
+    Responses are stored as the hub sent them, errors included, so a replay raises the same exceptions.
+    """
+
+    def __init__(self) -> None:
+        self.sessions: List[Dict[str, Any]] = []
+        self._connections: List[RecordingConnection] = []
+        self._lock = threading.Lock()
+
+    def attach(self, executor: Any, browser: str, device_type: str) -> RecordingConnection:
+        """
+        Wraps the executor before the session starts, the replay needs the new session command.
+        """
+        commands: List[Entry] = []
+        connection = RecordingConnection(executor, self, commands)
+        self._connections.append(connection)
+        self.sessions.append({'browser': browser, 'device_type': device_type, 'commands': commands})
+
+        return connection
+
+    def record(self, commands: List[Entry], entry: Entry) -> None:
+        with self._lock:
+            commands.append(entry)
+
+    def detach(self) -> None:
+        for connection in self._connections:
+            connection.recording = False
+
+        self._connections.clear()
+
+    def save(self, path: str, name: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        with self._lock:
+            data = {'version': RECORDING_VERSION, 'test': name, 'sessions': self.sessions}
+
+            # a failed dump must not leave a truncated recording for the replay to load
+            try:
+                with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+            except BaseException:
+                os.remove(path + '.tmp')
+                raise
+
+            os.replace(path + '.tmp', path)
+
+
+class ReplayMismatch(AssertionError):
+    pass
+
+
+class Divergence:
+    """
+    @kind - approximate: served a response recorded for the same command and locator with other params
+            repeated: the recorded responses of the command ran out, the last one was served again
+            reordered: served a response recorded before the previous one
+            unexpected: nothing was recorded for the command and locator
+            unused: recorded, never requested
+    """
+
+    __slots__ = ('kind', 'session', 'index', 'command', 'locator', 'caller')
+
+    def __init__(
+        self, kind: str, session: int, index: Optional[int], command: str, locator: Optional[str], caller: Optional[str]
+    ) -> None:
+        self.kind = kind
+        self.session = session
+        self.index = index
+        self.command = command
+        self.locator = locator
+        self.caller = caller
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self) -> str:
+        # scripts are locators too, keep the message readable
+        locator = ' '.join((self.locator or '').split())
+        locator = locator if len(locator) <= MAX_LOCATOR_REPR else locator[: MAX_LOCATOR_REPR - 3] + '...'
+
+        return f'{self.kind} {self.command} {locator} ({self.caller or "-"})'.replace('  ', ' ')
+
+
+class ReplayConnection:
+    """
+    Command executor that serves a recorded session: commands are matched on command and params first,
+    then on command and locator alone, in recorded order. Nothing leaves the process.
+    """
+
+    def __init__(self, commands: List[Entry], session: int = 0) -> None:
+        self.session = session
+        self.divergences: List[Divergence] = []
+        self.served = 0
+        self._url = REPLAY_URL
+        self._commands: List[Entry] = [(command, params, response) for command, params, response in commands]
+        self._exact: Dict[str, Deque[int]] = defaultdict(deque)
+        self._loose: Dict[Tuple[str, Optional[str]], Deque[int]] = defaultdict(deque)
+        self._last: Dict[Tuple[str, Optional[str]], int] = {}
+        self._used: List[bool] = [False] * len(self._commands)
+        self._position = -1
+        self._lock = threading.Lock()
+
+        for i, (command, params, _) in enumerate(self._commands):
+            self._exact[self._key(command, params)].append(i)
+            self._loose[(command, _locator(params))].append(i)
+
+    @staticmethod
+    def _key(command: str, params: Dict[str, Any]) -> str:
+        return command + json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+    def _take(self, queue: Deque[int]) -> Optional[int]:
+        while queue:
+            index = queue.popleft()
+
+            if not self._used[index]:
+                return index
+
+        return None
+
+    def _match(self, command: str, params: Dict[str, Any]) -> Entry:
+        locator = _locator(params)
+        index = self._take(self._exact[self._key(command, params)])
+        kind: Optional[str] = None
+
+        if index is None:
+            index = self._take(self._loose[(command, locator)])
+            kind = 'approximate'
+
+        if index is None and (command, locator) in self._last:
+            index = self._last[(command, locator)]
+            kind = 'repeated'
+
+        if index is None:
+            self._diverge('unexpected', None, command, locator)
+
+            raise ReplayMismatch(f'Nothing recorded for {command} {locator or ""}'.rstrip())
+
+        if kind is None and index < self._position:
+            kind = 'reordered'
+
+        if kind is not None:
+            self._diverge(kind, index, command, locator)
+
+        self._used[index] = True
+        self._last[(command, locator)] = index
+        self._position = max(self._position, index)
+        self.served += 1
+
+        return self._commands[index]
+
+    def _diverge(self, kind: str, index: Optional[int], command: str, locator: Optional[str]) -> None:
+        self.divergences.append(Divergence(kind, self.session, index, command, locator, page_object_caller()))
+
+    def execute(self, command: str, params: Optional[Dict[str, Any]]) -> Any:
+        with self._lock:
+            response = self._match(command, _params(params))[2]
+
+        # a repeated command serves the same entry again, selenium must not unwrap elements in the recording
+        return copy.deepcopy(response)
+
+    def _request(self, method: str, url: str, body: Optional[str] = None) -> Any:
+        with self._lock:
+            response = self._match(f'{method} {url[len(self._url):]}', json.loads(body) if body else {})[2]
+
+        return copy.deepcopy(response)
+
+    def unused(self, settled: bool = False) -> List[Divergence]:
+        """
+        @settled - only the commands recorded before the last one served, the rest may still be requested
+        """
+        end = max(self._position, 0) if settled else len(self._commands)
+
+        return [
+            Divergence('unused', self.session, i, command, _locator(params), None)
+            for i, (command, params, _) in enumerate(self._commands[:end])
+            if not self._used[i]
+        ]
+
+    def close(self) -> None:
+        pass
+
+
+class Recording:
+    def __init__(self, name: str, sessions: List[Dict[str, Any]]) -> None:
+        self.name = name
+        self.sessions = sessions
+        self.connections: List[ReplayConnection] = []
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != RECORDING_VERSION:
+            raise ValueError(f'{path}: unsupported recording version {data.get("version")}')
+
+        return cls(data['test'], data['sessions'])
+
+    def connect(self, browser: str, device_type: str) -> ReplayConnection:
+        """
+        The next recorded session, sessions are replayed in the order the test opened them.
+        """
+        index = len(self.connections)
+
+        if index >= len(self.sessions):
+            raise ReplayMismatch(f'{self.name}: only {len(self.sessions)} sessions recorded, {browser} opened another')
+
+        session = self.sessions[index]
+
+        if (session['browser'], session['device_type']) != (browser, device_type):
+            raise ReplayMismatch(
+                f'{self.name}: session {index} was recorded for {session["browser"]}/{session["device_type"]}, '
+                f'replayed for {browser}/{device_type}'
+            )
+
+        connection = ReplayConnection(session['commands'], index)
+        self.connections.append(connection)
+
+        return connection
+
+    def divergences(self, settled: bool = False) -> List[Divergence]:
+        ret: List[Divergence] = []
+
+        for connection in self.connections:
+            ret.extend(connection.divergences)
+            ret.extend(connection.unused(settled))
+
+        return ret
+
+    def mismatch(self, settled: bool = False) -> Optional[str]:
+        """
+        What diverges from the recording, None when nothing does; repeated commands are not counted.
+        @settled - leave out recorded commands the replay has not reached yet, e.g. those of the teardown
+        """
+        significant = [divergence for divergence in self.divergences(settled) if divergence.kind != 'repeated']
+
+        if not significant:
+            return None
+
+        return f'{self.name}: {len(significant)} commands diverge from the recording: ' + ', '.join(
+            repr(divergence) for divergence in significant[:10]
+        )
+
+    def report(self) -> List[Divergence]:
+        """
+        Attaches the divergences to allure and logs a warning about them, strict replays fail the test body
+        through the pytest_runtest_call hook of the application plugin instead.
+        """
+        divergences = self.divergences()
+        counts: Dict[str, int] = defaultdict(int)
+
+        for divergence in divergences:
+            counts[divergence.kind] += 1
+
+        if not divergences:
+            return divergences
+
+        allure.attach(
+            json.dumps(
+                {
+                    'served': sum(connection.served for connection in self.connections),
+                    'divergences': dict(counts),
+                    'details': [divergence.as_dict() for divergence in divergences],
+                },
+                indent=2,
+            ),
+            name='Replay divergences',
+            attachment_type=allure.attachment_type.JSON,
+        )
+        message = self.mismatch()
+
+        if message is not None:
+            logger.warning(message)
+
+        return divergences
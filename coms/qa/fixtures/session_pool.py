@@ -0,0 +1,222 @@
+import copy
+import json
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+__all__ = ['SessionPool', 'session_pool']
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str]
+
+RESET_STORAGE_SCRIPT = (
+    'try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {} return window.location.origin;'
+)
+
+
+class PooledSession:
+    __slots__ = ('driver', 'key', 'uses')
+
+    def __init__(self, driver: WebDriver, key: PoolKey) -> None:
+        self.driver = driver
+        self.key = key
+        self.uses = 0
+
+
+class SessionPool:
+    """
+    Keeps warm webdriver sessions per (browser, device_type, capabilities) key.
+    Sessions are reset between tests and recycled after max_uses or a failure.
+    The reset clears the storage of the origin the test ended on and the cookies: of every domain in chrome,
+    of that origin elsewhere. Storage of other origins the test visited carries over to the next test.
+    """
+
+    def __init__(self, size: int = 1, max_uses: int = 20, workers: int = 2) -> None:
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: Dict[PoolKey, 'queue.Queue[PooledSession]'] = {}
+        self._factories: Dict[PoolKey, Callable[[], WebDriver]] = {}
+        self._filling: Dict[PoolKey, int] = {}
+        self._leased: Dict[str, PooledSession] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='session-pool')
+        self._closed = False
+
+    @staticmethod
+    def make_key(browser: str, device_type: str, capabilities: Dict[str, Any]) -> PoolKey:
+        caps = copy.deepcopy(capabilities)
+        caps.get('selenoid:options', {}).pop('name', None)
+
+        return browser, device_type, json.dumps(caps, sort_keys=True, default=str)
+
+    def owns(self, driver: WebDriver) -> bool:
+        with self._lock:
+            return driver.session_id is not None and driver.session_id in self._leased
+
+    def acquire(self, key: PoolKey, create: Callable[[], WebDriver]) -> WebDriver:
+        with self._lock:
+            self._factories[key] = create
+            idle = self._idle.setdefault(key, queue.Queue())
+
+        try:
+            session = idle.get_nowait()
+        except queue.Empty:
+            session = PooledSession(create(), key)
+
+        session.uses += 1
+
+        with self._lock:
+            self._leased[_session_id(session.driver)] = session
+
+        self._refill(key)
+
+        return session.driver
+
+    def release(self, driver: WebDriver, failed: bool, reset: Callable[[WebDriver], None]) -> None:
+        if driver.session_id is None:
+            return
+
+        with self._lock:
+            session = self._leased.pop(driver.session_id, None)
+
+        if session is None:
+            return
+
+        if failed or session.uses >= self.max_uses or self._closed:
+            self._discard(session)
+            self._refill(session.key)
+
+            return
+
+        try:
+            origin = driver.execute_script(RESET_STORAGE_SCRIPT)  # type: ignore[no-untyped-call]
+
+            if driver.capabilities.get('browserName') == 'chrome':
+                _send_cdp(driver, 'Network.clearBrowserCookies', {})
+
+                if origin and origin != 'null':
+                    _send_cdp(driver, 'Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            else:
+                driver.delete_all_cookies()
+
+            driver.get('about:blank')
+            reset(driver)
+        except WebDriverException as e:
+            logger.warning('Session %s reset failed: %s', driver.session_id, e)
+            self._discard(session)
+            self._refill(session.key)
+
+            return
+
+        self._idle[session.key].put(session)
+
+    def close(self) -> None:
+        """
+        Quits the idle sessions and the ones still leased, e.g. taken by make_driver without make_app.
+        Pending fills are cancelled, a session still being created is quit by its fill once it is up.
+        """
+        with self._lock:
+            self._closed = True
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+        with self._lock:
+            leased = list(self._leased.values())
+            self._leased.clear()
+
+        for session in [*self._drain(), *leased]:
+            self._quit(session.driver)
+
+    def _drain(self) -> Iterator[PooledSession]:
+        for idle in self._idle.values():
+            while True:
+                try:
+                    yield idle.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _refill(self, key: PoolKey) -> None:
+        with self._lock:
+            if self._closed:
+                return
+
+            missing = self.size - self._idle[key].qsize() - self._filling.get(key, 0)
+
+            if missing <= 0:
+                return
+
+            self._filling[key] = self._filling.get(key, 0) + missing
+
+            for _ in range(missing):
+                self._executor.submit(self._fill, key)
+
+    def _fill(self, key: PoolKey) -> None:
+        try:
+            driver = self._factories[key]()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning('Session pool fill failed: %s', e)
+            return
+        finally:
+            with self._lock:
+                self._filling[key] -= 1
+
+        with self._lock:
+            closed = self._closed
+
+            if not closed:
+                self._idle[key].put(PooledSession(driver, key))
+
+        if closed:
+            self._quit(driver)
+
+    def _discard(self, session: PooledSession) -> None:
+        with self._lock:
+            if not self._closed:
+                self._executor.submit(self._quit, session.driver)
+
+                return
+
+        self._quit(session.driver)
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.warning('Session %s quit failed: %s', driver.session_id, e)
+
+
+def _session_id(driver: WebDriver) -> str:
+    if driver.session_id is None:
+        raise WebDriverException('The session has already quit')
+
+    return driver.session_id
+
+
+def _send_cdp(driver: WebDriver, command: str, params: Dict[str, Any]) -> None:
+    # pylint: disable=protected-access
+    url = f'{driver.command_executor._url}/session/{driver.session_id}/chromium/send_command_and_get_result'
+    response = driver.command_executor._request('POST', url, json.dumps({'cmd': command, 'params': params}))
+
+    if response.get('status'):
+        raise WebDriverException(f'{command} failed: {response.get("value")}')
+
+
+@pytest.fixture(scope='session')
+def session_pool(request: FixtureRequest) -> Iterator[SessionPool]:
+    pool = SessionPool(
+        size=request.config.getoption(name='session_pool_size', default=1),
+        max_uses=request.config.getoption(name='session_max_uses', default=20),
+    )
+
+    yield pool
+
+    pool.close()
@@ -0,0 +1,662 @@
+import base64
+import html
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple, Type
+
+import pytest
+
+from coms.qa.fixtures.application import ELEMENTS_EXIST_SCRIPT, SETTLE_SCRIPT
+from coms.qa.frontend.helpers.custom_wait_conditions import ANIMATION_COMPLETE_SCRIPT
+from coms.qa.frontend.helpers.dom_snapshot import DOM_SNAPSHOT_SCRIPT, FLAGS_ATTRIBUTE, VALUE_ATTRIBUTE
+from coms.qa.frontend.pages.component.async_component import TEXTS_SCRIPT as ASYNC_TEXTS_SCRIPT
+from coms.qa.frontend.pages.component.component_list import ATTRIBUTES_SCRIPT, TEXTS_SCRIPT, VALUES_SCRIPT
+from coms.qa.frontend.pages.component.snapshot import SNAPSHOT_SCRIPT
+
+__all__ = ['StubElement', 'StubHub', 'stub_hub']
+
+logger = logging.getLogger(__name__)
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# 1x1 transparent png
+PIXEL_PNG = base64.b64encode(
+    bytes.fromhex(
+        '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+        '1f15c4890000000d49444154789c6360000002000005000157a27f0000000049454e44ae426082'
+    )
+).decode()
+
+COMPOUND = re.compile(r'(?P<tag>[\w-]+|\*)?(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)$')
+PART = re.compile(
+    r'#(?P<id>[\w-]+)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$]?=)\s*["\']?(?P<val>[^"\'\]]*)["\']?)?\]'
+)
+
+# the xpath forms compile_locator and join_locators produce: descendant:: steps, (X)[n] and (X)[n]/Y
+PINNED_XPATH = re.compile(r'\((?P<inner>.+)\)\[(?P<position>\d+)\](?:/(?P<rest>.+))?$')
+XPATH_STEP = re.compile(r'descendant::(?P<tag>[\w-]+|\*)(?P<predicates>(?:\[[^\]]*\])*)$')
+XPATH_PREDICATE = re.compile(
+    r'\[@(?P<attr>[\w-]+)=["\'](?P<val>[^"\']*)["\']\]'
+    r'|\[contains\(@(?P<cattr>[\w-]+), ["\'](?P<cval>[^"\']*)["\']\)\]'
+    r'|\[contains\(concat\(\' \', normalize-space\(@class\), \' \'\), ["\'] (?P<cls>[\w-]+) ["\']\)\]'
+)
+
+INLINE_TAGS = {'a', 'b', 'button', 'code', 'em', 'i', 'img', 'input', 'label', 'select', 'small', 'span', 'strong'}
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link'}
+
+ScriptHandler = Callable[[List[Any], 'StubSession'], Any]
+
+
+class StubError(Exception):
+    def __init__(self, status: int, error: str, message: str = '') -> None:
+        super().__init__(message or error)
+        self.status = status
+        self.error = error
+
+
+class StubElement:
+    """
+    Element of the fake DOM, children are appended with append().
+    """
+
+    def __init__(
+        self,
+        tag: str = 'div',
+        text: str = '',
+        attributes: Optional[Dict[str, str]] = None,
+        displayed: bool = True,
+        enabled: bool = True,
+        value: Optional[str] = None,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.tag = tag
+        self.text = text
+        self.attributes = dict(attributes or {})
+        self.displayed = displayed
+        self.enabled = enabled
+        self.value = value
+        self.parent: Optional['StubElement'] = None
+        self.children: List['StubElement'] = []
+
+    def __repr__(self) -> str:
+        return f'<{self.tag} {self.attributes}>'
+
+    def append(self, child: 'StubElement') -> 'StubElement':
+        child.parent = self
+        self.children.append(child)
+
+        return child
+
+    def iter(self) -> Iterator['StubElement']:
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    def attribute(self, name: str) -> Optional[str]:
+        if name == 'value' and self.value is not None:
+            return self.value
+
+        return self.attributes.get(name)
+
+    def matches(self, compound: str) -> bool:
+        match = COMPOUND.match(compound)
+
+        if match is None:
+            raise StubError(400, 'invalid selector', f'Unsupported selector {compound}')
+
+        if match['tag'] not in (None, '*', self.tag):
+            return False
+
+        for part in PART.finditer(match['rest']):
+            if part['id'] is not None and self.attributes.get('id') != part['id']:
+                return False
+
+            if part['cls'] is not None and part['cls'] not in self.attributes.get('class', '').split():
+                return False
+
+            if part['attr'] is not None and not self._matches_attribute(part['attr'], part['op'], part['val']):
+                return False
+
+        return True
+
+    def _matches_attribute(self, name: str, op: Optional[str], expected: Optional[str]) -> bool:
+        value = self.attribute(name)
+
+        if value is None:
+            return False
+
+        if op is None:
+            return True
+
+        expected = expected or ''
+
+        return {
+            '=': value == expected,
+            '*=': expected in value,
+            '^=': value.startswith(expected),
+            '$=': value.endswith(expected),
+        }[op]
+
+    def select(self, selector: str) -> List['StubElement']:
+        """
+        Compound selectors joined by descendant combinators, comma separated groups.
+        """
+        found: List['StubElement'] = []
+
+        for group in selector.split(','):
+            chain = group.split()
+
+            for element in self.iter():
+                if element not in found and element._matches_chain(chain):
+                    found.append(element)
+
+        return found
+
+    def _matches_chain(self, chain: List[str]) -> bool:
+        if not self.matches(chain[-1]):
+            return False
+
+        ancestor = self.parent
+
+        for compound in reversed(chain[:-1]):
+            while ancestor is not None and not ancestor.matches(compound):
+                ancestor = ancestor.parent
+
+            if ancestor is None:
+                return False
+
+            ancestor = ancestor.parent
+
+        return True
+
+    def locate(self, using: str, value: str) -> List['StubElement']:
+        if using == 'css selector':
+            return self.select(value)
+
+        if using in ('link text', 'partial link text'):
+            return [
+                element
+                for element in self.iter()
+                if element.tag == 'a' and (element.text == value if using == 'link text' else value in element.text)
+            ]
+
+        if using == 'tag name':
+            return [element for element in self.iter() if element.tag == value]
+
+        if using in ('id', 'name'):
+            return [element for element in self.iter() if element.attributes.get(using) == value]
+
+        if using == 'class name':
+            return self.select(f'.{value}')
+
+        if using == 'xpath':
+            return self.xpath(value)
+
+        raise StubError(400, 'invalid selector', f'Stub hub does not support {using}')
+
+    def xpath(self, expression: str) -> List['StubElement']:
+        pinned = PINNED_XPATH.match(expression)
+
+        if pinned is not None:
+            found = self.xpath(pinned['inner'])
+            position = int(pinned['position'])
+
+            if len(found) < position:
+                return []
+
+            anchor = found[position - 1]
+
+            return anchor.xpath(pinned['rest']) if pinned['rest'] else [anchor]
+
+        step = XPATH_STEP.match(expression)
+        predicates = [] if step is None else re.findall(r'\[[^\]]*\]', step['predicates'])
+        css = []
+
+        for predicate in predicates:
+            match = XPATH_PREDICATE.fullmatch(predicate)
+
+            if match is None:
+                break
+
+            if match['attr'] is not None:
+                css.append(f'[{match["attr"]}="{match["val"]}"]')
+            elif match['cattr'] is not None:
+                css.append(f'[{match["cattr"]}*="{match["cval"]}"]')
+            else:
+                css.append(f'.{match["cls"]}')
+
+        if step is None or len(css) != len(predicates):
+            raise StubError(400, 'invalid selector', f'Stub hub does not support xpath {expression}')
+
+        return self.select(step['tag'] + ''.join(css))
+
+    def outer_html(self) -> str:
+        """
+        The element as DOM_SNAPSHOT_SCRIPT copies it, annotated with its state.
+        """
+        attributes = dict(self.attributes)
+        flags = (
+            ('' if self.displayed else 'h')
+            + ('' if self.enabled else 'd')
+            + ('c' if 'selected' in self.attributes or 'checked' in self.attributes else '')
+            + ('' if self.tag in INLINE_TAGS else 'b')
+        )
+
+        if flags:
+            attributes[FLAGS_ATTRIBUTE] = flags
+
+        if self.value is not None:
+            attributes[VALUE_ATTRIBUTE] = self.value
+
+        attrs = ''.join(f' {name}="{html.escape(value)}"' for name, value in attributes.items())
+
+        if self.tag in VOID_TAGS:
+            return f'<{self.tag}{attrs}>'
+
+        inner = html.escape(self.text) + ''.join(child.outer_html() for child in self.children)
+
+        return f'<{self.tag}{attrs}>{inner}</{self.tag}>'
+
+    def snapshot(self, attributes: List[str]) -> Dict[str, Any]:
+        return {
+            'displayed': self.displayed,
+            'enabled': self.enabled,
+            'value': self.value,
+            'text': self.text if self.displayed else '',
+            'rect': {'x': 0, 'y': 0, 'width': 100, 'height': 20},
+            'attributes': {name: self.attribute(name) for name in attributes},
+            'styles': {},
+        }
+
+
+class StubSession:
+    def __init__(self, hub: 'StubHub', capabilities: Dict[str, Any]) -> None:
+        self.id = uuid.uuid4().hex
+        self.hub = hub
+        self.capabilities = capabilities
+        self.history: List[str] = ['about:blank']
+        self.position = 0
+        self.timeouts: Dict[str, int] = {'implicit': 0, 'script': 30000, 'pageLoad': 300000}
+        self.rect: Dict[str, int] = {'x': 0, 'y': 0, 'width': 1920, 'height': 1080}
+
+    @property
+    def url(self) -> str:
+        return self.history[self.position]
+
+    def navigate(self, url: str) -> None:
+        position = self.position + 1
+        del self.history[position:]
+        self.history.append(url)
+        self.position = position
+
+    def go(self, step: int) -> None:
+        self.position = min(max(self.position + step, 0), len(self.history) - 1)
+
+    def element(self, element_id: str) -> StubElement:
+        element = self.hub.element(element_id)
+
+        if element is None:
+            raise StubError(404, 'stale element reference', element_id)
+
+        return element
+
+
+class StubHub:
+    """
+    In-process fake of a Selenoid hub: the W3C WebDriver endpoints the framework uses,
+    chromium send_command and /video/<session>.mp4, served from a small fake DOM.
+    Latency is added per command, `commands` counts the round trips.
+    Scripts can not run here, known framework scripts have python handlers and
+    register_script() adds more, matched by a fragment of the script source.
+    """
+
+    def __init__(
+        self,
+        dom: Optional[StubElement] = None,
+        latency: float = 0,
+        command_latency: Optional[Dict[str, float]] = None,
+        video_size: int = 256 * 1024,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ) -> None:
+        self.dom = dom or StubElement('html')
+        self.latency = latency
+        self.command_latency = dict(command_latency or {})
+        self.video_size = video_size
+        self.sessions: Dict[str, StubSession] = {}
+        self.videos: Dict[str, int] = {}
+        self.commands: Counter = Counter()
+        self._index: Dict[str, StubElement] = {}
+        self._scripts: List[Tuple[str, ScriptHandler]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._routes = self._build_routes()
+        self._register_default_scripts()
+
+    @property
+    def host(self) -> str:
+        return str(self._server.server_address[0])
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1])
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}/wd/hub'
+
+    def element(self, element_id: str) -> Optional[StubElement]:
+        element = self._index.get(element_id)
+
+        if element is None:
+            # the dom may have been changed by the test since the last lookup
+            self._index = {element.id: element for element in self.dom.iter()}
+            element = self._index.get(element_id)
+
+        return element
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.commands.values())
+
+    def start(self) -> 'StubHub':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-hub', daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubHub':
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.commands.clear()
+
+    def register_script(self, fragment: str, handler: ScriptHandler) -> None:
+        """
+        Later registrations win, so tests can override the default handlers.
+        """
+        self._scripts.insert(0, (fragment, handler))
+
+    # pylint: disable=too-many-statements
+    def _build_routes(self) -> List[Tuple[str, Pattern[str], str, Callable[..., Any]]]:
+        def session(sid: str) -> StubSession:
+            if sid not in self.sessions:
+                raise StubError(404, 'invalid session id', sid)
+
+            return self.sessions[sid]
+
+        def new_session(body: Dict[str, Any]) -> Dict[str, Any]:
+            capabilities = body.get('capabilities', {}).get('alwaysMatch', {})
+            created = StubSession(self, capabilities)
+            self.sessions[created.id] = created
+
+            return {'sessionId': created.id, 'capabilities': {**capabilities, 'browserVersion': 'stub'}}
+
+        def delete_session(body: Dict[str, Any], sid: str) -> None:
+            self.sessions.pop(sid, None)
+            self.videos[sid] = self.video_size
+
+        def find(body: Dict[str, Any], sid: str, eid: Optional[str] = None, many: bool = False) -> Any:
+            current = session(sid)
+            root = current.element(eid) if eid else self.dom
+            found = root.locate(body['using'], body['value'])
+
+            if many:
+                return [{ELEMENT_KEY: element.id} for element in found]
+
+            if not found:
+                raise StubError(404, 'no such element', f'{body["using"]}={body["value"]}')
+
+            return {ELEMENT_KEY: found[0].id}
+
+        def element_state(getter: Callable[..., Any]) -> Callable[..., Any]:
+            return lambda body, sid, eid, *args: getter(session(sid).element(eid), *args)
+
+        def set_url(body: Dict[str, Any], sid: str) -> None:
+            session(sid).navigate(body['url'])
+
+        def timeouts(body: Dict[str, Any], sid: str) -> None:
+            session(sid).timeouts.update(body)
+
+        def set_rect(body: Dict[str, Any], sid: str) -> Dict[str, int]:
+            rect = session(sid).rect
+            rect.update({k: v for k, v in body.items() if v is not None})
+
+            return rect
+
+        def send_keys(body: Dict[str, Any], sid: str, eid: str) -> None:
+            element = session(sid).element(eid)
+            element.value = (element.value or '') + body.get('text', '')
+
+        def clear(body: Dict[str, Any], sid: str, eid: str) -> None:
+            session(sid).element(eid).value = ''
+
+        def execute(body: Dict[str, Any], sid: str) -> Any:
+            return self._execute(body['script'], self._unwrap(body.get('args', [])), session(sid))
+
+        def cdp(body: Dict[str, Any], sid: str) -> Any:
+            session(sid)
+
+            return {'data': PIXEL_PNG} if body.get('cmd') == 'Page.captureScreenshot' else {}
+
+        s = r'/wd/hub/session/(?P<sid>\w+)'
+        e = s + r'/element/(?P<eid>\w+)'
+        ok: Callable[..., None] = lambda *args: None  # noqa: E731
+
+        routes: List[Tuple[str, str, str, Callable[..., Any]]] = [
+            ('POST', r'/wd/hub/session', 'newSession', new_session),
+            ('DELETE', s, 'quit', delete_session),
+            ('GET', s + '/window', 'getCurrentWindowHandle', lambda body, sid: session(sid) and 'main'),
+            ('GET', s + '/window/handles', 'getWindowHandles', lambda body, sid: session(sid) and ['main']),
+            ('GET', s + '/window/rect', 'getWindowRect', lambda body, sid: session(sid).rect),
+            ('POST', s + '/window/rect', 'setWindowRect', set_rect),
+            ('POST', s + '/url', 'get', set_url),
+            ('GET', s + '/url', 'getCurrentUrl', lambda body, sid: session(sid).url),
+            ('GET', s + '/title', 'getTitle', lambda body, sid: session(sid) and 'stub'),
+            ('GET', s + '/source', 'getPageSource', lambda body, sid: session(sid) and '<html></html>'),
+            ('POST', s + '/refresh', 'refresh', ok),
+            ('POST', s + '/back', 'goBack', lambda body, sid: session(sid).go(-1)),
+            ('POST', s + '/forward', 'goForward', lambda body, sid: session(sid).go(1)),
+            ('POST', s + '/timeouts', 'setTimeouts', timeouts),
+            ('GET', s + '/timeouts', 'getTimeouts', lambda body, sid: session(sid).timeouts),
+            ('DELETE', s + '/cookie', 'deleteAllCookies', ok),
+            ('GET', s + '/cookie', 'getAllCookies', lambda body, sid: []),
+            ('POST', s + '/actions', 'actions', ok),
+            ('DELETE', s + '/actions', 'releaseActions', ok),
+            ('GET', s + '/screenshot', 'screenshot', lambda body, sid: PIXEL_PNG),
+            ('POST', s + '/se/log', 'getLog', lambda body, sid: []),
+            ('POST', s + '/execute/sync', 'executeScript', execute),
+            ('POST', s + '/execute/async', 'executeAsyncScript', execute),
+            ('POST', s + '/chromium/send_command_and_get_result', 'executeCdpCommand', cdp),
+            ('POST', s + '/element', 'findElement', find),
+            ('POST', s + '/elements', 'findElements', lambda body, sid: find(body, sid, many=True)),
+            ('POST', e + '/element', 'findChildElement', find),
+            ('POST', e + '/elements', 'findChildElements', lambda body, sid, eid: find(body, sid, eid, True)),
+            ('GET', e + '/text', 'getElementText', element_state(lambda el: el.text if el.displayed else '')),
+            ('GET', e + '/name', 'getElementTagName', element_state(lambda el: el.tag)),
+            ('GET', e + '/enabled', 'isElementEnabled', element_state(lambda el: el.enabled)),
+            ('GET', e + '/displayed', 'isElementDisplayed', element_state(lambda el: el.displayed)),
+            ('GET', e + '/selected', 'isElementSelected', element_state(lambda el: 'selected' in el.attributes)),
+            ('GET', e + '/rect', 'getElementRect', element_state(lambda el: el.snapshot([])['rect'])),
+            ('GET', e + '/attribute/(?P<name>[^/]+)', 'getElementAttribute', element_state(StubElement.attribute)),
+            ('GET', e + '/property/(?P<name>[^/]+)', 'getElementProperty', element_state(StubElement.attribute)),
+            ('GET', e + '/css/(?P<name>[^/]+)', 'getElementValueOfCssProperty', element_state(lambda el, name: '')),
+            ('GET', e + '/screenshot', 'elementScreenshot', element_state(lambda el: PIXEL_PNG)),
+            ('POST', e + '/click', 'clickElement', element_state(lambda el: None)),
+            ('POST', e + '/clear', 'clearElement', clear),
+            ('POST', e + '/value', 'sendKeysToElement', send_keys),
+        ]
+
+        return [(method, re.compile(pattern + '$'), name, func) for method, pattern, name, func in routes]
+
+    def _register_default_scripts(self) -> None:
+        def locate_all(args: List[Any], current: StubSession) -> List[Optional[bool]]:
+            root = args[0] if args[0] is not None else self.dom
+            ret: List[Optional[bool]] = []
+
+            for locator in args[1]:
+                try:
+                    ret.append(None if locator is None else bool(root.locate(*locator)))
+                except StubError:
+                    ret.append(None)
+
+            return ret
+
+        scripts: List[Tuple[str, ScriptHandler]] = [
+            ('/* isDisplayed */', lambda args, current: args[0].displayed),
+            ('/* getAttribute */', lambda args, current: args[0].attribute(args[1])),
+            (ELEMENTS_EXIST_SCRIPT, locate_all),
+            (SNAPSHOT_SCRIPT, lambda args, current: args[0].snapshot(args[1] or [])),
+            (
+                DOM_SNAPSHOT_SCRIPT,
+                lambda args, current: {'html': (args[0] or self.dom).outer_html(), 'url': current.url},
+            ),
+            (TEXTS_SCRIPT, lambda args, current: [el.text if el.displayed else '' for el in args[0]]),
+            (ASYNC_TEXTS_SCRIPT, lambda args, current: [el.text if el.displayed else '' for el in args[0]]),
+            (VALUES_SCRIPT, lambda args, current: [el.attribute('value') for el in args[0]]),
+            (ATTRIBUTES_SCRIPT, lambda args, current: [el.attribute(args[1]) for el in args[0]]),
+            (ANIMATION_COMPLETE_SCRIPT, lambda args, current: True),
+            (SETTLE_SCRIPT, lambda args, current: True),
+        ]
+
+        for fragment, handler in scripts:
+            self._scripts.append((fragment, handler))
+
+    def _execute(self, script: str, args: List[Any], current: StubSession) -> Any:
+        for fragment, handler in self._scripts:
+            if fragment in script:
+                return self._wrap(handler(args, current))
+
+        logger.debug('No stub handler for script %s', script[:80])
+
+        return None
+
+    def _unwrap(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                element = self.element(value[ELEMENT_KEY])
+
+                if element is None:
+                    raise StubError(404, 'stale element reference', value[ELEMENT_KEY])
+
+                return element
+
+            return {key: self._unwrap(item) for key, item in value.items()}
+
+        return value
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, StubElement):
+            return {ELEMENT_KEY: value.id}
+
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+
+        return value
+
+    def _dispatch(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Any]:
+        for route_method, pattern, name, func in self._routes:
+            match = pattern.match(path)
+
+            if route_method != method or match is None:
+                continue
+
+            with self._lock:
+                self.commands[name] += 1
+
+            delay = self.command_latency.get(name, self.latency)
+
+            if delay:
+                time.sleep(delay)
+
+            try:
+                return 200, {'value': func(body, *match.groups())}
+            except StubError as e:
+                return e.status, {'value': {'error': e.error, 'message': str(e), 'stacktrace': ''}}
+
+        return 404, {'value': {'error': 'unknown command', 'message': f'{method} {path}', 'stacktrace': ''}}
+
+    def _video(self, method: str, session_id: str) -> Tuple[int, Optional[bytes]]:
+        with self._lock:
+            self.commands[f'video{method.title()}'] += 1
+
+        size = self.videos.get(session_id)
+
+        if size is None:
+            return 404, None
+
+        if method == 'DELETE':
+            self.videos.pop(session_id, None)
+
+            return 200, b''
+
+        return 200, b'\0' * size
+
+    def _handler(self) -> Type[BaseHTTPRequestHandler]:
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body go out in separate writes, nagle would hold the body back for the delayed ack
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+                logger.debug(format, *args)
+
+            def _respond(self, status: int, body: bytes, content_type: str, length: Optional[int] = None) -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body) if length is None else length))
+                self.end_headers()
+
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def _handle(self) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                video = re.match(r'/video/(\w+)\.mp4$', self.path)
+
+                if video:
+                    status, data = hub._video(self.command, video.group(1))  # pylint: disable=protected-access
+                    self._respond(status, data or b'', 'video/mp4')
+
+                    return
+
+                body = json.loads(raw) if raw else {}
+                status, payload = hub._dispatch(self.command, self.path, body)  # pylint: disable=protected-access
+                self._respond(status, json.dumps(payload).encode(), 'application/json; charset=utf-8')
+
+            do_GET = do_POST = do_DELETE = do_HEAD = _handle
+
+        return Handler
+
+
+@pytest.fixture(scope='session')
+def stub_hub() -> Iterator[StubHub]:
+    with StubHub() as hub:
+        yield hub
@@ -0,0 +1,255 @@
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import allure
+import pytest
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from coms.qa.core.stats import percentiles
+
+__all__ = [
+    'CommandEvent',
+    'LatencyHistogram',
+    'CommandTracer',
+    'TRACER_KEY',
+    'export_histograms',
+    'merge_histograms',
+    'page_object_caller',
+    'session_histograms',
+    'tracing_summary',
+]
+
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+MAX_CALLER_DEPTH = 40
+
+
+class CommandEvent:
+    __slots__ = ('command', 'locator', 'caller', 'start', 'duration', 'thread', 'phase')
+
+    def __init__(
+        self, command: str, locator: Optional[str], caller: Optional[str], start: float, duration: float, phase: str
+    ) -> None:
+        self.command = command
+        self.locator = locator
+        self.caller = caller
+        self.start = start
+        self.duration = duration
+        self.thread = threading.get_ident()
+        self.phase = phase
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.total: float = 0
+
+    def add(self, duration_ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.total += duration_ms
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f'<={bucket}ms' for bucket in BUCKETS_MS] + [f'>{BUCKETS_MS[-1]}ms']
+
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+TRACER_KEY = pytest.StashKey['CommandTracer']()
+
+_session_histograms: Dict[str, LatencyHistogram] = {}
+_session_lock = threading.Lock()
+
+
+def session_histograms() -> Dict[str, LatencyHistogram]:
+    with _session_lock:
+        return dict(_session_histograms)
+
+
+def export_histograms() -> Dict[str, Dict[str, Any]]:
+    """
+    The histograms of this process, for the xdist controller that prints the summary.
+    """
+    with _session_lock:
+        return {command: {'counts': h.counts, 'total': h.total} for command, h in _session_histograms.items()}
+
+
+def merge_histograms(exported: Dict[str, Dict[str, Any]]) -> None:
+    with _session_lock:
+        for command, raw in exported.items():
+            histogram = LatencyHistogram()
+            histogram.counts = list(raw['counts'])
+            histogram.total = raw['total']
+            _session_histograms.setdefault(command, LatencyHistogram()).merge(histogram)
+
+
+def page_object_caller() -> Optional[str]:
+    """
+    The page object or component attribute up the stack that issued the current WebDriver command.
+    """
+    # pylint: disable=import-outside-toplevel
+    from coms.qa.frontend.pages import Page
+    from coms.qa.frontend.pages.component import Component, ComponentWrapper
+    from coms.qa.frontend.pages.component.locators import Deferred
+
+    frame = sys._getframe(2)  # pylint: disable=protected-access
+    depth = 0
+
+    while frame is not None and depth < MAX_CALLER_DEPTH:
+        obj = frame.f_locals.get('self')
+
+        if isinstance(obj, Component):
+            owner = frame.f_locals.get('owner') or type(frame.f_locals.get('instance'))
+
+            return f'{owner.__name__}.{obj.name}'
+
+        if isinstance(obj, Deferred) and obj.origin is not None:
+            return f'{obj.origin[0].__name__}.{obj.origin[1].name}'
+
+        if isinstance(obj, (ComponentWrapper, Page)):
+            return f'{type(obj).__name__}.{frame.f_code.co_name}'
+
+        frame = frame.f_back  # type: ignore[assignment]
+        depth += 1
+
+    return None
+
+
+class CommandTracer:
+    """
+    Records every WebDriver command sent through the command executor of the traced drivers:
+    command name, locator, duration and the page object or component attribute that issued it.
+    The phase is switched around the test body by the pytest_runtest_call hook of the application plugin.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[CommandEvent] = []
+        self.phase: str = 'setup'
+        self._origin = time.perf_counter()
+        self._drivers: List[Tuple[Any, Optional[Callable]]] = []
+        self._lock = threading.Lock()
+
+    def attach(self, driver: WebDriver) -> None:
+        executor = driver.command_executor
+        previous = executor.__dict__.get('execute')
+        execute = executor.execute
+
+        def traced(command: str, params: Dict[str, Any]) -> Any:
+            locator = f"{params['using']}={params['value']}" if 'using' in params else None
+            caller = page_object_caller()
+            start = time.perf_counter()
+
+            try:
+                return execute(command, params)
+            finally:
+                duration = time.perf_counter() - start
+
+                with self._lock:
+                    self.events.append(CommandEvent(command, locator, caller, start, duration, self.phase))
+
+        executor.execute = traced
+        self._drivers.append((executor, previous))
+
+    def detach(self) -> None:
+        for executor, previous in reversed(self._drivers):
+            if previous is None:
+                executor.__dict__.pop('execute', None)
+            else:
+                executor.execute = previous
+
+        self._drivers.clear()
+
+    def round_trips(self, phase: Optional[str] = None) -> int:
+        return sum(1 for event in self.events if phase is None or event.phase == phase)
+
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        ret: Dict[str, LatencyHistogram] = {}
+
+        for event in self.events:
+            ret.setdefault(event.command, LatencyHistogram()).add(event.duration * 1000)
+
+        return ret
+
+    def summary(self) -> Dict[str, Any]:
+        by_caller: Dict[str, int] = {}
+
+        for event in self.events:
+            by_caller[event.caller or '-'] = by_caller.get(event.caller or '-', 0) + 1
+
+        return {
+            'round_trips': self.round_trips(),
+            'round_trips_by_phase': {phase: self.round_trips(phase) for phase in {e.phase for e in self.events}},
+            'latency_ms': percentiles(event.duration * 1000 for event in self.events),
+            'commands': {command: h.as_dict() for command, h in self.histograms().items()},
+            'callers': dict(sorted(by_caller.items(), key=lambda item: item[1], reverse=True)),
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        return {
+            'traceEvents': [
+                {
+                    'name': event.command,
+                    'cat': event.phase,
+                    'ph': 'X',
+                    'ts': (event.start - self._origin) * 1e6,
+                    'dur': event.duration * 1e6,
+                    'pid': os.getpid(),
+                    'tid': event.thread,
+                    'args': {'locator': event.locator, 'caller': event.caller},
+                }
+                for event in self.events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def report(self, trace_dir: Optional[str] = None, name: str = 'webdriver') -> None:
+        with _session_lock:
+            for command, histogram in self.histograms().items():
+                _session_histograms.setdefault(command, LatencyHistogram()).merge(histogram)
+
+        allure.attach(
+            json.dumps(self.summary(), indent=2), name='WebDriver commands', attachment_type=allure.attachment_type.JSON
+        )
+        trace = json.dumps(self.chrome_trace())
+        allure.attach(trace, name='WebDriver trace', attachment_type=allure.attachment_type.JSON)
+
+        if trace_dir:
+            os.makedirs(trace_dir, exist_ok=True)
+
+            # parametrized test names contain '/', '[' and ':'
+            file_name = re.sub(r'[^\w.-]+', '_', name)
+
+            with open(os.path.join(trace_dir, f'{file_name}.trace.json'), 'w', encoding='utf-8') as f:
+                f.write(trace)
+
+
+def tracing_summary() -> List[str]:
+    histograms = session_histograms()
+
+    if not histograms:
+        return []
+
+    lines = [f'{"command":<32} {"count":>8} {"total ms":>12} {"mean ms":>10}']
+
+    for command, histogram in sorted(histograms.items(), key=lambda item: item[1].total, reverse=True):
+        lines.append(
+            f'{command:<32} {histogram.count:>8} {histogram.total:>12.0f} {histogram.total / histogram.count:>10.1f}'
+        )
+
+    return lines
@@ -0,0 +1,167 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from _pytest.config import Config
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import get_remote_connection
+
+__all__ = ['ConnectionWrapper', 'HubTransport', 'pool_size']
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+COMMAND_TIMEOUT = 120
+DEFAULT_POOL_SIZE = 10
+
+
+class TimeoutAdapter(HTTPAdapter):
+    def __init__(self, timeout: urllib3.Timeout, **kwargs: Any) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, timeout=self.timeout, **pool_kwargs)
+
+
+class ConnectionWrapper:
+    """
+    Stands in for a selenium RemoteConnection and delegates to it, subclasses override the calls they watch.
+    Calls the wrapped connection makes itself, e.g. execute to _request, stay inside it.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+    def execute(self, command: str, params: Dict[str, Any]) -> Any:
+        return self.connection.execute(command, params)
+
+    def _request(self, method: str, url: str, body: Optional[str] = None) -> Any:
+        return self.connection._request(method, url, body)  # pylint: disable=protected-access
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class SharedPoolConnection(ConnectionWrapper):
+    """
+    quit() closes the executor, the pool outlives every single session.
+    """
+
+    def close(self) -> None:
+        pass
+
+
+class HubTransport:
+    """
+    Keep-alive connection pools shared by everything that talks to one remote hub:
+    the webdriver command executors and CDP commands share one, the video endpoints another.
+    """
+
+    _transports: Dict[str, 'HubTransport'] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        command_timeout: float = COMMAND_TIMEOUT,
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.command_timeout = urllib3.Timeout(connect=timeout[0], read=command_timeout)
+        self._executor_pool: Optional[urllib3.PoolManager] = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+        self.adapter = TimeoutAdapter(
+            self.command_timeout,
+            pool_connections=2,
+            pool_maxsize=size,
+        )
+
+    @classmethod
+    def for_hub(cls, url: str, size: Optional[int] = None) -> 'HubTransport':
+        """
+        @size - pool size the transport is created with, pass pool_size(config) wherever the config is known
+        """
+        parts = urlsplit(url)
+        key = f'{parts.hostname}:{parts.port}'
+
+        with cls._lock:
+            if key not in cls._transports:
+                cls._transports[key] = cls(size or DEFAULT_POOL_SIZE)
+
+            return cls._transports[key]
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        A session per thread, requests.Session is not thread safe; the connection pool of the adapter is shared.
+        """
+        session: Optional[requests.Session] = getattr(self._local, 'session', None)
+
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+
+        return session
+
+    def request(self, method: str, url: str, timeout: Optional[Tuple[float, float]] = None, **kwargs: Any):
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request('DELETE', url, **kwargs)
+
+    # pylint: disable=protected-access
+    def command_executor(self, url: str, capabilities: Dict[str, Any]) -> ConnectionWrapper:
+        connection: RemoteConnection = get_remote_connection(capabilities, command_executor=url, keep_alive=True)
+
+        with self._executor_lock:
+            if self._executor_pool is None:
+                # selenium's own manager keeps its proxy and ca_certs handling
+                self._executor_pool = connection._conn
+                self._executor_pool.connection_pool_kw.update(maxsize=self.size, timeout=self.command_timeout)
+            else:
+                connection._conn.clear()
+
+        connection._conn = self._executor_pool
+
+        return SharedPoolConnection(connection)
+
+    def stats(self) -> Dict[str, int]:
+        connections = requests_count = 0
+
+        for manager in (self.adapter.poolmanager, self._executor_pool):
+            pools = manager.pools if manager is not None else {}
+
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+
+                if pool is not None:
+                    connections += pool.num_connections
+                    requests_count += pool.num_requests
+
+        return {'connections': connections, 'requests': requests_count, 'reused': requests_count - connections}
+
+
+def pool_size(config: Config) -> int:
+    """
+    One connection for every thread of a worker that may talk to the hub at once:
+    the test itself, artifact pipeline workers and session pool fillers.
+    """
+    return config.getoption(name='http_pool_size', default=None) or (
+        1 + config.getoption(name='artifact_workers', default=4) + 2
+    )
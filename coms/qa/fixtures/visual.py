@@ -0,0 +1,26 @@
+from typing import Any, Callable
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+
+from coms.qa.fixtures.application import Application
+from coms.qa.frontend.helpers.visual import BaselineStore, VisualChecker
+
+__all__ = ['baseline_store', 'visual']
+
+
+@pytest.fixture(scope='session')
+def baseline_store(request: FixtureRequest) -> BaselineStore:
+    return BaselineStore(
+        request.config.getoption(name='baseline_dir', default='visual_baselines'),
+        request.config.getoption(name='update_baselines', default=False),
+    )
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def visual(baseline_store: BaselineStore) -> Callable[..., VisualChecker]:
+    def make(app: Application, **kwargs: Any) -> VisualChecker:
+        return VisualChecker(app, baseline_store, **kwargs)
+
+    return make
@@ -8,6 +8,9 @@ __all__ = [
     'VIDEO_FRAME_RATE',
     'CLIENT_BROWSERS',
     'CLIENT_DEVICE_TYPE',
+    'SETTLE_TIMEOUT',
+    'SCREENSHOT_FORMAT',
+    'SCREENSHOT_QUALITY',
 ]
 
 WEB_DRIVER_WAIT = 30
@@ -17,6 +20,9 @@ DRIVER_HEIGHT = 1080
 MOBILE_DRIVER_HEIGHT = 1000
 DRIVER_RPS = 24
 VIDEO_FRAME_RATE = 24
+SETTLE_TIMEOUT = 1
+SCREENSHOT_FORMAT = 'jpeg'
+SCREENSHOT_QUALITY = 80
 
 
 CLIENT_BROWSERS = ['chrome']
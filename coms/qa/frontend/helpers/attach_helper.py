@@ -1,14 +1,14 @@
-import http
 from typing import Optional
 
 import allure
-import requests
 from _pytest.fixtures import FixtureRequest
 from allure_commons.types import AttachmentType
 from selenium.webdriver.remote.webelement import WebElement
 
-from coms.qa.core.helpers import wait_for
 from coms.qa.fixtures.application import Application
+from coms.qa.fixtures.transport import pool_size
+from coms.qa.frontend.helpers.screenshots import FORMATS, ScreenshotOptions
+from coms.qa.frontend.helpers.video import attach_video, fetch_video
 
 
 def screenshot_attach(
@@ -16,41 +16,30 @@ def screenshot_attach(
     name: str,
     attachment_type: AttachmentType = allure.attachment_type.PNG,
     webelement: Optional[WebElement] = None,
+    options: Optional[ScreenshotOptions] = None,
 ) -> None:
-    if webelement:
-        screen = webelement.screenshot_as_png
-    else:
-        screen = app.driver.get_screenshot_as_png()
+    """
+    The format comes from options when they are passed, else from attachment_type, png for types that are not images.
+    Identical frames of one test are attached once.
+    """
+    if options is None:
+        base = app.screenshots.options
+        fmt = next((fmt for fmt, (known, _) in FORMATS.items() if known == attachment_type), 'png')
+        options = ScreenshotOptions(fmt, base.quality, base.clip, base.scale)
 
-    allure.attach(
-        name=name,
-        body=screen,
-        attachment_type=attachment_type,
-    )
+    app.screenshots.attach(name, webelement, options)
 
 
 def video_attach(
     app: Application, request: FixtureRequest, name: str, attachment_type: AttachmentType = allure.attachment_type.MP4
 ) -> None:
-    if request.config.option.enable_video:
-        session_id = app.driver.session_id
+    session_id = app.driver.session_id
 
+    if request.config.option.enable_video and session_id is not None:
         app.driver.quit()
 
         remote_ip = request.config.option.remote_ip
         remote_port = request.config.option.remote_port
 
-        def condition() -> bytes:
-            path = f'http://{remote_ip}:{remote_port}/video/{session_id}.mp4'
-            r = requests.get(path)
-
-            assert r.status_code == http.HTTPStatus.OK
-
-            return r.content
-
-        response = wait_for(condition, msg='Wait for video file')
-        allure.attach(
-            name=f'{name}.mp4',
-            body=response,
-            attachment_type=attachment_type,
-        )
+        path = fetch_video(remote_ip, remote_port, session_id, pool_size=pool_size(request.config))
+        attach_video(path, name=f'{name}.mp4', attachment_type=attachment_type)
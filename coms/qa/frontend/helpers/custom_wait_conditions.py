@@ -1,7 +1,10 @@
-import time
-
 from selenium.common.exceptions import NoSuchElementException
 
+from coms.qa.core.lazy import lazy_import
+from coms.qa.frontend.helpers.js_locators import js_locator
+
+ec = lazy_import('selenium.webdriver.support.expected_conditions')
+
 __all__ = [
     'ElementExist',
     'ClassNameExist',
@@ -13,8 +16,106 @@ __all__ = [
     'VisibilityOfAnyElements',
     'ElementToBeClickable',
     'ElementEnabled',
+    'ElementVisibility',
 ]
 
+ANIMATION_COMPLETE_SCRIPT = '''
+var el = arguments[0], maxDuration = arguments[1] * 1000, done = arguments[arguments.length - 1];
+var finished = false, settle = null, pending = {}, started = Date.now();
+var timer = setTimeout(finish, maxDuration);
+var events = {
+    transitionrun: onStart, animationstart: onStart,
+    transitionend: onEnd, transitioncancel: onEnd, animationend: onEnd, animationcancel: onEnd
+};
+function listen(add) {
+    Object.keys(events).forEach(function (name) {
+        (add ? el.addEventListener : el.removeEventListener).call(el, name, events[name]);
+    });
+}
+function finish() {
+    if (finished) { return; }
+    finished = true;
+    clearTimeout(timer);
+    clearTimeout(settle);
+    listen(false);
+    done(true);
+}
+function key(event) {
+    return event.animationName !== undefined ? 'animation:' + event.animationName : 'transition:' + event.propertyName;
+}
+function onStart(event) {
+    if (event.target !== el) { return; }
+    clearTimeout(settle);
+    pending[key(event)] = true;
+    // its duration is not part of the estimate, wait for its end event up to maxDuration
+    clearTimeout(timer);
+    timer = setTimeout(finish, Math.max(maxDuration - (Date.now() - started), 0));
+}
+function onEnd(event) {
+    if (event.target !== el) { return; }
+    delete pending[key(event)];
+    if (event.propertyName !== undefined) { delete pending['transition:all']; }
+    clearTimeout(settle);
+    // a chained transition or animation starts right after the previous one ends
+    if (!Object.keys(pending).length) { settle = setTimeout(finish, 50); }
+}
+if (typeof el.getAnimations === 'function') {
+    var drain = function () {
+        if (finished) { return; }
+        var running = el.getAnimations({subtree: true}).filter(function (animation) {
+            return animation.playState !== 'finished' && animation.playState !== 'idle'
+                && animation.effect && animation.effect.getComputedTiming().iterations !== Infinity;
+        });
+        if (!running.length) { finish(); return; }
+        Promise.all(running.map(function (animation) {
+            return animation.finished.catch(function () { return null; });
+        })).then(function () { setTimeout(drain, 50); });
+    };
+    drain();
+    return;
+}
+function toMs(v) { v = v.trim(); return v.slice(-2) === 'ms' ? parseFloat(v) : parseFloat(v) * 1000; }
+function list(value) { return value.split(','); }
+var style = window.getComputedStyle(el), total = 0;
+function expect(prefix, names, durations, delays, skip) {
+    var d = list(durations).map(toMs), l = list(delays).map(toMs);
+    list(names).forEach(function (name, i) {
+        var length = (d[i % d.length] || 0) + (l[i % l.length] || 0);
+        name = name.trim();
+        if (!length || skip(name, i)) { return; }
+        pending[prefix + name] = true;
+        total = Math.max(total, length);
+    });
+}
+var iterations = list(style.animationIterationCount);
+expect('transition:', style.transitionProperty, style.transitionDuration, style.transitionDelay, function (name) {
+    return name === 'none';
+});
+expect('animation:', style.animationName, style.animationDuration, style.animationDelay, function (name, i) {
+    return name === 'none' || iterations[i % iterations.length].trim() === 'infinite';
+});
+if (!total) { finish(); return; }
+listen(true);
+clearTimeout(timer);
+timer = setTimeout(finish, Math.min(total + 50, maxDuration));
+'''
+
+
+def target_args(element, locator):
+    """
+    Arguments for the `target(args)` helper of push-based waits,
+    None when the locator can not be resolved browser-side.
+    """
+    if element is not None:
+        return [element, None, None]
+
+    by_value = js_locator(locator)
+
+    if by_value is None:
+        return None
+
+    return [None] + by_value
+
 
 class ElementExist:
     """
@@ -34,6 +135,14 @@ class ElementExist:
 
         return element
 
+    def script(self):
+        args = js_locator(self.locator)
+
+        if args is None:
+            return None
+
+        return 'return locate(null, args[0], args[1]) || false;', args
+
 
 class ClassNameExist:
     """
@@ -57,6 +166,18 @@ class ClassNameExist:
 
         return False
 
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        return (
+            'var el = target(args);'
+            ' return el && (el.getAttribute("class") || "").indexOf(args[3]) !== -1 ? el : false;',
+            args + [self.css_class],
+        )
+
 
 class InnerTextInElement:
     """
@@ -80,6 +201,18 @@ class InnerTextInElement:
 
         return False
 
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        return (
+            'var el = target(args);'
+            ' return el && (visible(el) ? el.innerText : "").indexOf(args[3]) !== -1 ? el : false;',
+            args + [self.text],
+        )
+
 
 class ExactTextInElement:
     """
@@ -103,6 +236,16 @@ class ExactTextInElement:
 
         return False
 
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        script = 'var el = target(args); return !!el && (visible(el) ? el.innerText.trim() : "") === args[3];'
+
+        return script, args + [self.text]
+
 
 class AttributeExist:
     """
@@ -126,6 +269,21 @@ class AttributeExist:
 
         return self.element
 
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        return (
+            'var el = target(args);'
+            ' if (!el) { return false; }'
+            ' if (!args[0]) { return el; }'
+            ' return el.getAttribute(args[3]) !== null || (el[args[3]] !== undefined && el[args[3]] !== null)'
+            ' ? el : false;',
+            args + [self.attribute],
+        )
+
 
 class ElementValueIs:
     """
@@ -149,30 +307,40 @@ class ElementValueIs:
 
         return False
 
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        return (
+            'var el = target(args);'
+            ' var value = el ? (el.value === undefined ? el.getAttribute("value") : el.value) : null;'
+            ' return value !== null && value !== undefined && String(value).indexOf(args[3]) !== -1 ? el : false;',
+            args + [self.expected_value],
+        )
+
 
 class AnimationComplete:
     """
-    An expectation for checking that an element has a particular html attribute.
+    An expectation for checking that css transitions and animations of an element are finished.
+    Waits in the browser until Element.getAnimations() has nothing running, falls back to
+    transition and animation events of every running one and resolves immediately when nothing runs.
     @element - WebElement
     @locator - used to find the element
-    @duration_type - type of css property to wait for
+    @max_duration - upper bound for the wait in seconds
     """
 
-    def __init__(self, element=None, locator=None, duration_type=None) -> None:
+    def __init__(self, element=None, locator=None, max_duration=10) -> None:
         self.locator = locator
-        self.duration_type = duration_type
         self.element = element
+        self.max_duration = max_duration
 
     def __call__(self, driver):
-        try:
-            if self.element is None:
-                self.element = driver.find_element(*self.locator)
-        except NoSuchElementException as e:
-            raise e
+        if self.element is None:
+            self.element = driver.find_element(*self.locator)
 
-        durations = self.element.value_of_css_property(self.duration_type)
-        transaction_duration = float(durations.split(',')[0].replace("s", ""))
-        time.sleep(transaction_duration)
+        driver.execute_async_script(ANIMATION_COMPLETE_SCRIPT, self.element, self.max_duration)
 
         return True
 
@@ -197,6 +365,26 @@ class VisibilityOfAnyElements:
 
         return False
 
+    def script(self):
+        args = []
+
+        for locator in self.locators:
+            by_value = js_locator(locator)
+
+            if by_value is None:
+                return None
+
+            args += by_value
+
+        return (
+            'for (var i = 0; i < args.length; i += 2) {'
+            ' var found = locateAll(null, args[i], args[i + 1]);'
+            ' if (found.length && visible(found[0])) { return found[0]; }'
+            ' }'
+            ' return false;',
+            args,
+        )
+
 
 class ElementToBeClickable:
     """
@@ -218,6 +406,14 @@ class ElementToBeClickable:
 
         return False
 
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        return 'var el = target(args); return el && visible(el) && !el.disabled ? el : false;', args
+
 
 class ElementEnabled:
     def __init__(self, locator=None) -> None:
@@ -230,3 +426,49 @@ class ElementEnabled:
             return True
 
         return False
+
+    def script(self):
+        args = js_locator(self.locator)
+
+        if args is None:
+            return None
+
+        return 'var el = locate(null, args[0], args[1]); return !!el && !el.disabled;', args
+
+
+class ElementVisibility:
+    """
+    An expectation for checking that an element is visible, or with visible=False that it is hidden or gone;
+    selenium's visibility_of and invisibility_of conditions that push-based waits can run in the browser.
+    @element - WebElement
+    @locator - used to find the element
+    @returns the WebElement once it is visible, True once it is hidden
+    """
+
+    def __init__(self, element=None, locator=None, visible=True) -> None:
+        self.element = element
+        self.locator = locator
+        self.visible = visible
+
+    def __call__(self, driver):
+        if self.visible:
+            if self.element is None:
+                return ec.visibility_of_element_located(self.locator)(driver)
+
+            return ec.visibility_of(self.element)(driver)
+
+        if self.element is None:
+            return ec.invisibility_of_element_located(self.locator)(driver)
+
+        return ec.invisibility_of_element(self.element)(driver)
+
+    def script(self):
+        args = target_args(self.element, self.locator)
+
+        if args is None:
+            return None
+
+        if self.visible:
+            return 'var el = target(args); return el && visible(el) ? el : false;', args
+
+        return 'var el = target(args); return !el || !visible(el);', args
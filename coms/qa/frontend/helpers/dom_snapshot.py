@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+
+from coms.qa.frontend.pages.component.snapshot import ElementSnapshot
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+__all__ = ['DOM_SNAPSHOT_SCRIPT', 'DomSnapshot', 'LiveElementRequired', 'SnapshotElement']
+
+FLAGS_ATTRIBUTE = 'data-qa-snapshot'
+VALUE_ATTRIBUTE = 'data-qa-value'
+
+# the copy is annotated, the page itself is left untouched:
+# h - not displayed, d - disabled, c - checked or selected, b - not laid out inline
+DOM_SNAPSHOT_SCRIPT = '''
+var root = arguments[0] || document.documentElement, clone = root.cloneNode(true);
+var originals = [root].concat(Array.prototype.slice.call(root.querySelectorAll('*')));
+var copies = [clone].concat(Array.prototype.slice.call(clone.querySelectorAll('*')));
+originals.forEach(function (el, i) {
+    var copy = copies[i], style = window.getComputedStyle(el), flags = '';
+    var displayed = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+        && style.visibility !== 'hidden' && style.display !== 'none';
+    if (!displayed) { flags += 'h'; }
+    if (el.matches && el.matches(':disabled')) { flags += 'd'; }
+    if (el.checked || el.selected) { flags += 'c'; }
+    if (!/^(inline|contents)/.test(style.display)) { flags += 'b'; }
+    if (flags) { copy.setAttribute('%s', flags); }
+    if (el.value !== undefined && el.value !== null && typeof el.value !== 'object') {
+        copy.setAttribute('%s', String(el.value));
+    }
+    if (el.tagName === 'SCRIPT' || el.tagName === 'STYLE') { copy.textContent = ''; }
+});
+return {html: clone.outerHTML, url: document.baseURI};
+''' % (
+    FLAGS_ATTRIBUTE,
+    VALUE_ATTRIBUTE,
+)
+
+# attributes selenium's getAttribute reports as 'true' or None
+BOOLEAN_ATTRIBUTES = {
+    'async',
+    'autofocus',
+    'autoplay',
+    'controls',
+    'default',
+    'defer',
+    'hidden',
+    'ismap',
+    'loop',
+    'multiple',
+    'muted',
+    'nomodule',
+    'novalidate',
+    'open',
+    'readonly',
+    'required',
+    'reversed',
+}
+URL_ATTRIBUTES = {'href', 'src', 'action'}
+
+# optional dependencies, only Page.snapshot() needs them
+LXML_HINT = 'Page.snapshot() needs lxml and cssselect: pip install lxml cssselect'
+
+
+class LiveElementRequired(RuntimeError):
+    pass
+
+
+def _lxml() -> Any:
+    # pylint: disable=import-outside-toplevel
+    try:
+        import lxml.html  # type: ignore[import-untyped]
+        from lxml import etree  # type: ignore[import-untyped]
+    except ImportError as e:
+        raise ImportError(LXML_HINT) from e
+
+    return lxml.html, etree
+
+
+@functools.lru_cache(maxsize=None)
+def _variable_xpath(expression: str) -> Any:
+    return _lxml()[1].XPath(expression)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(by: str, value: str) -> Callable[[Any], List[Any]]:
+    """
+    Locator as a function of the context node, compiled once per locator.
+    """
+    # pylint: disable=import-outside-toplevel
+    etree = _lxml()[1]
+
+    if by == 'css selector':
+        try:
+            from cssselect import HTMLTranslator, SelectorError  # type: ignore[import-not-found]
+        except ImportError as e:
+            raise ImportError(LXML_HINT) from e
+
+        try:
+            xpath = etree.XPath(HTMLTranslator().css_to_xpath(value, prefix='descendant::'))
+        except SelectorError as e:
+            raise InvalidSelectorException(f'{value} can not be resolved in a DOM snapshot: {e}') from e
+
+        return xpath  # type: ignore[no-any-return]
+
+    if by == 'xpath':
+        try:
+            xpath = etree.XPath(value)
+        except etree.XPathSyntaxError as e:
+            raise InvalidSelectorException(f'{value}: {e}') from e
+
+        return lambda node: [found for found in xpath(node) if isinstance(getattr(found, 'tag', None), str)]
+
+    attribute = {'id': '@id', 'name': '@name', 'tag name': 'local-name()'}.get(by)
+
+    if attribute is not None:
+        expression = _variable_xpath(f'descendant::*[{attribute}=$value]')
+
+        return lambda node: expression(node, value=value.lower() if by == 'tag name' else value)
+
+    if by == 'class name':
+        expression = _variable_xpath(
+            "descendant::*[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $value, ' '))]"
+        )
+
+        return lambda node: expression(node, value=value)
+
+    if by in ('link text', 'partial link text'):
+        links = _variable_xpath('descendant::a')
+
+        def match(node: Any) -> List[Any]:
+            texts = ((link, render_text(link)) for link in links(node))
+
+            if by == 'link text':
+                return [link for link, text in texts if text == value]
+
+            return [link for link, text in texts if value in text]
+
+        return match
+
+    raise InvalidSelectorException(f'{by} locators can not be resolved in a DOM snapshot')
+
+
+def _render(node: Any, parts: List[str]) -> None:
+    flags = node.get(FLAGS_ATTRIBUTE, '')
+
+    if 'h' in flags:
+        return
+
+    if node.tag == 'br':
+        parts.append('\n')
+
+        return
+
+    block = 'b' in flags
+
+    if block:
+        parts.append('\n')
+
+    if node.text:
+        parts.append(node.text)
+
+    for child in node:
+        # comments and processing instructions have a function for a tag, only their tail is text
+        if isinstance(child.tag, str):
+            _render(child, parts)
+
+        if child.tail:
+            parts.append(child.tail)
+
+    if block:
+        parts.append('\n')
+
+
+def render_text(node: Any) -> str:
+    """
+    Approximation of innerText for the visibility and layout recorded in the snapshot:
+    hidden elements are skipped, block elements and <br> break lines, whitespace collapses.
+    """
+    parts: List[str] = []
+    _render(node, parts)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+
+    return '\n'.join(line for line in lines if line)
+
+
+class SnapshotElement:
+    """
+    Read-only element of a DOM snapshot, it answers the reads of a WebElement without a round trip.
+    Anything that needs the live element raises LiveElementRequired.
+    """
+
+    def __init__(self, snapshot: DomSnapshot, node: Any) -> None:
+        self.snapshot = snapshot
+        self.node = node
+        self._text: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(<{self.tag_name}>)'
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SnapshotElement) and other.node is self.node
+
+    def __hash__(self) -> int:
+        return hash(self.node)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+
+        raise LiveElementRequired(f'{attr} needs a live element, it is not available inside Page.snapshot()')
+
+    @property
+    def _flags(self) -> str:
+        return self.node.get(FLAGS_ATTRIBUTE, '')
+
+    @property
+    def tag_name(self) -> str:
+        return str(self.node.tag).lower()
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = render_text(self.node)
+
+        return self._text
+
+    def is_displayed(self) -> bool:
+        return 'h' not in self._flags
+
+    def is_enabled(self) -> bool:
+        return 'd' not in self._flags
+
+    def is_selected(self) -> bool:
+        return 'c' in self._flags
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        return self.node.get(name)
+
+    def get_property(self, name: str) -> Any:
+        if name == 'value':
+            return self.node.get(VALUE_ATTRIBUTE)
+
+        if name in ('checked', 'selected'):
+            return self.is_selected()
+
+        if name == 'disabled':
+            return not self.is_enabled()
+
+        if name in ('innerText', 'textContent'):
+            return self.text
+
+        return self.get_attribute(name)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        name = name.lower()
+
+        if name == 'value':
+            return self.node.get(VALUE_ATTRIBUTE, self.node.get('value'))
+
+        if name in ('checked', 'selected'):
+            return 'true' if self.is_selected() else None
+
+        if name == 'disabled':
+            return None if self.is_enabled() else 'true'
+
+        value = self.node.get(name)
+
+        if name in BOOLEAN_ATTRIBUTES:
+            return None if value is None else 'true'
+
+        if name in URL_ATTRIBUTES and value is not None:
+            return urljoin(self.snapshot.url, value)
+
+        return value
+
+    def element_snapshot(self, attributes: List[str]) -> ElementSnapshot:
+        return ElementSnapshot(
+            {
+                'displayed': self.is_displayed(),
+                'enabled': self.is_enabled(),
+                'value': self.get_property('value'),
+                'text': self.text if self.is_displayed() else '',
+                'rect': {},
+                'attributes': {name: self.get_attribute(name) for name in attributes},
+                'styles': {},
+            }
+        )
+
+    def find_elements(self, by: str = 'id', value: Optional[str] = None) -> List[SnapshotElement]:
+        self.snapshot.lookups += 1
+
+        return [SnapshotElement(self.snapshot, node) for node in _compile(by, value or '')(self.node)]
+
+    def find_element(self, by: str = 'id', value: Optional[str] = None) -> SnapshotElement:
+        found = self.find_elements(by, value)
+
+        if not found:
+            raise NoSuchElementException(f'Unable to locate element: {by}={value} in the DOM snapshot')
+
+        return found[0]
+
+
+class DomSnapshot:
+    """
+    One copy of the DOM, taken with a single execute_script call and queried locally.
+    Shadow roots and frames are not part of the copy.
+    """
+
+    def __init__(self, html: str, url: str = '') -> None:
+        self.url = url
+        self.lookups = 0
+        self.root = SnapshotElement(self, _lxml()[0].fromstring(html))
+
+    @classmethod
+    def capture(cls, driver: WebDriver, root: Optional[WebElement] = None) -> DomSnapshot:
+        raw: Dict[str, str] = driver.execute_script(DOM_SNAPSHOT_SCRIPT, root)  # type: ignore[no-untyped-call]
+
+        return cls(raw['html'], raw.get('url') or '')
@@ -0,0 +1,123 @@
+import logging
+import weakref
+from typing import Any, Callable, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import POLL_FREQUENCY, WebDriverWait
+
+from coms.qa.core.polling import Deadline
+from coms.qa.frontend.helpers.js_locators import LOCATE_JS, VISIBLE_JS
+
+__all__ = ['DomWait']
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCRIPT_TIMEOUT = 30
+SCRIPT_TIMEOUT_MARGIN = 5
+RECHECK_INTERVAL_MS = 250
+
+SUPPORT_SCRIPT = "return typeof MutationObserver === 'function';"
+
+OBSERVE_SCRIPT = (
+    LOCATE_JS
+    + VISIBLE_JS
+    + '''
+function target(a) { return a[0] || locate(null, a[1], a[2]); }
+var done = arguments[arguments.length - 1];
+var args = arguments[0], timeout = arguments[1];
+function check(args) { /* condition */ }
+function evaluate() {
+    try { return check(args); } catch (e) { return false; }
+}
+var result = evaluate();
+if (result) { done({ok: true, value: result}); return; }
+var finished = false, observer, timer, interval;
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(interval);
+    document.removeEventListener('input', onChange, true);
+    document.removeEventListener('change', onChange, true);
+    done(value);
+}
+function onChange() {
+    var value = evaluate();
+    if (value) { finish({ok: true, value: value}); }
+}
+observer = new MutationObserver(onChange);
+observer.observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+document.addEventListener('input', onChange, true);
+document.addEventListener('change', onChange, true);
+interval = setInterval(onChange, RECHECK_INTERVAL_MS);
+timer = setTimeout(function () { finish({ok: false}); }, timeout * 1000);
+'''
+).replace('RECHECK_INTERVAL_MS', str(RECHECK_INTERVAL_MS))
+
+_observer_support: 'weakref.WeakKeyDictionary[WebDriver, bool]' = weakref.WeakKeyDictionary()
+_script_timeouts: 'weakref.WeakKeyDictionary[WebDriver, float]' = weakref.WeakKeyDictionary()
+
+
+class DomWait:
+    """
+    Drop-in replacement of WebDriverWait for conditions that provide script().
+    The condition is evaluated in the browser and re-evaluated on every DOM
+    mutation, so until() returns as soon as the page satisfies it.
+    Conditions without script() and browsers without MutationObserver
+    fall back to WebDriverWait polling.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float, poll_frequency: float = POLL_FREQUENCY) -> None:
+        self._driver = driver
+        self._timeout = timeout
+        self._poll_frequency = poll_frequency
+
+    def until(self, method: Callable[[WebDriver], Any], message: str = '') -> Any:
+        spec: Optional[Tuple[str, list]] = method.script() if hasattr(method, 'script') else None
+
+        if spec is None or not self._supported():
+            return self._poll(self._timeout).until(method, message)
+
+        deadline = Deadline(self._timeout)
+        self._ensure_script_timeout(self._timeout)
+
+        try:
+            result = self._driver.execute_async_script(  # type: ignore[no-untyped-call]
+                OBSERVE_SCRIPT.replace('/* condition */', spec[0]), spec[1], self._timeout
+            )
+        except WebDriverException as e:
+            # page navigation aborts async scripts, finish the wait by polling
+            logger.debug('Push-based wait aborted, falling back to polling: %s', e)
+
+            return self._poll(max(deadline.remaining, 0)).until(method, message)
+
+        if not result['ok']:
+            raise TimeoutException(message)
+
+        return result['value']
+
+    def until_not(self, method: Callable[[WebDriver], Any], message: str = '') -> Any:
+        return self._poll(self._timeout).until_not(method, message)
+
+    def _poll(self, timeout: float) -> WebDriverWait:
+        return WebDriverWait(self._driver, timeout, self._poll_frequency)
+
+    def _supported(self) -> bool:
+        if self._driver not in _observer_support:
+            try:
+                supported = bool(self._driver.execute_script(SUPPORT_SCRIPT))  # type: ignore[no-untyped-call]
+            except WebDriverException:
+                supported = False
+
+            _observer_support[self._driver] = supported
+
+        return _observer_support[self._driver]
+
+    def _ensure_script_timeout(self, timeout: float) -> None:
+        needed = timeout + SCRIPT_TIMEOUT_MARGIN
+
+        if _script_timeouts.get(self._driver, DEFAULT_SCRIPT_TIMEOUT) < needed:
+            self._driver.set_script_timeout(needed)
+            _script_timeouts[self._driver] = needed
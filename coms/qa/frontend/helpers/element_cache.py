@@ -0,0 +1,135 @@
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from coms.qa.fixtures.transport import ConnectionWrapper
+
+__all__ = ['ElementCache', 'CachedElement']
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+NAVIGATION_COMMANDS = {Command.GET, Command.REFRESH, Command.GO_BACK, Command.GO_FORWARD}
+SCRIPT_COMMANDS = {Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC}
+
+
+class CachedElement(WebElement):
+    """
+    WebElement that transparently re-finds itself once when the browser
+    reports it as stale.
+    """
+
+    def __init__(self, element: WebElement, refind: Callable[[], WebElement], cache: 'ElementCache') -> None:
+        super().__init__(element.parent, element.id)
+        self._refind = refind
+        self._cache = cache
+
+    def refind(self) -> str:
+        self._cache.refinds += 1
+        self._id = self._refind().id
+
+        return self._id
+
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException:
+            self.refind()
+
+            return super()._execute(command, params)
+
+
+class CacheConnection(ConnectionWrapper):
+    """
+    Command executor of a driver with element caches: navigation clears them, a script that gets
+    a stale element from a cache is sent once more with the element found again.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        super().__init__(connection)
+        self.caches: 'weakref.WeakSet[ElementCache]' = weakref.WeakSet()
+
+    def execute(self, command: str, params: Dict[str, Any]) -> Any:
+        # the connection drops sessionId from the params it sends
+        retry = dict(params) if command in SCRIPT_COMMANDS else None
+        response = self.connection.execute(command, params)
+
+        if command in NAVIGATION_COMMANDS:
+            for cache in list(self.caches):
+                cache.invalidate()
+        elif retry is not None and _is_stale(response) and self._refind(retry.get('args')):
+            response = self.connection.execute(command, retry)
+
+        return response
+
+    def _refind(self, value: Any) -> bool:
+        if isinstance(value, list):
+            return any([self._refind(item) for item in value])
+
+        if not isinstance(value, dict):
+            return False
+
+        if ELEMENT_KEY not in value:
+            return any([self._refind(item) for item in value.values()])
+
+        for cache in list(self.caches):
+            element = cache.find_cached(value[ELEMENT_KEY])
+
+            if element is not None:
+                value[ELEMENT_KEY] = element.refind()
+
+                return True
+
+        return False
+
+
+def _is_stale(response: Any) -> bool:
+    return isinstance(response, dict) and bool(response.get('status')) and 'stale element' in str(response.get('value'))
+
+
+class ElementCache:
+    def __init__(self) -> None:
+        self._elements: Dict[Tuple[Optional[str], By, str], CachedElement] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.refinds: int = 0
+
+    def watch(self, driver: WebDriver) -> None:
+        """
+        Invalidates the cache whenever the driver navigates: get, refresh, back and forward.
+        """
+        if not isinstance(driver.command_executor, CacheConnection):
+            driver.command_executor = CacheConnection(driver.command_executor)
+
+        driver.command_executor.caches.add(self)
+
+    def get(self, parent: Union[WebElement, WebDriver], locator: Tuple[By, str]) -> WebElement:
+        key = (parent.id if isinstance(parent, WebElement) else None, locator[0], locator[1])
+        element = self._elements.get(key)
+
+        if element is not None:
+            self.hits += 1
+
+            return element
+
+        self.misses += 1
+
+        def refind() -> WebElement:
+            return parent.find_element(*locator)
+
+        element = CachedElement(refind(), refind, self)
+        self._elements[key] = element
+
+        return element
+
+    def find_cached(self, element_id: str) -> Optional[CachedElement]:
+        return next((element for element in self._elements.values() if element.id == element_id), None)
+
+    def invalidate(self) -> None:
+        self._elements.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'refinds': self.refinds, 'size': len(self._elements)}
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+
+__all__ = ['LOCATE_JS', 'VISIBLE_JS', 'js_locator']
+
+
+# every value of selenium's By
+SUPPORTED_LOCATORS = {
+    'css selector',
+    'xpath',
+    'id',
+    'name',
+    'class name',
+    'tag name',
+    'link text',
+    'partial link text',
+}
+
+LOCATE_JS = '''
+function locateAll(root, by, value) {
+    root = root || document;
+    var toArray = function (list) { return Array.prototype.slice.call(list); };
+    var quote = function (s) { return window.CSS && CSS.escape ? CSS.escape(s) : s.replace(/(["\\\\])/g, '\\\\$1'); };
+    switch (by) {
+        case 'css selector': return toArray(root.querySelectorAll(value));
+        case 'id': return toArray(root.querySelectorAll('[id="' + quote(value) + '"]'));
+        case 'name': return toArray(root.querySelectorAll('[name="' + quote(value) + '"]'));
+        case 'class name': return toArray(root.getElementsByClassName(value));
+        case 'tag name': return toArray(root.getElementsByTagName(value));
+        case 'xpath':
+            var doc = root.ownerDocument || root, found = [];
+            var result = doc.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < result.snapshotLength; i++) { found.push(result.snapshotItem(i)); }
+            return found;
+        case 'link text':
+        case 'partial link text':
+            return toArray(root.querySelectorAll('a')).filter(function (a) {
+                var text = a.innerText.trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function locate(root, by, value) {
+    var found = locateAll(root, by, value);
+    return found.length ? found[0] : null;
+}
+'''
+
+VISIBLE_JS = '''
+function visible(el) {
+    var style = window.getComputedStyle(el);
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+        && style.visibility !== 'hidden' && style.display !== 'none';
+}
+'''
+
+
+def js_locator(locator: Optional[Tuple[By, str]]) -> Optional[List[str]]:
+    """
+    Returns [by, value] for locators LOCATE_JS can resolve, None otherwise.
+    """
+    if locator is None or locator[0] not in SUPPORTED_LOCATORS:
+        return None
+
+    return [str(locator[0]), locator[1]]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import allure
+from selenium.common.exceptions import WebDriverException
+
+from coms.qa.core.stats import percentiles
+
+if TYPE_CHECKING:
+    from coms.qa.fixtures.application import Application
+
+__all__ = ['RequestRecord', 'NetworkCollector']
+
+logger = logging.getLogger(__name__)
+
+OBSERVER_SCRIPT = '''
+function compact(e) {
+    return {
+        url: e.name,
+        type: e.initiatorType,
+        bytes: e.transferSize || 0,
+        ttfb: e.responseStart > 0 ? e.responseStart - e.requestStart : null,
+        duration: e.duration,
+        start: e.startTime
+    };
+}
+var state = window.__comsNetwork;
+if (!state) {
+    state = window.__comsNetwork = {buffer: performance.getEntriesByType('resource').map(compact)};
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (e) { state.buffer.push(compact(e)); });
+        }).observe({type: 'resource'});
+    } catch (e) {}
+}
+var drained = state.buffer;
+state.buffer = [];
+return drained;
+'''
+
+
+class RequestRecord:
+    __slots__ = ('url', 'method', 'resource_type', 'status', 'bytes', 'ttfb', 'duration', 'start', 'failed', 'blocked')
+
+    def __init__(self, url: str, method: str = 'GET', resource_type: str = '', start: float = 0) -> None:
+        self.url = url
+        self.method = method
+        self.resource_type = resource_type
+        self.status: Optional[int] = None
+        self.bytes: int = 0
+        self.ttfb: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.start = start
+        self.failed: bool = False
+        self.blocked: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class NetworkCollector:
+    """
+    Incrementally drains the chrome performance log into per-request records.
+    Browsers without the performance log are covered by a buffered PerformanceObserver
+    cursor that returns only the resource entries added since the previous drain.
+    """
+
+    def __init__(self, app: Application) -> None:
+        self.app = app
+        self._records: Dict[str, RequestRecord] = {}
+        self._observed: List[RequestRecord] = []
+        self._log_available = True
+
+    @property
+    def records(self) -> List[RequestRecord]:
+        return list(self._records.values()) if self._records else self._observed
+
+    def drain(self) -> None:
+        if self._log_available:
+            self._drain_log()
+
+        if not self._records:
+            self._drain_observer()
+
+    def drain_before_navigation(self) -> None:
+        """
+        The observer buffer lives in the page and is lost on navigation, the performance log is kept by the driver.
+        """
+        if not self._log_available:
+            self._drain_observer()
+
+    def reset(self) -> None:
+        """
+        Drops what the session logged before, e.g. while serving a previous test from the session pool.
+        """
+        self.drain()
+        self._records.clear()
+        self._observed.clear()
+
+    def _drain_log(self) -> None:
+        try:
+            entries = self.app.driver.get_log('performance')
+        except WebDriverException as e:
+            logger.debug('Performance log is not available: %s', e)
+            self._log_available = False
+
+            return
+
+        for entry in entries:
+            message = entry['message']
+
+            # most of the log is page and runtime events, skip them without parsing
+            if '"Network.' not in message:
+                continue
+
+            event = json.loads(message)['message']
+            self._on_event(event['method'], event.get('params', {}))
+
+    def _on_event(self, method: str, params: Dict[str, Any]) -> None:
+        request_id = params.get('requestId')
+
+        if request_id is None:
+            return
+
+        if method == 'Network.requestWillBeSent':
+            request = params['request']
+            self._records[request_id] = RequestRecord(
+                request['url'], request.get('method', 'GET'), params.get('type', ''), params.get('timestamp', 0)
+            )
+
+            return
+
+        record = self._records.get(request_id)
+
+        if record is None:
+            return
+
+        if method == 'Network.responseReceived':
+            response = params['response']
+            timing = response.get('timing')
+            record.status = response.get('status')
+            record.resource_type = params.get('type', record.resource_type)
+
+            if timing:
+                record.ttfb = timing['receiveHeadersEnd'] - timing['sendStart']
+        elif method == 'Network.loadingFinished':
+            record.bytes = int(params.get('encodedDataLength', 0))
+            record.duration = (params['timestamp'] - record.start) * 1000
+        elif method == 'Network.loadingFailed':
+            record.failed = True
+            record.blocked = params.get('blockedReason')
+            record.duration = (params['timestamp'] - record.start) * 1000
+
+    def _drain_observer(self) -> None:
+        try:
+            entries = self.app.driver.execute_script(OBSERVER_SCRIPT)  # type: ignore[no-untyped-call]
+        except WebDriverException as e:
+            logger.debug('PerformanceObserver drain failed: %s', e)
+
+            return
+
+        for entry in entries:
+            record = RequestRecord(entry['url'], resource_type=entry['type'], start=entry['start'])
+            record.bytes = entry['bytes']
+            record.ttfb = entry['ttfb']
+            record.duration = entry['duration']
+            self._observed.append(record)
+
+    def summary(self, slowest: int = 10) -> Dict[str, Any]:
+        records = self.records
+        finished = [record for record in records if record.duration is not None]
+
+        return {
+            'requests': len(records),
+            'failed': sum(1 for record in records if record.failed),
+            'blocked': sum(1 for record in records if record.blocked),
+            'bytes': sum(record.bytes for record in records),
+            'ttfb': percentiles(record.ttfb for record in records if record.ttfb is not None),
+            'slowest': [
+                record.as_dict()
+                for record in sorted(finished, key=lambda record: record.duration or 0, reverse=True)[:slowest]
+            ],
+        }
+
+    def attach(self, name: str = 'Network metrics') -> None:
+        allure.attach(
+            json.dumps(self.summary(), indent=2),
+            name=name,
+            attachment_type=allure.attachment_type.JSON,
+        )
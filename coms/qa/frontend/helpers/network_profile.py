@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+import allure
+
+if TYPE_CHECKING:
+    from coms.qa.fixtures.application import Application
+    from coms.qa.frontend.helpers.network import RequestRecord
+
+__all__ = [
+    'NetworkProfile',
+    'PRESETS',
+    'THIRD_PARTY',
+    'export_totals',
+    'merge_totals',
+    'network_profile_summary',
+]
+
+logger = logging.getLogger(__name__)
+
+# analytics, ads, chat widgets and web fonts the tests never check
+THIRD_PARTY = (
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*mc.yandex.ru*',
+    '*an.yandex.ru*',
+    '*top-fwz1.mail.ru*',
+    '*vk.com/rtrg*',
+    '*connect.facebook.net*',
+    '*hotjar.com*',
+    '*jivosite.com*',
+    '*fonts.googleapis.com*',
+    '*fonts.gstatic.com*',
+)
+
+# chrome devtools throttling presets
+PRESETS: Dict[str, Dict[str, Any]] = {
+    'no_third_party': {'block': THIRD_PARTY},
+    'fast_3g': {'latency': 562.5, 'download': 180000, 'upload': 84375},
+    'slow_3g': {'latency': 2000, 'download': 50000, 'upload': 50000},
+    'offline': {'offline': True},
+    'no_cache': {'disable_cache': True},
+}
+
+# the blockedReason chrome reports for Network.setBlockedURLs
+BLOCKED_REASON = 'inspector'
+
+_totals: Dict[str, int] = {'tests': 0, 'requests': 0, 'blocked': 0}
+_lock = threading.Lock()
+
+
+def _pattern(pattern: str) -> Pattern[str]:
+    return re.compile('.*'.join(re.escape(part) for part in pattern.split('*')) + '$')
+
+
+class NetworkProfile:
+    """
+    Network conditions of a chrome session, applied through CDP.
+    @block - Network.setBlockedURLs patterns, * matches any characters
+    @latency - added request latency, ms
+    @download, @upload - throughput in bytes per second, -1 is unlimited
+    """
+
+    def __init__(
+        self,
+        block: Iterable[str] = (),
+        latency: float = 0,
+        download: float = -1,
+        upload: float = -1,
+        offline: bool = False,
+        disable_cache: bool = False,
+        name: str = 'custom',
+    ) -> None:
+        self.block: Tuple[str, ...] = tuple(dict.fromkeys(block))
+        self.latency = latency
+        self.download = download
+        self.upload = upload
+        self.offline = offline
+        self.disable_cache = disable_cache
+        self.name = name
+        self._patterns = [(pattern, _pattern(pattern)) for pattern in self.block]
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.name})'
+
+    @classmethod
+    def preset(cls, *names: str, **overrides: Any) -> NetworkProfile:
+        """
+        Presets merged left to right, e.g. preset('no_third_party', 'fast_3g', block=['*cdn.example.com*']);
+        block patterns add up, other keywords override.
+        """
+        settings: Dict[str, Any] = {'block': []}
+
+        for name in names:
+            if name not in PRESETS:
+                raise ValueError(f'Unknown network profile {name}, available: {", ".join(PRESETS)}')
+
+            for key, value in PRESETS[name].items():
+                if key == 'block':
+                    settings['block'].extend(value)
+                else:
+                    settings[key] = value
+
+        settings['block'].extend(overrides.pop('block', ()))
+        settings.update(overrides)
+        settings.setdefault('name', '+'.join(names) or 'custom')
+
+        return cls(**settings)
+
+    @property
+    def throttled(self) -> bool:
+        return self.offline or self.latency > 0 or self.download >= 0 or self.upload >= 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'block': list(self.block),
+            'latency': self.latency,
+            'download': self.download,
+            'upload': self.upload,
+            'offline': self.offline,
+            'disable_cache': self.disable_cache,
+        }
+
+    def commands(self) -> List[Tuple[str, Dict[str, Any]]]:
+        commands: List[Tuple[str, Dict[str, Any]]] = [('Network.enable', {})]
+
+        if self.block:
+            commands.append(('Network.setBlockedURLs', {'urls': list(self.block)}))
+
+        if self.throttled:
+            commands.append(
+                (
+                    'Network.emulateNetworkConditions',
+                    {
+                        'offline': self.offline,
+                        'latency': self.latency,
+                        'downloadThroughput': self.download,
+                        'uploadThroughput': self.upload,
+                    },
+                )
+            )
+
+        if self.disable_cache:
+            commands.append(('Network.setCacheDisabled', {'cacheDisabled': True}))
+
+        return commands
+
+    def reset_commands(self) -> List[Tuple[str, Dict[str, Any]]]:
+        commands: List[Tuple[str, Dict[str, Any]]] = []
+
+        if self.block:
+            commands.append(('Network.setBlockedURLs', {'urls': []}))
+
+        if self.throttled:
+            commands.append(
+                (
+                    'Network.emulateNetworkConditions',
+                    {'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1},
+                )
+            )
+
+        if self.disable_cache:
+            commands.append(('Network.setCacheDisabled', {'cacheDisabled': False}))
+
+        return commands
+
+    def apply(self, app: Application) -> bool:
+        """
+        Sends the profile to the session, CDP is only available in chrome.
+        """
+        return self._send(app, self.commands())
+
+    def reset(self, app: Application) -> bool:
+        """
+        Restores default network conditions, e.g. before the session returns to the session pool.
+        """
+        return self._send(app, self.reset_commands())
+
+    def _send(self, app: Application, commands: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        if app.browser != 'chrome':
+            logger.warning('Network profile %s is not applied: %s has no CDP', self.name, app.browser)
+
+            return False
+
+        for command, params in commands:
+            app.send_command(command, params)
+
+        return True
+
+    def matching_pattern(self, url: str) -> Optional[str]:
+        for pattern, regex in self._patterns:
+            if regex.match(url):
+                return pattern
+
+        return None
+
+    def report(self, records: List[RequestRecord]) -> Dict[str, Any]:
+        """
+        Blocked requests by pattern. A blocked request transfers nothing and the profile applies to the whole run,
+        so what blocking saves is not known in bytes: compare the transferred bytes of a run without the profile.
+        """
+        by_pattern: Dict[str, int] = {}
+        blocked = [record for record in records if record.blocked == BLOCKED_REASON]
+
+        with _lock:
+            for record in blocked:
+                pattern = self.matching_pattern(record.url) or '-'
+                by_pattern[pattern] = by_pattern.get(pattern, 0) + 1
+
+            _totals['tests'] += 1
+            _totals['requests'] += len(records)
+            _totals['blocked'] += len(blocked)
+
+        return {
+            'profile': self.as_dict(),
+            'requests': len(records),
+            'transferred_bytes': sum(record.bytes for record in records),
+            'blocked_requests': len(blocked),
+            'blocked_by_pattern': dict(sorted(by_pattern.items(), key=lambda item: item[1], reverse=True)),
+        }
+
+    def attach(self, records: List[RequestRecord]) -> None:
+        allure.attach(
+            json.dumps(self.report(records), indent=2),
+            name='Network profile',
+            attachment_type=allure.attachment_type.JSON,
+        )
+
+
+def export_totals() -> Dict[str, int]:
+    """
+    The totals of this process, for the xdist controller that prints the summary.
+    """
+    with _lock:
+        return dict(_totals)
+
+
+def merge_totals(exported: Dict[str, int]) -> None:
+    with _lock:
+        for key, value in exported.items():
+            _totals[key] = _totals.get(key, 0) + value
+
+
+def network_profile_summary() -> List[str]:
+    with _lock:
+        totals = dict(_totals)
+
+    if not totals['tests']:
+        return []
+
+    return [f'{totals["tests"]} tests, {totals["requests"]} requests, {totals["blocked"]} blocked']
@@ -0,0 +1,146 @@
+import threading
+import warnings
+from typing import Any, Dict, List, Mapping, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from coms.qa.core.stats import percentiles
+
+__all__ = [
+    'PageTiming',
+    'PerformanceBudgetExceeded',
+    'PerformanceBudgetWarning',
+    'collect_page_timing',
+    'check_budget',
+    'export_timings',
+    'merge_timings',
+    'record_timing',
+    'timing_summary',
+    'validate_budget',
+]
+
+METRICS = ('dns', 'ttfb', 'dom_content_loaded', 'load', 'fcp', 'lcp')
+
+PAGE_TIMING_SCRIPT = '''
+var done = arguments[arguments.length - 1];
+var nav = performance.getEntriesByType('navigation')[0];
+var paint = performance.getEntriesByName('first-contentful-paint')[0];
+var timing = {
+    dns: nav ? nav.domainLookupEnd - nav.domainLookupStart : null,
+    ttfb: nav ? nav.responseStart : null,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+    fcp: paint ? paint.startTime : null,
+    lcp: null
+};
+try {
+    new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        timing.lcp = entries[entries.length - 1].startTime;
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+} catch (e) {}
+setTimeout(function () { done(timing); }, 50);
+'''
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    pass
+
+
+class PerformanceBudgetWarning(UserWarning):
+    pass
+
+
+class PageTiming:
+    __slots__ = ('page',) + METRICS
+
+    def __init__(self, page: str, raw: Mapping[str, Optional[float]]) -> None:
+        self.page = page
+
+        for metric in METRICS:
+            setattr(self, metric, raw.get(metric))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+_timings: Dict[str, List[PageTiming]] = {}
+_lock = threading.Lock()
+
+
+def collect_page_timing(driver: WebDriver, page: str) -> Optional[PageTiming]:
+    try:
+        raw = driver.execute_async_script(PAGE_TIMING_SCRIPT)  # type: ignore[no-untyped-call]
+    except WebDriverException:
+        return None
+
+    return PageTiming(page, raw)
+
+
+def record_timing(timing: PageTiming) -> None:
+    with _lock:
+        _timings.setdefault(timing.page, []).append(timing)
+
+
+def export_timings() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    The timings recorded in this process, for the xdist controller that prints the summary.
+    """
+    with _lock:
+        return {page: [timing.as_dict() for timing in values] for page, values in _timings.items()}
+
+
+def merge_timings(exported: Dict[str, List[Dict[str, Any]]]) -> None:
+    for page, values in exported.items():
+        for raw in values:
+            record_timing(PageTiming(page, raw))
+
+
+def validate_budget(budget: Mapping[str, float]) -> None:
+    unknown = sorted(set(budget) - set(METRICS))
+
+    if unknown:
+        raise ValueError(f'Unknown performance budget metrics {", ".join(unknown)}, known are {", ".join(METRICS)}')
+
+
+def check_budget(timing: PageTiming, budget: Mapping[str, float], strict: bool = False) -> None:
+    validate_budget(budget)
+    exceeded = [
+        f'{metric} {getattr(timing, metric):.0f} ms > {limit:.0f} ms'
+        for metric, limit in budget.items()
+        if getattr(timing, metric, None) is not None and getattr(timing, metric) > limit
+    ]
+
+    if not exceeded:
+        return
+
+    msg = f'{timing.page} exceeded performance budget: {", ".join(exceeded)}'
+
+    if strict:
+        raise PerformanceBudgetExceeded(msg)
+
+    warnings.warn(msg, PerformanceBudgetWarning)
+
+
+def timing_summary() -> List[str]:
+    with _lock:
+        timings = {page: list(values) for page, values in _timings.items()}
+
+    if not timings:
+        return []
+
+    header = f'{"page":<40} {"n":>4} ' + ' '.join(f'{metric + " p50/p90":>24}' for metric in METRICS)
+    lines = [header]
+
+    for page, values in sorted(timings.items()):
+        cells = []
+
+        for metric in METRICS:
+            stats = percentiles((getattr(t, metric) for t in values if getattr(t, metric) is not None), (50, 90))
+            cell = '-' if stats['p50'] is None else f'{stats["p50"]:.0f}/{stats["p90"]:.0f}'
+            cells.append(f'{cell:>24}')
+
+        lines.append(f'{page:<40} {len(values):>4} ' + ' '.join(cells))
+
+    return lines
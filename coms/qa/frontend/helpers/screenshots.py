@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+import allure_commons
+from allure_commons.model2 import Attachment, ExecutableItem
+from allure_commons.reporter import AllureReporter
+from allure_commons.types import AttachmentType
+from selenium.webdriver.remote.webelement import WebElement
+
+from coms.qa.fixtures.artifacts import ArtifactJob, attachment_mime
+from coms.qa.frontend.constants import SCREENSHOT_FORMAT, SCREENSHOT_QUALITY
+
+if TYPE_CHECKING:
+    from coms.qa.fixtures.application import Application
+
+__all__ = ['Screenshot', 'ScreenshotOptions', 'ScreenshotRecorder']
+
+logger = logging.getLogger(__name__)
+
+FORMATS: Dict[str, Tuple[Union[AttachmentType, str], str]] = {
+    'png': (AttachmentType.PNG, 'png'),
+    'jpeg': (AttachmentType.JPG, 'jpg'),
+    'webp': ('image/webp', 'webp'),
+}
+
+ELEMENT_CLIP_SCRIPT = '''
+var r = arguments[0].getBoundingClientRect();
+return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+'''
+
+VIEWPORT_CLIP_SCRIPT = '''
+return {x: window.scrollX, y: window.scrollY, width: window.innerWidth, height: window.innerHeight};
+'''
+
+# decoding, hashing and writing of every recorder, the browser round trip stays on the caller thread
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='screenshots')
+
+
+class ScreenshotOptions:
+    """
+    @format - png, jpeg or webp, lossy formats are encoded by the browser through CDP
+    @quality - 0..100, ignored for png
+    @clip - {x, y, width, height} in page coordinates
+    @scale - scale factor of the captured image
+    """
+
+    __slots__ = ('format', 'quality', 'clip', 'scale')
+
+    def __init__(
+        self,
+        format: str = SCREENSHOT_FORMAT,  # pylint: disable=redefined-builtin
+        quality: int = SCREENSHOT_QUALITY,
+        clip: Optional[Dict[str, float]] = None,
+        scale: float = 1,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f'Unsupported screenshot format {format}, expected one of {list(FORMATS)}')
+
+        self.format = format
+        self.quality = quality
+        self.clip = clip
+        self.scale = scale
+
+
+class Screenshot:
+    __slots__ = ('body', 'format', 'digest')
+
+    def __init__(self, body: bytes, format: str) -> None:  # pylint: disable=redefined-builtin
+        self.body = body
+        self.format = format
+        self.digest = hashlib.sha1(body).hexdigest()
+
+    @property
+    def attachment_type(self) -> Union[AttachmentType, str]:
+        return FORMATS[self.format][0]
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.format][1]
+
+
+def allure_target() -> Any:
+    """
+    The step or test an attachment made on this thread goes to, None when allure is not reporting.
+    Allure binds other threads to whatever is active when they first touch it, so workers are given this.
+    """
+    for plugin in allure_commons.plugin_manager.get_plugins():
+        reporter = getattr(plugin, 'allure_logger', None)
+
+        if isinstance(reporter, AllureReporter):
+            return reporter.get_last_item(ExecutableItem)
+
+    return None
+
+
+class ScreenshotRecorder:
+    """
+    Screenshots of one application, so of one test. Captures through CDP Page.captureScreenshot
+    when the browser supports it and falls back to WebDriver PNG screenshots otherwise.
+    Identical frames are attached once, decoding, hashing and writing run on a shared worker pool,
+    the attachment goes to the step that was active on the caller thread when the screenshot was taken.
+    """
+
+    def __init__(self, app: Application, options: Optional[ScreenshotOptions] = None) -> None:
+        self.app = app
+        self.options = options or ScreenshotOptions()
+        self.captured: int = 0
+        self.duplicates: int = 0
+        self.bytes: int = 0
+        self._cdp: Optional[bool] = None
+        self._digests: Set[str] = set()
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def capture(
+        self, webelement: Optional[WebElement] = None, options: Optional[ScreenshotOptions] = None
+    ) -> Screenshot:
+        data, fmt = self._grab(webelement, options or self.options)
+
+        return Screenshot(base64.b64decode(data), fmt)
+
+    def attach(
+        self, name: str, webelement: Optional[WebElement] = None, options: Optional[ScreenshotOptions] = None
+    ) -> None:
+        data, fmt = self._grab(webelement, options or self.options)
+        future = _executor.submit(self._store, name, data, fmt, allure_target())
+
+        with self._lock:
+            self._pending = [pending for pending in self._pending if not pending.done()] + [future]
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        for future in pending:
+            future.result()
+
+    def job(self, name: str = 'Screenshot') -> ArtifactJob:
+        """
+        Artifact job for the failure hook, skips the frame when it was already attached during the test.
+        """
+        job = ArtifactJob(name, lambda: None)
+
+        def collect() -> Optional[bytes]:
+            shot = self.capture()
+            job.attachment_type = shot.attachment_type  # type: ignore[assignment]
+
+            return shot.body if self._remember(shot) else None
+
+        job.collect = collect
+
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        return {'captured': self.captured, 'duplicates': self.duplicates, 'bytes': self.bytes}
+
+    def _store(self, name: str, data: str, fmt: str, target: Any) -> None:
+        shot = Screenshot(base64.b64decode(data), fmt)
+
+        if not self._remember(shot) or target is None:
+            return
+
+        source = f'{uuid.uuid4()}-attachment.{shot.extension}'
+        allure_commons.plugin_manager.hook.report_attached_data(body=shot.body, file_name=source)
+        target.attachments.append(Attachment(name=name, source=source, type=attachment_mime(shot.attachment_type)[0]))
+
+    def _remember(self, shot: Screenshot) -> bool:
+        with self._lock:
+            self.captured += 1
+
+            if shot.digest in self._digests:
+                self.duplicates += 1
+
+                return False
+
+            self._digests.add(shot.digest)
+            self.bytes += len(shot.body)
+
+            return True
+
+    def _grab(self, webelement: Optional[WebElement], options: ScreenshotOptions) -> Tuple[str, str]:
+        if self._cdp is None:
+            self._cdp = self.app.browser == 'chrome'
+
+        if self._cdp:
+            try:
+                return self._cdp_capture(webelement, options), options.format
+            except Exception as e:  # pylint: disable=broad-except
+                if 'unknown command' in str(e):
+                    logger.debug('CDP screenshots are not available, falling back to WebDriver: %s', e)
+                    self._cdp = False
+                else:
+                    logger.warning('CDP screenshot failed, taking a WebDriver one: %s', e)
+
+        if webelement is not None:
+            return webelement.screenshot_as_base64, 'png'
+
+        return self.app.driver.get_screenshot_as_base64(), 'png'
+
+    def _cdp_capture(self, webelement: Optional[WebElement], options: ScreenshotOptions) -> str:
+        params: Dict[str, Any] = {'format': options.format}
+
+        if options.format != 'png':
+            params['quality'] = options.quality
+
+        clip = options.clip
+
+        if clip is None and webelement is not None:
+            clip = self.app.driver.execute_script(ELEMENT_CLIP_SCRIPT, webelement)  # type: ignore[no-untyped-call]
+        elif clip is None and options.scale != 1:
+            clip = self.app.driver.execute_script(VIEWPORT_CLIP_SCRIPT)  # type: ignore[no-untyped-call]
+
+        if clip is not None:
+            params['clip'] = {**clip, 'scale': options.scale}
+            params['captureBeyondViewport'] = True
+
+        return self.app.send_command('Page.captureScreenshot', params)['data']  # type: ignore[index]
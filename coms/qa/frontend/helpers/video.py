@@ -0,0 +1,89 @@
+import http
+import os
+import tempfile
+from typing import Optional
+
+import allure
+from allure_commons.types import AttachmentType
+
+from coms.qa.core.helpers import wait_for
+from coms.qa.core.polling import ConstantBackoff
+from coms.qa.fixtures.transport import HubTransport
+
+__all__ = ['video_url', 'fetch_video', 'attach_video', 'delete_video']
+
+CHUNK_SIZE = 64 * 1024
+PROBE_INTERVAL = 0.5
+
+
+def video_url(remote_ip: str, remote_port: str, session_id: str) -> str:
+    return f'http://{remote_ip}:{remote_port}/video/{session_id}.mp4'
+
+
+def probe_video(url: str, pool_size: Optional[int] = None) -> Optional[int]:
+    response = HubTransport.for_hub(url, pool_size).head(url)
+
+    if response.status_code != http.HTTPStatus.OK:
+        return None
+
+    return int(response.headers.get('Content-Length', 0)) or None
+
+
+def download_video(url: str, size: int, pool_size: Optional[int] = None) -> str:
+    fd, path = tempfile.mkstemp(suffix='.mp4')
+    written = 0
+
+    try:
+        with os.fdopen(fd, 'wb') as f, HubTransport.for_hub(url, pool_size).get(url, stream=True) as response:
+            assert response.status_code == http.HTTPStatus.OK
+
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                written += len(chunk)
+
+        assert written == size, f'Video {url} is incomplete: {written} of {size} bytes'
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return path
+
+
+def fetch_video(
+    remote_ip: str, remote_port: str, session_id: str, timeout: float = 30, pool_size: Optional[int] = None
+) -> str:
+    """
+    Streams the session video to a temporary file and returns its path.
+    The download starts only when the served size is the same for two probes in a row,
+    so a file Selenoid is still writing is not fetched over and over.
+    @pool_size - size of the hub connection pool, if this call creates it
+    """
+    url = video_url(remote_ip, remote_port, session_id)
+    last_size: Optional[int] = None
+
+    def condition() -> Optional[str]:
+        nonlocal last_size
+
+        size = probe_video(url, pool_size)
+        ready = size is not None and size == last_size
+        last_size = size
+
+        return download_video(url, size, pool_size) if ready else None  # type: ignore[arg-type]
+
+    return wait_for(condition, timeout=timeout, msg='Wait for video file', backoff=ConstantBackoff(PROBE_INTERVAL))
+
+
+def attach_video(path: str, name: str, attachment_type: AttachmentType = allure.attachment_type.MP4) -> None:
+    try:
+        allure.attach.file(path, name=name, attachment_type=attachment_type)
+    finally:
+        os.remove(path)
+
+
+def delete_video(remote_ip: str, remote_port: str, session_id: str, pool_size: Optional[int] = None) -> None:
+    url = video_url(remote_ip, remote_port, session_id)
+
+    def condition() -> bool:
+        return HubTransport.for_hub(url, pool_size).delete(url).status_code == http.HTTPStatus.OK
+
+    wait_for(condition, msg='Wait for delete video file')
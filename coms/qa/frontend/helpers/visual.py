@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence, Tuple
+
+import allure
+from selenium.webdriver.remote.webelement import WebElement
+
+from coms.qa.core.lazy import lazy_import
+from coms.qa.frontend.helpers.screenshots import ScreenshotOptions
+
+IMAGING_HINT = 'Visual checks need numpy and Pillow: pip install numpy Pillow'
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore[import-not-found]
+
+    from coms.qa.fixtures.application import Application
+else:
+    np = lazy_import('numpy', IMAGING_HINT)
+
+Image = lazy_import('PIL.Image', IMAGING_HINT)
+
+__all__ = [
+    'VisualDiff',
+    'VisualMismatch',
+    'BaselineStore',
+    'VisualChecker',
+    'decode',
+    'encode',
+    'dhash',
+    'hamming',
+    'compare',
+]
+
+Rect = Tuple[int, int, int, int]
+
+DIFF_COLOR = (255, 0, 0)
+
+ELEMENT_RECT_SCRIPT = '''
+var r = arguments[0].getBoundingClientRect(), ratio = window.devicePixelRatio || 1;
+return [r.left * ratio, r.top * ratio, r.width * ratio, r.height * ratio];
+'''
+
+
+class VisualMismatch(AssertionError):
+    pass
+
+
+class VisualDiff:
+    __slots__ = ('pixels', 'ratio', 'bbox', 'hash_distance', 'mask')
+
+    def __init__(
+        self, pixels: int, ratio: float, bbox: Optional[Rect], hash_distance: int, mask: Optional[np.ndarray]
+    ) -> None:
+        self.pixels = pixels
+        self.ratio = ratio
+        self.bbox = bbox
+        self.hash_distance = hash_distance
+        self.mask = mask
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(pixels={self.pixels}, ratio={self.ratio:.5f}, bbox={self.bbox})'
+
+
+def decode(body: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(body)) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def encode(image: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format='PNG', optimize=False, compress_level=1)
+
+    return buffer.getvalue()
+
+
+def dhash(image: np.ndarray, size: int = 8) -> int:
+    """
+    Difference hash: the sign of horizontal gradients of a size x (size + 1) box-filtered thumbnail.
+    The frame is subsampled first, the hash only has to tell different screens apart.
+    """
+    step = max(1, min(image.shape[:2]) // (size * 16))
+    sample = np.ascontiguousarray(image[::step, ::step])
+    thumbnail = np.asarray(
+        Image.fromarray(sample).convert('L').resize((size + 1, size), Image.Resampling.BOX), dtype=np.int16
+    )
+    bits = (thumbnail[:, 1:] > thumbnail[:, :-1]).flatten()
+
+    return int(np.packbits(bits).tobytes().hex(), 16)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def region_mask(shape: Tuple[int, int], regions: Iterable[Rect]) -> Optional[np.ndarray]:
+    """
+    Boolean mask of the pixels to ignore, regions are (x, y, width, height) in image pixels.
+    """
+    mask: Optional[np.ndarray] = None
+
+    for x, y, width, height in regions:
+        if mask is None:
+            mask = np.zeros(shape, dtype=bool)
+
+        top, bottom = max(0, int(y)), max(0, int(y + height))
+        left, right = max(0, int(x)), max(0, int(x + width))
+        mask[top:bottom, left:right] = True
+
+    return mask
+
+
+def compare(
+    actual: np.ndarray,
+    expected: np.ndarray,
+    tolerance: int = 16,
+    ignore: Sequence[Rect] = (),
+    hash_distance: Optional[int] = None,
+) -> VisualDiff:
+    """
+    A pixel differs when any channel differs by more than tolerance, ignored regions never differ.
+    """
+    if hash_distance is None:
+        hash_distance = hamming(dhash(actual), dhash(expected))
+
+    if actual.shape != expected.shape:
+        return VisualDiff(actual.shape[0] * actual.shape[1], 1.0, None, hash_distance, None)
+
+    # |a - b| without leaving uint8, then the largest channel difference of every pixel
+    delta = np.maximum(actual, expected)
+    np.subtract(delta, np.minimum(actual, expected), out=delta)
+    delta = np.maximum(np.maximum(delta[..., 0], delta[..., 1]), delta[..., 2]) > tolerance
+    ignored = region_mask(delta.shape, ignore)
+
+    if ignored is not None:
+        delta &= ~ignored
+
+    pixels = int(np.count_nonzero(delta))
+    bbox: Optional[Rect] = None
+
+    if pixels:
+        ys = np.flatnonzero(delta.any(axis=1))
+        xs = np.flatnonzero(delta.any(axis=0))
+        bbox = (int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1))
+
+    return VisualDiff(pixels, pixels / delta.size, bbox, hash_distance, delta)
+
+
+def diff_image(actual: np.ndarray, diff: VisualDiff) -> np.ndarray:
+    """
+    The actual screenshot faded out with the differing pixels painted red.
+    """
+    image = (actual // 3 + 170).astype(np.uint8)
+
+    if diff.mask is not None:
+        image[diff.mask] = DIFF_COLOR
+
+    return image
+
+
+class BaselineStore:
+    """
+    Baselines on disk, one png per check name, browser and device type.
+    """
+
+    def __init__(self, root: str, update: bool = False) -> None:
+        self.root = root
+        self.update = update
+
+    def path(self, name: str, browser: str, device_type: str) -> str:
+        safe = re.sub(r'[^\w.-]+', '_', name)
+
+        return os.path.join(self.root, browser, device_type, f'{safe}.png')
+
+    def load(self, name: str, browser: str, device_type: str) -> Optional[bytes]:
+        path = self.path(name, browser, device_type)
+
+        if self.update or not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def save(self, name: str, browser: str, device_type: str, body: bytes) -> None:
+        path = self.path(name, browser, device_type)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as f:
+            f.write(body)
+
+
+class VisualChecker:
+    """
+    @threshold - max share of differing pixels
+    @tolerance - max per-channel difference of a pixel that still counts as equal
+    @max_hash_distance - dhash distance above which the frames are reported as different without a pixel diff
+    """
+
+    def __init__(
+        self,
+        app: Application,
+        store: BaselineStore,
+        threshold: float = 0.001,
+        tolerance: int = 16,
+        max_hash_distance: int = 24,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.max_hash_distance = max_hash_distance
+
+    def element_region(self, element: WebElement) -> Rect:
+        x, y, width, height = self.app.driver.execute_script(  # type: ignore[no-untyped-call]
+            ELEMENT_RECT_SCRIPT, element
+        )
+
+        return int(x), int(y), int(width), int(height)
+
+    def check(
+        self,
+        name: str,
+        webelement: Optional[WebElement] = None,
+        ignore: Sequence[Rect] = (),
+        ignore_elements: Sequence[WebElement] = (),
+    ) -> VisualDiff:
+        """
+        Compares a lossless screenshot of the page or webelement with the baseline, the first run stores it.
+        ignore_elements are only supported for page screenshots.
+        """
+        # baselines are compared losslessly, jpeg artifacts would be reported as differences
+        shot = self.app.screenshots.capture(webelement, ScreenshotOptions(format='png'))
+        baseline = self.store.load(name, self.app.browser, self.app.device_type)
+
+        if baseline is None:
+            self.store.save(name, self.app.browser, self.app.device_type, shot.body)
+            allure.attach(shot.body, name=f'{name} baseline', attachment_type=allure.attachment_type.PNG)
+
+            return VisualDiff(0, 0.0, None, 0, None)
+
+        if baseline == shot.body:
+            return VisualDiff(0, 0.0, None, 0, None)
+
+        actual, expected = decode(shot.body), decode(baseline)
+        regions = list(ignore) + [self.element_region(element) for element in ignore_elements]
+        hash_distance = hamming(dhash(actual), dhash(expected))
+
+        if hash_distance > self.max_hash_distance or actual.shape != expected.shape:
+            diff = VisualDiff(actual.shape[0] * actual.shape[1], 1.0, None, hash_distance, None)
+        else:
+            diff = compare(actual, expected, self.tolerance, regions, hash_distance)
+
+        if diff.ratio <= self.threshold:
+            return diff
+
+        allure.attach(baseline, name=f'{name} expected', attachment_type=allure.attachment_type.PNG)
+        allure.attach(shot.body, name=f'{name} actual', attachment_type=allure.attachment_type.PNG)
+
+        if diff.mask is not None:
+            allure.attach(
+                encode(diff_image(actual, diff)), name=f'{name} diff', attachment_type=allure.attachment_type.PNG
+            )
+
+        raise VisualMismatch(f'{name}: {diff.ratio:.4%} of pixels differ (threshold {self.threshold:.4%}), {diff}')
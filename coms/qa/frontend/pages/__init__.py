@@ -1,20 +1,40 @@
 from __future__ import annotations
 
-from typing import Optional
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
 
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
+from coms.qa.core.lazy import lazy_import
 
-from coms.qa.fixtures.application import Application
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+    from coms.qa.fixtures.application import Application
+    from coms.qa.frontend.helpers.dom_snapshot import DomSnapshot
+    from coms.qa.frontend.helpers.element_cache import ElementCache
+
+cache_module = lazy_import('coms.qa.frontend.helpers.element_cache')
+dom_snapshot = lazy_import('coms.qa.frontend.helpers.dom_snapshot')
+page_timing = lazy_import('coms.qa.frontend.helpers.page_timing')
 
 __all__ = ['Page']
 
 
 class Page:
+    cache_elements: bool = False
+    measure_timing: bool = False
+    performance_budget: Optional[Dict[str, float]] = None
+    performance_budget_strict: bool = False
+
     def __init__(self, app: Application) -> None:
         self.app = app
         self.base_url = f'http://{app.ui}'
         self._el: Optional[WebElement] = None
+        self._element_cache: Optional[ElementCache] = cache_module.ElementCache() if self.cache_elements else None
+        self._dom_snapshot: Optional[DomSnapshot] = None
+
+        if self._element_cache is not None:
+            self._element_cache.watch(app.driver)
 
     @property
     def driver(self) -> WebDriver:
@@ -24,7 +44,58 @@ class Page:
     def webelement(self) -> Optional[WebElement]:
         return self._el
 
+    @property
+    def element_cache(self) -> Optional[ElementCache]:
+        return self._element_cache
+
+    @property
+    def dom_snapshot(self) -> Optional[DomSnapshot]:
+        return self._dom_snapshot
+
+    @contextmanager
+    def snapshot(self) -> Iterator[DomSnapshot]:
+        """
+        Copies the DOM once on entry, inside the block Component, Components and Text are found
+        and read from the copy without round trips. Clicks, typing and other live operations
+        raise LiveElementRequired. Nested blocks share the outer copy.
+        """
+        if self._dom_snapshot is not None:
+            yield self._dom_snapshot
+
+            return
+
+        self._dom_snapshot = dom_snapshot.DomSnapshot.capture(self.driver, self._el)
+
+        try:
+            yield self._dom_snapshot
+        finally:
+            self._dom_snapshot = None
+
     def open(self) -> Page:
+        if self._element_cache is not None:
+            self._element_cache.invalidate()
+
+        if self.app.network is not None:
+            self.app.network.drain_before_navigation()
+
         self.driver.get(self.base_url)
+        self.measure()
 
         return self
+
+    def measure(self) -> None:
+        budget = {**(self.performance_budget or {}), **self.app.performance_budget}
+
+        if not (self.measure_timing or self.app.measure_timing or budget):
+            return
+
+        timing = page_timing.collect_page_timing(self.driver, self.__class__.__name__)
+
+        if timing is None:
+            return
+
+        page_timing.record_timing(timing)
+
+        if budget:
+            strict = self.performance_budget_strict or self.app.performance_budget_strict
+            page_timing.check_budget(timing, budget, strict)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from coms.qa.fixtures.async_driver import AsyncWebDriver, AsyncWebElement
+
+if TYPE_CHECKING:
+    from coms.qa.fixtures.async_application import AsyncApplication
+
+__all__ = ['AsyncPage']
+
+
+class AsyncPage:
+    def __init__(self, app: AsyncApplication) -> None:
+        self.app = app
+        self.base_url = f'http://{app.ui}'
+        self._el: Optional[AsyncWebElement] = None
+
+    @property
+    def driver(self) -> AsyncWebDriver:
+        return self.app.driver
+
+    @property
+    def webelement(self) -> Optional[AsyncWebElement]:
+        return self._el
+
+    async def open(self) -> AsyncPage:
+        await self.driver.get(self.base_url)
+
+        return self
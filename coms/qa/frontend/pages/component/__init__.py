@@ -1,64 +1,113 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
 
-import allure
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.wait import WebDriverWait
-
-from coms.qa.fixtures.application import Application
+from coms.qa.core.lazy import lazy_import
 from coms.qa.frontend.constants import WEB_DRIVER_WAIT
-from coms.qa.frontend.helpers.custom_wait_conditions import ElementToBeClickable
-
-__all__ = ['Component', 'Components', 'ComponentWrapper', 'LOCATOR_MAP']
-
-
-LOCATOR_MAP = {
-    'class_name': By.CLASS_NAME,
-    'css': By.CSS_SELECTOR,
-    'id': By.ID,
-    'link_text': By.LINK_TEXT,
-    'name': By.NAME,
-    'partial_link_text': By.PARTIAL_LINK_TEXT,
-    'tag': By.TAG_NAME,
-    'xpath': By.XPATH,
-    'dat': By.CSS_SELECTOR,
-    'datc': By.CSS_SELECTOR,
-}
+from coms.qa.frontend.helpers.custom_wait_conditions import AnimationComplete, ElementToBeClickable, ElementVisibility
+from coms.qa.frontend.pages.component.component_list import ComponentList
+from coms.qa.frontend.pages.component.locators import (
+    LOCATOR_MAP,
+    CompiledLocator,
+    Deferred,
+    compile_locator,
+    join_locators,
+)
+from coms.qa.frontend.pages.component.snapshot import SNAPSHOT_SCRIPT, ElementSnapshot
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    from coms.qa.fixtures.application import Application
+    from coms.qa.frontend.helpers.dom_wait import DomWait
+
+# page objects are imported by every worker at collection, selenium waits and allure are loaded on first use
+allure = lazy_import('allure')
+support_wait = lazy_import('selenium.webdriver.support.wait')
+dom_wait = lazy_import('coms.qa.frontend.helpers.dom_wait')
+dom_snapshot = lazy_import('coms.qa.frontend.helpers.dom_snapshot')
+
+__all__ = ['Component', 'Components', 'ComponentWrapper', 'ComponentList', 'LOCATOR_MAP']
 
 
 class ComponentWrapper:
+    # nested components look these up on their instance, a wrapper has neither of its own
+    element_cache = None
+    dom_snapshot = None
+
     def __init__(
         self,
         app: Application,
-        element: WebElement,
+        element: Optional[WebElement],
         locator: Tuple[By, str],
+        deferred: Optional[Deferred] = None,
     ) -> None:
+        self._element: Optional[WebElement] = element
+        self._deferred: Optional[Deferred] = deferred
         self.app = app
-        self.wait = WebDriverWait(self.driver, WEB_DRIVER_WAIT)
-        self._el: WebElement = element
+        self._wait: Optional[Union[WebDriverWait, DomWait]] = None
         self._locator: Tuple[By, str] = locator
         self.mask_template: str = 'data-autotest'
+        self._snapshot: Optional[ElementSnapshot] = None
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}'
 
     def __getattr__(self, attr) -> str:
+        if attr in ('_el', '_element', '_deferred'):
+            # the element itself failed or is not set up yet, e.g. on a copy, do not look for it on the element
+            raise AttributeError(attr)
+
         return getattr(self._el, attr)
 
     @property
     def driver(self) -> WebDriver:
         return self.app.driver
 
+    @property
+    def _el(self) -> WebElement:
+        if self._element is None and self._deferred is not None:
+            self._element = self._deferred.resolve()
+
+        return self._element  # type: ignore[return-value]
+
+    @_el.setter
+    def _el(self, value: WebElement) -> None:
+        self._element = value
+
+    @property
+    def deferred(self) -> Optional[Deferred]:
+        """
+        Set until the element is needed, nested components are looked up in one query joined onto it.
+        """
+        return self._deferred if self._element is None else None
+
+    @property
+    def wait(self) -> Union[WebDriverWait, DomWait]:
+        if self._wait is None:
+            if self.app.push_waits:
+                self._wait = dom_wait.DomWait(self.driver, WEB_DRIVER_WAIT)
+            else:
+                self._wait = support_wait.WebDriverWait(self.driver, WEB_DRIVER_WAIT)
+
+        return self._wait
+
+    @wait.setter
+    def wait(self, value: Union[WebDriverWait, DomWait]) -> None:
+        self._wait = value
+
     @property
     def webelement(self) -> WebElement:
         return self._el
 
     @property
     def enabled(self) -> bool:
+        if self._snapshot is not None:
+            return self._snapshot.enabled
+
         return self._el.is_enabled()
 
     @property
@@ -67,27 +116,53 @@ class ComponentWrapper:
 
     @property
     def value(self) -> str:
+        if self._snapshot is not None:
+            return self._snapshot.value  # type: ignore[return-value]
+
         return self._el.get_attribute('value')
 
     @property
     def visible(self) -> bool:
+        if self._snapshot is not None:
+            return self._snapshot.displayed
+
         return self._el.is_displayed()
 
+    def snapshot(self, attributes: Iterable[str] = (), styles: Iterable[str] = ()) -> ElementSnapshot:
+        if isinstance(self._el, dom_snapshot.SnapshotElement):
+            if styles:
+                raise dom_snapshot.LiveElementRequired('Computed styles are not part of the DOM snapshot')
+
+            return self._el.element_snapshot(list(attributes))
+
+        raw = self.driver.execute_script(  # type: ignore[no-untyped-call]
+            SNAPSHOT_SCRIPT, self._el, list(attributes), list(styles)
+        )
+
+        return ElementSnapshot(raw)
+
+    def freeze(self, attributes: Iterable[str] = (), styles: Iterable[str] = ()) -> ComponentWrapper:
+        """
+        Takes a fresh snapshot, enabled/visible/value and text() are read from it until unfreeze().
+        """
+        self._snapshot = self.snapshot(attributes, styles)
+
+        return self
+
+    def unfreeze(self) -> ComponentWrapper:
+        self._snapshot = None
+
+        return self
+
     def wait_for_visibility(self) -> ComponentWrapper:
         with allure.step(f'Waiting for {self} visibility'):
-            if self._el is None:
-                self.wait.until(ec.visibility_of_element_located(self._locator))
-            else:
-                self.wait.until(ec.visibility_of(self._el))  # type: ignore[no-untyped-call]
+            self.wait.until(ElementVisibility(self._el, self._locator))
 
             return self
 
     def wait_for_invisibility(self) -> ComponentWrapper:
         with allure.step(f'Waiting for {self} invisibility'):
-            if self._el is None:
-                self.wait.until(ec.invisibility_of_element_located(self._locator))
-            else:
-                self.wait.until(ec.invisibility_of_element(self._el))  # type: ignore[no-untyped-call]
+            self.wait.until(ElementVisibility(self._el, self._locator, visible=False))
 
             return self
 
@@ -97,49 +172,77 @@ class ComponentWrapper:
 
             return self
 
+    def wait_for_animation(self) -> ComponentWrapper:
+        with allure.step(f'Waiting for {self} animation complete'):
+            self.wait.until(AnimationComplete(element=self._el))
+
+            return self
+
 
 class Component:
     def __init__(self, **locators) -> None:
         self.mask_template: str = 'data-autotest'
+        self._name: str = self.__class__.__name__
+        self._compiled: CompiledLocator = compile_locator(locators, self.mask_template)
+        self._locator: Tuple[By, str] = self._compiled.locator
+        self._joined: Dict[CompiledLocator, Optional[CompiledLocator]] = {}
+
+    def __set_name__(self, owner, name) -> None:
+        self._name = name
 
-        if not locators:
-            raise ValueError('Please specify a locator')
+    @property
+    def name(self) -> str:
+        return self._name
 
-        for key, value in locators.items():
-            if key == 'dat':
-                value = f'[{self.mask_template}={value}]'
-            elif key == 'datc':
-                value = f'[{self.mask_template}*={value}]'
+    def deferred(self, instance) -> Deferred:
+        """
+        The lookup of this component on instance, joined onto the parent's own lookup
+        when the parent is a wrapper that has not been resolved yet.
+        """
+        origin = (type(instance), self)
+        snapshot = getattr(instance, 'dom_snapshot', None)
 
-            self._locator = (LOCATOR_MAP[key], value)
+        if snapshot is not None:
+            return Deferred(snapshot.root, self._compiled, None, origin)
+
+        parent: Any = getattr(instance, 'deferred', None)
+
+        if parent is not None:
+            if parent.path not in self._joined:
+                self._joined[parent.path] = join_locators(parent.path, self._compiled)
+
+            joined = self._joined[parent.path]
+
+            if joined is not None:
+                return Deferred(parent.parent, joined, parent.cache, origin)
 
-    def find(self, instance) -> WebElement:
         parent_element: Union[WebElement, WebDriver]
         parent_element = instance.webelement if instance.webelement is not None else instance.app.driver
 
-        return parent_element.find_element(*self._locator)
+        return Deferred(parent_element, self._compiled, getattr(instance, 'element_cache', None), origin)
+
+    def find(self, instance) -> WebElement:
+        return self.deferred(instance).resolve()
 
     def __get__(self, instance, owner):
-        return ComponentWrapper(instance.app, self.find(instance), self._locator)
+        return ComponentWrapper(instance.app, None, self._locator, self.deferred(instance))
 
     def __set__(self, instance, value):
         pass
 
 
 class Components(Component):
-    def finds(self, instance) -> List[WebElement]:
-        parent_element: Union[WebElement, WebDriver]
-        parent_element = instance.webelement if instance.webelement is not None else instance.app.driver
-
-        return parent_element.find_elements(*self._locator)
+    def __init__(self, **locators) -> None:
+        super().__init__(**locators)
 
-    def __get__(self, instance, owner):
-        ret: List[ComponentWrapper] = []
+        if self._compiled.position is not None:
+            raise ValueError('Components finds every match, index is only supported by Component')
 
-        for webelement in self.finds(instance):
-            ret.append(ComponentWrapper(instance.app, webelement, self._locator))
+    def finds(self, instance) -> List[WebElement]:
+        return self.deferred(instance).resolve_all()
 
-        return ret
+    def __get__(self, instance, owner) -> ComponentList:
+        return ComponentList(instance.app, lambda: self.finds(instance), self._locator, ComponentWrapper)
 
     def __set__(self, instance, value):
         pass
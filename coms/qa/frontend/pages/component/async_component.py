@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Generator, List, Optional, Tuple, Union
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from coms.qa.core.helpers import await_for
+from coms.qa.fixtures.async_driver import AsyncWebDriver, AsyncWebElement
+from coms.qa.frontend.constants import WEB_DRIVER_WAIT
+from coms.qa.frontend.pages.component import Component
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+
+    from coms.qa.fixtures.async_application import AsyncApplication
+
+__all__ = ['AsyncComponent', 'AsyncComponents', 'AsyncComponentWrapper', 'AsyncComponentList']
+
+TEXTS_SCRIPT = 'return arguments[0].map(function (el) { return el.innerText; });'
+
+
+class AsyncComponentWrapper:
+    """
+    Resolves the element on first use, `await page.component` resolves it right away.
+    """
+
+    def __init__(
+        self,
+        app: AsyncApplication,
+        resolve: Callable[[], Awaitable[AsyncWebElement]],
+        locator: Tuple[By, str],
+    ) -> None:
+        self.app = app
+        self._resolve = resolve
+        self._el: Optional[AsyncWebElement] = None
+        self._locator: Tuple[By, str] = locator
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}'
+
+    def __await__(self) -> Generator[Any, None, AsyncComponentWrapper]:
+        return self._resolved().__await__()
+
+    async def _resolved(self) -> AsyncComponentWrapper:
+        await self.webelement()
+
+        return self
+
+    @property
+    def driver(self) -> AsyncWebDriver:
+        return self.app.driver
+
+    async def webelement(self) -> AsyncWebElement:
+        if self._el is None:
+            self._el = await self._resolve()
+
+        return self._el
+
+    async def enabled(self) -> bool:
+        return await (await self.webelement()).is_enabled()
+
+    async def disabled(self) -> bool:
+        return not await self.enabled()
+
+    async def visible(self) -> bool:
+        return await (await self.webelement()).is_displayed()
+
+    async def value(self) -> Any:
+        return await (await self.webelement()).get_property('value')
+
+    async def text(self) -> str:
+        return await (await self.webelement()).text()
+
+    async def click(self) -> None:
+        await self.wait_for_clickability()
+        await (await self.webelement()).click()
+
+    async def send_keys(self, text: str, clear: bool = True) -> None:
+        element = await self.webelement()
+
+        if clear:
+            await element.clear()
+
+        await element.send_keys(text)
+
+    async def wait_for_visibility(self, timeout: float = WEB_DRIVER_WAIT) -> AsyncComponentWrapper:
+        await await_for(self.visible, timeout=timeout, msg=f'{self} {self._locator} is not visible')
+
+        return self
+
+    async def wait_for_invisibility(self, timeout: float = WEB_DRIVER_WAIT) -> AsyncComponentWrapper:
+        async def invisible() -> bool:
+            try:
+                return not await self.visible()
+            except (NoSuchElementException, StaleElementReferenceException):
+                return True
+
+        await await_for(invisible, timeout=timeout, msg=f'{self} {self._locator} is still visible')
+
+        return self
+
+    async def wait_for_clickability(self, timeout: float = WEB_DRIVER_WAIT) -> AsyncComponentWrapper:
+        async def clickable() -> bool:
+            return await self.visible() and await self.enabled()
+
+        await await_for(clickable, timeout=timeout, msg=f'{self} {self._locator} is not clickable')
+
+        return self
+
+
+class AsyncComponentList:
+    def __init__(
+        self,
+        app: AsyncApplication,
+        finds: Callable[[], Awaitable[List[AsyncWebElement]]],
+        locator: Tuple[By, str],
+    ) -> None:
+        self.app = app
+        self._finds = finds
+        self._locator = locator
+
+    async def webelements(self) -> List[AsyncWebElement]:
+        return await self._finds()
+
+    async def all(self) -> List[AsyncComponentWrapper]:
+        return [self._wrap(element) for element in await self.webelements()]
+
+    async def count(self) -> int:
+        return len(await self.webelements())
+
+    async def nth(self, index: int) -> AsyncComponentWrapper:
+        return self._wrap((await self.webelements())[index])
+
+    async def texts(self) -> List[str]:
+        return await self.app.driver.execute_script(TEXTS_SCRIPT, await self.webelements())
+
+    def _wrap(self, element: AsyncWebElement) -> AsyncComponentWrapper:
+        async def resolve() -> AsyncWebElement:
+            return element
+
+        return AsyncComponentWrapper(self.app, resolve, self._locator)
+
+
+class AsyncComponent(Component):
+    async def _parent(self, instance) -> Union[AsyncWebElement, AsyncWebDriver]:
+        """
+        The webelement of a wrapper resolves asynchronously, a page's is a property.
+        """
+        if isinstance(instance, AsyncComponentWrapper):
+            return await instance.webelement()
+
+        return instance.webelement if instance.webelement is not None else instance.app.driver
+
+    async def find(self, instance) -> AsyncWebElement:  # type: ignore[override]
+        index = self._compiled.index
+
+        if index is None:
+            return await (await self._parent(instance)).find_element(*self._locator)
+
+        found = await (await self._parent(instance)).find_elements(*self._locator)
+
+        if len(found) <= index:
+            raise NoSuchElementException(f'Unable to locate element {self._compiled}: {len(found)} found')
+
+        return found[index]
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return AsyncComponentWrapper(instance.app, lambda: self.find(instance), self._locator)
+
+
+class AsyncComponents(AsyncComponent):
+    async def finds(self, instance) -> List[AsyncWebElement]:
+        return await (await self._parent(instance)).find_elements(*self._locator)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return AsyncComponentList(instance.app, lambda: self.finds(instance), self._locator)
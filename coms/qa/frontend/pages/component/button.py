@@ -1,7 +1,9 @@
-import allure
+from coms.qa.core.lazy import lazy_import
 
 from . import Component, ComponentWrapper
 
+allure = lazy_import('allure')
+
 __all__ = ['Button', 'ButtonWrapper']
 
 
@@ -15,4 +17,4 @@ class ButtonWrapper(ComponentWrapper):
 
 class Button(Component):
     def __get__(self, instance, owner) -> ButtonWrapper:
-        return ButtonWrapper(instance.app, self.find(instance), self._locator)  # type: ignore[arg-type]
+        return ButtonWrapper(instance.app, None, self._locator, self.deferred(instance))
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union, overload
+
+from coms.qa.core.lazy import lazy_import
+from coms.qa.frontend.helpers.js_locators import VISIBLE_JS
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.remote.webelement import WebElement
+
+    from coms.qa.fixtures.application import Application
+    from coms.qa.frontend.pages.component import ComponentWrapper
+
+dom_snapshot = lazy_import('coms.qa.frontend.helpers.dom_snapshot')
+
+__all__ = ['ComponentList']
+
+
+TEXTS_SCRIPT = VISIBLE_JS + '''
+return arguments[0].map(function (el) { return visible(el) ? el.innerText.trim() : ''; });
+'''
+
+VALUES_SCRIPT = '''
+return arguments[0].map(function (el) {
+    var value = el.value === undefined ? el.getAttribute('value') : el.value;
+    return value === null || value === undefined ? null : String(value);
+});
+'''
+
+ATTRIBUTES_SCRIPT = '''
+var name = arguments[1];
+return arguments[0].map(function (el) { return el.getAttribute(name); });
+'''
+
+FILTER_SCRIPT = VISIBLE_JS + '''
+var text = arguments[1], exact = arguments[2], shown = arguments[3], indexes = [];
+arguments[0].forEach(function (el, i) {
+    var isVisible = visible(el);
+    if (shown !== null && isVisible !== shown) { return; }
+    if (text !== null) {
+        var elText = isVisible ? el.innerText.trim() : '';
+        if (exact ? elText !== text : elText.indexOf(text) === -1) { return; }
+    }
+    indexes.push(i);
+});
+return indexes;
+'''
+
+
+def _filter(elements: List[Any], text: Optional[str], exact: bool, shown: Optional[bool]) -> List[int]:
+    indexes = []
+
+    for i, el in enumerate(elements):
+        is_visible = el.is_displayed()
+
+        if shown is not None and is_visible != shown:
+            continue
+
+        if text is not None:
+            el_text = el.text if is_visible else ''
+
+            if el_text != text if exact else text not in el_text:
+                continue
+
+        indexes.append(i)
+
+    return indexes
+
+
+# the same reads over elements of a DOM snapshot
+LOCAL_SCRIPTS: Dict[str, Callable[..., List[Any]]] = {
+    TEXTS_SCRIPT: lambda elements: [el.text for el in elements],
+    VALUES_SCRIPT: lambda elements: [el.get_attribute('value') for el in elements],
+    ATTRIBUTES_SCRIPT: lambda elements, name: [el.get_dom_attribute(name) for el in elements],
+    FILTER_SCRIPT: _filter,
+}
+
+
+class ComponentList(Sequence):
+    """
+    Lazy result of Components: elements are found on first use, bulk reads run
+    as a single script over all elements and wrappers are created only for
+    the elements actually touched. It is read-only, list(...) gives a list to append to.
+    """
+
+    def __init__(
+        self,
+        app: Application,
+        finder: Callable[[], List[WebElement]],
+        locator: Tuple[By, str],
+        wrapper_class: Type[ComponentWrapper],
+        elements: Optional[List[WebElement]] = None,
+    ) -> None:
+        self.app = app
+        self._finder = finder
+        self._locator = locator
+        self._wrapper_class = wrapper_class
+        self._elements = elements
+        self._wrappers: Dict[int, ComponentWrapper] = {}
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._locator})'
+
+    @property
+    def webelements(self) -> List[WebElement]:
+        if self._elements is None:
+            self._elements = self._finder()
+
+        return self._elements
+
+    def __len__(self) -> int:
+        return len(self.webelements)
+
+    @overload
+    def __getitem__(self, index: int) -> ComponentWrapper:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ComponentList:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ComponentWrapper, ComponentList]:
+        if isinstance(index, slice):
+            return self._subset(self.webelements[index])
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError(f'{self!r} index out of range')
+
+        if index not in self._wrappers:
+            self._wrappers[index] = self._wrapper_class(self.app, self.webelements[index], self._locator)
+
+        return self._wrappers[index]
+
+    def __iter__(self) -> Iterator[ComponentWrapper]:
+        for index in range(len(self)):
+            yield self[index]
+
+    # Components used to return a list, comparisons and concatenation keep working on the wrappers
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, ComponentList)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: Sequence) -> List[ComponentWrapper]:
+        return [*self, *other]
+
+    def __radd__(self, other: Sequence) -> List[ComponentWrapper]:
+        return [*other, *self]
+
+    def texts(self) -> List[str]:
+        return self._run(TEXTS_SCRIPT)
+
+    def values(self) -> List[Optional[str]]:
+        return self._run(VALUES_SCRIPT)
+
+    def attributes(self, name: str) -> List[Optional[str]]:
+        return self._run(ATTRIBUTES_SCRIPT, name)
+
+    def filter(self, text: Optional[str] = None, visible: Optional[bool] = None, exact: bool = False) -> ComponentList:
+        indexes: List[int] = self._run(FILTER_SCRIPT, text, exact, visible)
+
+        return self._subset([self.webelements[i] for i in indexes])
+
+    def _run(self, script: str, *args: Any) -> List[Any]:
+        if not self.webelements:
+            return []
+
+        if isinstance(self.webelements[0], dom_snapshot.SnapshotElement):
+            return LOCAL_SCRIPTS[script](self.webelements, *args)
+
+        return self.app.driver.execute_script(script, self.webelements, *args)  # type: ignore[no-untyped-call]
+
+    def _subset(self, elements: List[WebElement]) -> ComponentList:
+        return self.__class__(self.app, self._finder, self._locator, self._wrapper_class, elements)
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.remote.webelement import WebElement
+
+    from coms.qa.frontend.helpers.element_cache import ElementCache
+
+__all__ = ['LOCATOR_MAP', 'CompiledLocator', 'Deferred', 'compile_locator', 'join_locators']
+
+
+# values of selenium's By, spelled out to keep selenium.webdriver out of the import
+LOCATOR_MAP = {
+    'class_name': 'class name',
+    'css': 'css selector',
+    'id': 'id',
+    'link_text': 'link text',
+    'name': 'name',
+    'partial_link_text': 'partial link text',
+    'tag': 'tag name',
+    'xpath': 'xpath',
+    'dat': 'css selector',
+    'datc': 'css selector',
+}
+
+# keys that only narrow down the element and combine with anything but link texts
+NARROWING_KEYS = ('dat', 'datc', 'id', 'name', 'class_name')
+LINK_KEYS = ('link_text', 'partial_link_text')
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _xpath_string(value: str) -> str:
+    if '"' not in value:
+        return f'"{value}"'
+
+    if "'" not in value:
+        return f"'{value}'"
+
+    return 'concat(' + ", '\"', ".join(f'"{part}"' for part in value.split('"')) + ')'
+
+
+def _narrowing(key: str, value: str, mask_template: str) -> Tuple[str, str]:
+    """
+    The css and xpath predicate of a narrowing key.
+    """
+    if key == 'dat':
+        return f'[{mask_template}={_css_string(value)}]', f'[@{mask_template}={_xpath_string(value)}]'
+
+    if key == 'datc':
+        return f'[{mask_template}*={_css_string(value)}]', f'[contains(@{mask_template}, {_xpath_string(value)})]'
+
+    if key == 'class_name':
+        return (
+            f'[class~={_css_string(value)}]',
+            f"[contains(concat(' ', normalize-space(@class), ' '), {_xpath_string(f' {value} ')})]",
+        )
+
+    attribute = 'id' if key == 'id' else 'name'
+
+    return f'[{attribute}={_css_string(value)}]', f'[@{attribute}={_xpath_string(value)}]'
+
+
+class CompiledLocator:
+    """
+    A component locator in every form it can be joined in.
+    @locator - what a single lookup sends, css whenever there is one
+    @index - picked from find_elements when the locator does not carry it
+    @css, @xpath - the element alone, without the index; xpath is relative to the parent
+    @position - the index the locator was declared with
+    """
+
+    __slots__ = ('locator', 'index', 'css', 'xpath', 'position')
+
+    def __init__(
+        self,
+        locator: Tuple[By, str],
+        css: Optional[str],
+        xpath: Optional[str],
+        position: Optional[int] = None,
+    ) -> None:
+        self.css = css
+        self.xpath = xpath
+        self.position = position
+        self.index: Optional[int] = None
+        self.locator = locator
+
+        if position is not None:
+            if locator[0] == 'xpath' and xpath is not None:
+                self.locator = ('xpath', f'({xpath})[{position + 1}]')  # type: ignore[assignment]
+            else:
+                self.index = position
+
+    def __repr__(self) -> str:
+        suffix = f' (index {self.index})' if self.index is not None else ''
+
+        return f'{self.locator[0]}={self.locator[1]}{suffix}'
+
+    def find(self, parent: Any) -> WebElement:
+        if self.index is None:
+            return parent.find_element(*self.locator)
+
+        found = parent.find_elements(*self.locator)
+
+        if len(found) <= self.index:
+            # pylint: disable=import-outside-toplevel
+            from selenium.common.exceptions import NoSuchElementException
+
+            raise NoSuchElementException(f'Unable to locate element {self}: {len(found)} found')
+
+        return found[self.index]
+
+    def finds(self, parent: Any) -> List[WebElement]:
+        return parent.find_elements(*self.locator)
+
+
+def compile_locator(locators: Dict[str, Any], mask_template: str = 'data-autotest') -> CompiledLocator:
+    """
+    Compiles the keyword locators of a Component into one expression, e.g.
+    Component(dat='row', tag='tr', index=2) is the third tr with data-autotest=row.
+    A single key keeps the locator it always had.
+    """
+    locators = dict(locators)
+    position: Optional[int] = locators.pop('index', None)
+
+    if not locators:
+        raise ValueError('Please specify a locator')
+
+    unknown = [key for key in locators if key not in LOCATOR_MAP]
+
+    if unknown:
+        raise ValueError(f'Unknown locators: {", ".join(unknown)}')
+
+    bases = [key for key in locators if key not in NARROWING_KEYS and key != 'tag']
+    narrowing = [(key, locators[key]) for key in locators if key in NARROWING_KEYS]
+    tag: Optional[str] = locators.get('tag')
+
+    if len(bases) > 1 or (bases and tag is not None):
+        raise ValueError(f'{", ".join(locators)} can not be combined into one locator')
+
+    base = bases[0] if bases else None
+
+    if base is not None and base in LINK_KEYS:
+        if len(locators) > 1:
+            raise ValueError(f'{base} can not be combined with other locators')
+
+        return CompiledLocator((LOCATOR_MAP[base], locators[base]), None, None, position)  # type: ignore[arg-type]
+
+    parts = [_narrowing(key, value, mask_template) for key, value in narrowing]
+    css: Optional[str] = None
+    xpath: Optional[str] = None
+
+    if base == 'css':
+        css = locators['css']
+
+        if parts and ',' in css:  # type: ignore[operator]
+            raise ValueError(f'css {css} is a selector list and can not be narrowed down')
+
+        css += ''.join(part[0] for part in parts)  # type: ignore[operator]
+    elif base == 'xpath':
+        xpath = locators['xpath']
+
+        if parts and '|' in xpath:  # type: ignore[operator]
+            raise ValueError(f'xpath {xpath} is a union and can not be narrowed down')
+
+        xpath += ''.join(part[1] for part in parts)  # type: ignore[operator]
+    else:
+        css = (tag or '') + ''.join(part[0] for part in parts)
+        xpath = f'descendant::{tag or "*"}' + ''.join(part[1] for part in parts)
+
+    if len(locators) == 1:
+        key, value = next(iter(locators.items()))
+
+        if key == 'dat':
+            value = f'[{mask_template}={value}]'
+        elif key == 'datc':
+            value = f'[{mask_template}*={value}]'
+
+        locator = (LOCATOR_MAP[key], value)
+    elif css is not None:
+        locator = ('css selector', css)
+    else:
+        locator = ('xpath', xpath)  # type: ignore[assignment]
+
+    return CompiledLocator(locator, css, xpath, position)  # type: ignore[arg-type]
+
+
+def join_locators(parent: CompiledLocator, child: CompiledLocator) -> Optional[CompiledLocator]:
+    """
+    One locator for the child looked up inside the parent, None when they can not be joined.
+    The xpath form pins the parent match the nested lookup would take, the first or the index-th, so both
+    find the same element. Css matches the child inside any parent match and is only used for parents without
+    an xpath, a css-only child of one that has it is looked up inside the parent's element.
+    """
+    if child.xpath is not None and child.xpath.startswith('/'):
+        # an absolute xpath ignores the element it is looked up from
+        return child
+
+    xpath: Optional[str] = None
+    css: Optional[str] = None
+
+    if parent.xpath is not None and child.xpath is not None and '|' not in child.xpath:
+        if not child.xpath.startswith('('):
+            xpath = f'({parent.xpath})[{(parent.position or 0) + 1}]/{child.xpath}'
+
+    if parent.xpath is None and parent.position is None and parent.css is not None and child.css is not None:
+        if ',' not in parent.css and ',' not in child.css:
+            css = f'{parent.css} {child.css}'
+
+    if xpath is not None:
+        return CompiledLocator(('xpath', xpath), None, xpath, child.position)  # type: ignore[arg-type]
+
+    if css is not None:
+        return CompiledLocator(('css selector', css), css, None, child.position)  # type: ignore[arg-type]
+
+    return None
+
+
+class Deferred:
+    """
+    Where a component's element is looked up once something needs it.
+    """
+
+    __slots__ = ('parent', 'path', 'cache', 'origin')
+
+    def __init__(
+        self,
+        parent: Any,
+        path: CompiledLocator,
+        cache: Optional[ElementCache] = None,
+        origin: Optional[Tuple[type, Any]] = None,
+    ) -> None:
+        self.parent = parent
+        self.path = path
+        self.cache = cache
+        # (owner class, component) the lookup is reported under by the command tracer
+        self.origin = origin
+
+    def resolve(self) -> WebElement:
+        try:
+            if self.cache is not None and self.path.index is None:
+                return self.cache.get(self.parent, self.path.locator)
+
+            return self.path.find(self.parent)
+        except AttributeError as e:
+            # wrappers look up missing attributes on the element being resolved, this would end up back here
+            raise RuntimeError(f'Unable to resolve {self.path}: {e}') from e
+
+    def resolve_all(self) -> List[WebElement]:
+        try:
+            return self.path.finds(self.parent)
+        except AttributeError as e:
+            raise RuntimeError(f'Unable to resolve {self.path}: {e}') from e
@@ -0,0 +1,64 @@
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+__all__ = ['ElementSnapshot', 'SNAPSHOT_SCRIPT']
+
+
+SNAPSHOT_SCRIPT = '''
+var el = arguments[0], attributes = arguments[1] || [], styles = arguments[2] || [];
+var style = window.getComputedStyle(el);
+var rect = el.getBoundingClientRect();
+var displayed = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+    && style.visibility !== 'hidden' && style.display !== 'none';
+var attrs = {};
+attributes.forEach(function (name) { attrs[name] = el.getAttribute(name); });
+var css = {};
+styles.forEach(function (name) { css[name] = style.getPropertyValue(name); });
+var value = el.value === undefined ? el.getAttribute('value') : el.value;
+return {
+    displayed: displayed,
+    enabled: !el.disabled,
+    value: value === null || value === undefined ? null : String(value),
+    text: displayed ? el.innerText.trim() : '',
+    rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+    attributes: attrs,
+    styles: css
+};
+'''
+
+
+class ElementSnapshot:
+    """
+    Immutable state of an element captured by a single execute_script call.
+    """
+
+    __slots__ = ('displayed', 'enabled', 'value', 'text', 'rect', 'attributes', 'styles')
+
+    displayed: bool
+    enabled: bool
+    value: Optional[str]
+    text: str
+    rect: Mapping[str, float]
+    attributes: Mapping[str, Optional[str]]
+    styles: Mapping[str, str]
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        object.__setattr__(self, 'displayed', bool(raw['displayed']))
+        object.__setattr__(self, 'enabled', bool(raw['enabled']))
+        object.__setattr__(self, 'value', raw['value'])
+        object.__setattr__(self, 'text', raw['text'] or '')
+        object.__setattr__(self, 'rect', MappingProxyType(dict(raw['rect'])))
+        object.__setattr__(self, 'attributes', MappingProxyType(dict(raw['attributes'])))
+        object.__setattr__(self, 'styles', MappingProxyType(dict(raw['styles'])))
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}(displayed={self.displayed}, enabled={self.enabled}, '
+            f'value={self.value!r}, text={self.text!r})'
+        )
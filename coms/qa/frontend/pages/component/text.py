@@ -5,6 +5,9 @@ __all__ = ['Text']
 
 class TextWrapper(ComponentWrapper):
     def text(self) -> str:
+        if self._snapshot is not None:
+            return self._snapshot.text
+
         return self._el.text
 
 
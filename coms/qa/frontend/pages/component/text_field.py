@@ -1,7 +1,9 @@
-import allure
+from coms.qa.core.lazy import lazy_import
 
 from . import Component, ComponentWrapper
 
+allure = lazy_import('allure')
+
 __all__ = ['TextField']
 
 
@@ -17,7 +19,7 @@ class TextFieldWrapper(ComponentWrapper):
 
 class TextField(Component):
     def __get__(self, instance, owner) -> TextFieldWrapper:
-        return TextFieldWrapper(instance.app, self.find(instance), self._locator)  # type: ignore[arg-type]
+        return TextFieldWrapper(instance.app, None, self._locator, self.deferred(instance))
 
     def __set__(self, instance, value) -> None:
         if value is None: